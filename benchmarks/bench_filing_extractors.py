@@ -0,0 +1,157 @@
+"""
+Compare filing text extractors on a directory of saved EDGAR filings.
+
+For every extractor and filing this measures extraction time, peak Python
+memory (tracemalloc, in a separate run) and output size. When a questions file is given it also
+measures retrieval quality: each filing is chunked and indexed with FAISS and
+the embedding model, and a question counts as a hit when any of its expected
+keywords appears in the top-k retrieved chunks.
+
+Questions file format (JSON)::
+
+    {
+        "aapl-20240629.htm": [
+            {"question": "What were total net sales?", "expected": ["net sales"]}
+        ]
+    }
+
+Usage::
+
+    python benchmarks/bench_filing_extractors.py filings/ --questions questions.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+)
+
+from filing_extractors import EXTRACTORS, get_extractor  # noqa: E402
+
+
+def measure_extraction(extractor_name: str, html: str) -> Dict[str, Any]:
+    extractor = get_extractor(extractor_name)
+    # Time and memory are measured in separate runs because tracemalloc slows
+    # allocation-heavy code down considerably.
+    start_time = time.perf_counter()
+    text = extractor.extract(html)
+    elapsed = time.perf_counter() - start_time
+    tracemalloc.start()
+    extractor.extract(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": elapsed, "peak_bytes": peak, "chars": len(text), "text": text}
+
+
+def measure_retrieval(
+    text: str,
+    questions: List[Dict[str, Any]],
+    embeddings: Any,
+    chunk_size: int,
+    chunk_overlap: int,
+    top_k: int,
+) -> float:
+    from langchain.text_splitter import CharacterTextSplitter
+    from langchain_community.vectorstores import FAISS
+
+    splitter = CharacterTextSplitter(
+        separator="\n", chunk_size=chunk_size, chunk_overlap=chunk_overlap
+    )
+    index = FAISS.from_texts(splitter.split_text(text), embeddings)
+    hits = 0
+    for item in questions:
+        docs = index.similarity_search(item["question"], k=top_k)
+        retrieved = "\n".join(doc.page_content for doc in docs).lower()
+        if any(keyword.lower() in retrieved for keyword in item["expected"]):
+            hits += 1
+    return hits / len(questions) if questions else 0.0
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "filings_dir", help="Directory of saved filing .htm/.html files"
+    )
+    parser.add_argument(
+        "--extractors", nargs="+", default=list(EXTRACTORS), choices=list(EXTRACTORS)
+    )
+    parser.add_argument("--questions", help="JSON file of questions per filing")
+    parser.add_argument("--embedding-model", default="llama3:latest")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=150)
+    parser.add_argument("--top-k", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    paths = sorted(
+        glob.glob(os.path.join(args.filings_dir, "*.htm"))
+        + glob.glob(os.path.join(args.filings_dir, "*.html"))
+    )
+    if not paths:
+        parser.error(f"No .htm/.html files found in {args.filings_dir}")
+
+    questions: Dict[str, List[Dict[str, Any]]] = {}
+    embeddings = None
+    if args.questions:
+        with open(args.questions, "r") as file:
+            questions = json.load(file)
+        from langchain_community.embeddings import OllamaEmbeddings
+
+        embeddings = OllamaEmbeddings(model=args.embedding_model)
+
+    totals: Dict[str, Dict[str, float]] = {
+        name: {"seconds": 0.0, "peak_bytes": 0, "chars": 0, "hit_rate": 0.0, "rated": 0}
+        for name in args.extractors
+    }
+    print(
+        f"{'filing':40} {'extractor':13} {'seconds':>9} {'peak MB':>9} {'chars':>10} {'hit rate':>9}"
+    )
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="replace") as file:
+            html = file.read()
+        filing_questions = questions.get(os.path.basename(path), [])
+        for name in args.extractors:
+            result = measure_extraction(name, html)
+            hit_rate = ""
+            if embeddings is not None and filing_questions:
+                rate = measure_retrieval(
+                    result["text"],
+                    filing_questions,
+                    embeddings,
+                    args.chunk_size,
+                    args.chunk_overlap,
+                    args.top_k,
+                )
+                totals[name]["hit_rate"] += rate
+                totals[name]["rated"] += 1
+                hit_rate = f"{rate:.2f}"
+            totals[name]["seconds"] += result["seconds"]
+            totals[name]["peak_bytes"] = max(
+                totals[name]["peak_bytes"], result["peak_bytes"]
+            )
+            totals[name]["chars"] += result["chars"]
+            print(
+                f"{os.path.basename(path)[:40]:40} {name:13} {result['seconds']:9.3f} "
+                f"{result['peak_bytes'] / 1_048_576:9.1f} {result['chars']:10d} {hit_rate:>9}"
+            )
+
+    print("\nTotals")
+    for name, total in totals.items():
+        hit_rate = (
+            f"{total['hit_rate'] / total['rated']:.2f}" if total["rated"] else "n/a"
+        )
+        print(
+            f"{name:13} total seconds={total['seconds']:.3f} "
+            f"max peak MB={total['peak_bytes'] / 1_048_576:.1f} "
+            f"chars={int(total['chars'])} mean hit rate={hit_rate}"
+        )
+
+
+if __name__ == "__main__":
+    main()
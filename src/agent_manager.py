@@ -1,38 +1,55 @@
-from typing import Dict, Any, List
+import inspect
+from typing import Dict, Any, List, Optional
 from crewai import Agent
-from langchain_community.llms import Ollama
 from logging_config import LoggerMixin, log_execution_time
 from exceptions import AgentCreationError
 from embedding_manager import EmbeddingManager
+from lazy import Lazy
+from llm_pool import LLMPool, resolve_llm_config
+
 
 class AgentManager(LoggerMixin):
     def __init__(
         self,
         config: Dict[str, Any],
-        ollama_llm: Ollama,
+        llm_pool: LLMPool,
         search_tool: Any,
         sec_tools: Any,
-        embedding_manager: EmbeddingManager,
+        embedding_manager: Optional[EmbeddingManager] = None,
     ) -> None:
+        # The tools may be handed over as Lazy components, in which case they
+        # are only built once an agent that uses them is created.
         self.config: Dict[str, Any] = config
-        self.ollama_llm: Ollama = ollama_llm
+        self.llm_pool: LLMPool = llm_pool
         self.search_tool: Any = search_tool
         self.sec_tools: Any = sec_tools
-        self.embedding_manager: EmbeddingManager = embedding_manager
+        self.embedding_manager: Optional[EmbeddingManager] = embedding_manager
 
     @log_execution_time(logger=None)
     async def create_agents(self, crew_config: Dict[str, Any]) -> Dict[str, Agent]:
         """Create agents based on the crew configuration."""
         agents: Dict[str, Agent] = {}
+        # Crews may opt out of the LLM response cache, e.g. when they need
+        # fresh completions on every run.
+        use_cache: bool = crew_config.get("llm_cache", True)
+        if not use_cache:
+            self.logger.info(
+                "LLM response cache disabled", crew=crew_config.get("name")
+            )
 
         for agent_name, agent_config in crew_config["agents"].items():
             tools: List[Any] = []
             if agent_config.get("use_search_tool", False):
-                tools.append(await self.search_tool)
+                tools.extend(await self._get_search_tools())
             if agent_config.get("use_sec_tools", False):
-                tools.extend([self.sec_tools.search_10q, self.sec_tools.search_10k])
+                sec_tools = await self._get_sec_tools()
+                tools.extend([sec_tools.search_10q, sec_tools.search_10k])
 
             try:
+                model, params = resolve_llm_config(
+                    crew_config, agent_config, self.config["default_llm_model"]
+                )
+                llm = self.llm_pool.get(model, params, cache=use_cache)
                 agents[agent_name] = Agent(
                     role=agent_config["role"],
                     goal=agent_config["goal"],
@@ -40,11 +57,11 @@ class AgentManager(LoggerMixin):
                     verbose=agent_config.get("verbose", True),
                     allow_delegation=agent_config.get("allow_delegation", False),
                     tools=tools,
-                    llm=self.ollama_llm,
+                    llm=llm,
                     # Use a custom memory implementation if needed
                     # memory=CustomMemory(self.embedding_manager),
                 )
-                self.logger.info("Agent created", agent_name=agent_name)
+                self.logger.info("Agent created", agent_name=agent_name, model=model)
             except KeyError as e:
                 self.logger.error(
                     "Missing required configuration for agent",
@@ -61,4 +78,21 @@ class AgentManager(LoggerMixin):
                 raise AgentCreationError(f"Failed to create agent {agent_name}: {e}")
 
         self.logger.info("All agents created", agent_count=len(agents))
-        return agents
\ No newline at end of file
+        return agents
+
+    async def _get_search_tools(self) -> List[Any]:
+        # The search tools are built by a coroutine (possibly behind Lazy);
+        # await it once and keep the result so agents of later crews can share
+        # the same tools.
+        if isinstance(self.search_tool, Lazy):
+            self.search_tool = await self.search_tool.aget()
+        elif inspect.isawaitable(self.search_tool):
+            self.search_tool = await self.search_tool
+        if isinstance(self.search_tool, list):
+            return self.search_tool
+        return [self.search_tool]
+
+    async def _get_sec_tools(self) -> Any:
+        if isinstance(self.sec_tools, Lazy):
+            self.sec_tools = await self.sec_tools.aget()
+        return self.sec_tools
@@ -0,0 +1,181 @@
+import asyncio
+import csv
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Set, Tuple
+from logging_config import LoggerMixin
+from exceptions import ConfigError, FileNotFoundError, InvalidConfigError
+
+RunJob = Callable[[Dict[str, str]], Awaitable[str]]
+
+
+def load_batch_inputs(file_path: str) -> List[Dict[str, str]]:
+    """
+    Load task variables for a batch run from a CSV or JSONL file.
+
+    Args:
+        file_path (str): Path to a ``.csv`` file with a header row, or a ``.jsonl``
+            file with one JSON object per line.
+
+    Returns:
+        list: One dictionary of task variables per input row.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        InvalidConfigError: If the file format is unsupported or a row is invalid.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Batch input file not found: {file_path}")
+
+    extension = os.path.splitext(file_path)[1].lower()
+    rows: List[Dict[str, str]] = []
+    with open(file_path, "r", encoding="utf-8", newline="") as file:
+        if extension == ".csv":
+            for row in csv.DictReader(file):
+                rows.append({k.strip(): (v or "").strip() for k, v in row.items() if k})
+        elif extension in (".jsonl", ".ndjson"):
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise InvalidConfigError(
+                        f"Invalid JSON on line {line_number} of {file_path}: {e}"
+                    )
+                if not isinstance(row, dict):
+                    raise InvalidConfigError(
+                        f"Line {line_number} of {file_path} is not a JSON object"
+                    )
+                rows.append({str(k): str(v) for k, v in row.items()})
+        else:
+            raise InvalidConfigError(
+                f"Unsupported batch input format '{extension}', expected .csv or .jsonl"
+            )
+    return rows
+
+
+def load_completed_rows(output_path: str) -> Set[int]:
+    """Return the indexes of rows already completed successfully in a results file."""
+    completed: Set[int] = set()
+    if not os.path.exists(output_path):
+        return completed
+
+    with open(output_path, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A partially written last line from an interrupted run.
+                continue
+            if record.get("status") == "success":
+                completed.add(int(record["row"]))
+    return completed
+
+
+def truncate_partial_line(output_path: str) -> None:
+    """
+    Cut a results file back to its last complete line, dropping the partial
+    record an interrupted run may have left so that appends start on a new line.
+    """
+    if not os.path.exists(output_path):
+        return
+
+    with open(output_path, "rb+") as file:
+        end = file.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            step = min(4096, position)
+            file.seek(position - step)
+            newline = file.read(step).rfind(b"\n")
+            if newline != -1:
+                position = position - step + newline + 1
+                break
+            position -= step
+        if position < end:
+            file.truncate(position)
+
+
+class BatchRunner(LoggerMixin):
+    """Run a crew over many sets of task variables with a bounded worker pool."""
+
+    def __init__(self, run_job: RunJob, max_workers: int = 4) -> None:
+        if max_workers < 1:
+            raise ConfigError("Batch max_workers must be at least 1")
+        self.run_job: RunJob = run_job
+        self.max_workers: int = max_workers
+
+    async def run(self, input_path: str, output_path: str) -> Dict[str, int]:
+        """
+        Process every input row not yet completed in ``output_path``.
+
+        Results are appended to ``output_path`` as JSONL as soon as each crew
+        finishes, so an interrupted run can be resumed with the same arguments.
+
+        Returns:
+            dict: Counts of succeeded, failed and skipped rows.
+        """
+        rows = load_batch_inputs(input_path)
+        truncate_partial_line(output_path)
+        completed = load_completed_rows(output_path)
+        pending: List[Tuple[int, Dict[str, str]]] = [
+            (index, row) for index, row in enumerate(rows) if index not in completed
+        ]
+        summary = {"succeeded": 0, "failed": 0, "skipped": len(rows) - len(pending)}
+        self.logger.info(
+            "Batch started",
+            total_rows=len(rows),
+            pending_rows=len(pending),
+            workers=self.max_workers,
+        )
+
+        queue: "asyncio.Queue[Tuple[int, Dict[str, str]]]" = asyncio.Queue()
+        for item in pending:
+            queue.put_nowait(item)
+        write_lock = asyncio.Lock()
+
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        os.makedirs(output_dir, exist_ok=True)
+        with open(output_path, "a", encoding="utf-8") as output:
+
+            async def worker() -> None:
+                while True:
+                    try:
+                        index, variables = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    record = await self._run_row(index, variables)
+                    summary[
+                        "succeeded" if record["status"] == "success" else "failed"
+                    ] += 1
+                    async with write_lock:
+                        output.write(json.dumps(record) + "\n")
+                        output.flush()
+
+            workers = min(self.max_workers, len(pending))
+            await asyncio.gather(*(worker() for _ in range(workers)))
+
+        self.logger.info("Batch completed", **summary)
+        return summary
+
+    async def _run_row(self, index: int, variables: Dict[str, str]) -> Dict[str, Any]:
+        start_time = time.time()
+        record: Dict[str, Any] = {"row": index, "variables": variables}
+        try:
+            record["result"] = await self.run_job(variables)
+            record["status"] = "success"
+        except Exception as e:
+            self.logger.error("Batch row failed", row=index, error=str(e))
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {e}"
+        record["duration"] = time.time() - start_time
+        record["finished_at"] = datetime.now(timezone.utc).isoformat()
+        self.logger.info(
+            "Batch row finished",
+            row=index,
+            status=record["status"],
+            duration=record["duration"],
+        )
+        return record
@@ -1,12 +1,37 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field, SecretStr, validator
 from pydantic import Field, SecretStr, validator
-from typing import List
+from functools import lru_cache
+from typing import Any, Dict, List
 
 
 class AppConfig(BaseSettings):
     # LLM settings
     default_llm_model: str = Field("llama3:latest", description="Default LLM model to use")
+    llm_keep_alive: str = Field(
+        "", description="How long Ollama keeps a model loaded after a call, e.g. '30m' ('' = Ollama default)"
+    )
+    llm_preload: bool = Field(
+        False, description="Load a crew's models into Ollama before the crew starts"
+    )
+    llm_warmup_enabled: bool = Field(
+        True, description="Preload the configured crews' models and the embedding model at startup"
+    )
+    llm_keep_warm_interval: float = Field(
+        240.0, gt=0, description="Seconds between keep-alive requests while crew jobs are queued"
+    )
+    ollama_endpoints: List[str] = Field(
+        ["http://localhost:11434"], description="Ollama instances LLM calls are balanced over"
+    )
+    ollama_embedding_endpoints: List[str] = Field(
+        [], description="Ollama instances for embeddings (empty = ollama_endpoints)"
+    )
+    ollama_health_check_interval: float = Field(
+        30.0, gt=0, description="Seconds between Ollama health checks and before retrying a down instance"
+    )
+    ollama_load_timeout: float = Field(
+        300.0, gt=0, description="Seconds a model preload may take, cold loads of large models included"
+    )
 
     # API keys
     sec_api_key: SecretStr = Field(..., description="SEC API key")
@@ -21,21 +46,217 @@ class AppConfig(BaseSettings):
     search_result_limit: int = Field(
         100, description="Number of characters to log from search results"
     )
+    search_cache_enabled: bool = Field(
+        True, description="Cache Serper search results and coalesce identical queries"
+    )
+    search_cache_ttl: float = Field(
+        3600, ge=0, description="Seconds a cached search result stays valid (0 = forever)"
+    )
+    search_cache_max_entries: int = Field(
+        1000, ge=0, description="Maximum number of cached search results (0 = unbounded)"
+    )
+    search_cache_path: str = Field(
+        ".cache/search_cache.json",
+        description="File the search cache is persisted to between runs ('' = memory only)",
+    )
+    search_result_format: str = Field(
+        "compact", description="Search result format: 'compact' or 'full' (raw JSON)"
+    )
+    search_result_max_results: int = Field(
+        5, ge=1, description="Number of organic hits kept in compact search results"
+    )
+    search_result_max_tokens: int = Field(
+        800, ge=1, description="Approximate token budget of compact search results"
+    )
+    search_max_concurrency: int = Field(
+        4, ge=1, description="Maximum number of concurrent queries in a multi search"
+    )
+
+    # HTTP client settings
+    http_connection_limit: int = Field(
+        100, ge=0, description="Maximum number of pooled HTTP connections (0 = unbounded)"
+    )
+    http_connection_limit_per_host: int = Field(
+        10, ge=0, description="Maximum number of pooled HTTP connections per host"
+    )
+    http_dns_cache_ttl: int = Field(300, ge=0, description="DNS cache TTL in seconds")
+    http_keepalive_timeout: float = Field(
+        30.0, ge=0, description="Seconds to keep idle HTTP connections alive"
+    )
+    http_request_timeout: float = Field(
+        30.0, gt=0, description="Default total timeout per HTTP request in seconds"
+    )
+    rate_limits: Dict[str, Dict[str, Any]] = Field(
+        {
+            "serper": {"rate": 5.0, "burst": 10, "max_concurrency": 8},
+            "sec_api": {"rate": 5.0, "burst": 5, "max_concurrency": 5},
+            "edgar": {"rate": 10.0, "burst": 10, "max_concurrency": 5},
+        },
+        description="Per-endpoint rate (requests/sec), burst and adaptive concurrency bounds",
+    )
+    retry_budget_ratio: float = Field(
+        0.2, ge=0, description="Maximum ratio of retries to calls over the budget window"
+    )
+    retry_budget_min_retries: int = Field(
+        10, ge=0, description="Retries always allowed per budget window"
+    )
+    circuit_breakers: Dict[str, Dict[str, Any]] = Field(
+        {
+            "default": {
+                "failure_rate_threshold": 0.5,
+                "window": 30.0,
+                "min_calls": 5,
+                "cooldown": 30.0,
+            },
+        },
+        description="Circuit breaker settings; 'default' applies to serper, sec_api, ollama and embeddings",
+    )
 
     # SEC Tools settings
     sec_form_types: List[str] = Field(
         ["10-Q", "10-K"], description="SEC form types to search"
     )
 
+    filing_cache_dir: str = Field(
+        ".cache/filings", description="Directory where downloaded filings are stored"
+    )
+    filing_download_chunk_size: int = Field(
+        65_536, ge=1024, description="Chunk size in bytes for streaming filing downloads"
+    )
+    filing_text_extractor: str = Field(
+        "unstructured", description="Filing text extractor: 'unstructured' or 'edgar'"
+    )
+    filing_parse_executor: str = Field(
+        "process", description="Executor for filing parsing: 'process' or 'thread'"
+    )
+    filing_parse_workers: int = Field(
+        0, ge=0, description="Number of filing parsing workers (0 = CPU count)"
+    )
+    filing_freshness_ttl: float = Field(
+        21_600, ge=0, description="Seconds a mirrored latest filing is trusted before revalidating"
+    )  # 6 hours
+    sec_user_agent: str = Field(
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+        description="User-Agent sent to EDGAR (SEC asks for a name and contact email)",
+    )
+    filing_watchlist: List[str] = Field(
+        [], description="Tickers pre-synced into the local filing mirror by the sync command"
+    )
+
     # Embedding settings
     embedding_model: str = Field("llama2", description="Embedding model to use")
     embedding_chunk_size: int = Field(1000, ge=1, description="Chunk size for embeddings")
     embedding_chunk_overlap: int = Field(200, ge=0, description="Chunk overlap for embeddings")
 
+    embedding_batch_size: int = Field(
+        32, ge=1, description="Number of chunks sent per embedding batch"
+    )
+    embedding_max_concurrency: int = Field(
+        4, ge=1, description="Maximum number of embedding batches in flight"
+    )
+    embedding_cache_enabled: bool = Field(
+        True, description="Cache embedding vectors by model and chunk hash"
+    )
+    embedding_cache_path: str = Field(
+        ".cache/embeddings.sqlite3", description="SQLite file for the embedding cache"
+    )
+    embedding_cache_warm_paths: List[str] = Field(
+        [], description="Embedding cache files from previous runs to pre-warm from"
+    )
+
+    # LLM response cache settings
+    llm_cache_enabled: bool = Field(
+        True, description="Cache LLM completions by model, parameters and prompt"
+    )
+    llm_cache_path: str = Field(
+        ".cache/llm_responses.sqlite3", description="SQLite file for the LLM response cache"
+    )
+    llm_cache_ttl: float = Field(
+        604_800, ge=0, description="Seconds a cached completion stays valid (0 = never expires)"
+    )  # 7 days
+    llm_cache_max_entries: int = Field(
+        10_000, ge=0, description="Maximum number of cached completions (0 = unbounded)"
+    )
+    llm_cache_semantic_enabled: bool = Field(
+        False, description="Also answer prompts similar to a cached one, by embedding similarity"
+    )
+    llm_cache_similarity_threshold: float = Field(
+        0.97,
+        gt=0,
+        le=1,
+        description=(
+            "Minimum cosine similarity of a semantic cache hit. Crew prompts that differ only in "
+            "a company name or ticker score above it, so hits also need the same task variables"
+        ),
+    )
+
+    # Filing index cache settings
+    index_cache_dir: str = Field(
+        ".cache/indexes", description="Directory for persisted per-filing FAISS indexes"
+    )
+    index_cache_max_entries: int = Field(
+        50, ge=0, description="Maximum number of cached filing indexes (0 = unbounded)"
+    )
+    index_cache_max_bytes: int = Field(
+        1_073_741_824, ge=0, description="Maximum size of the index cache in bytes (0 = unbounded)"
+    )  # 1GB
+    index_cache_memory_entries: int = Field(
+        8, ge=0, description="Number of loaded filing indexes kept in memory (0 = none)"
+    )
+
     # Crew settings
     default_crew_process: str = Field(
         "sequential", description="Default process for crew execution"
     )
+    dag_max_parallel_tasks: int = Field(
+        4, ge=1, description="Tasks of a 'dag' process crew run concurrently at most"
+    )
+    batch_max_workers: int = Field(
+        4, ge=1, description="Number of crews run concurrently in batch mode"
+    )
+
+    # Durable job queue settings
+    job_queue_path: str = Field(
+        ".cache/jobs.sqlite3", description="SQLite file of the durable crew job queue"
+    )
+    job_queue_workers: int = Field(
+        4, ge=1, description="Number of queued crew jobs a worker process runs concurrently"
+    )
+    job_lease_timeout: float = Field(
+        600.0, gt=0, description="Seconds a leased job may go without a heartbeat before redelivery"
+    )
+    job_max_attempts: int = Field(
+        3, ge=1, description="Attempts per queued job before it is dead-lettered"
+    )
+    job_retry_base_delay: float = Field(
+        30.0, ge=0, description="Backoff before retrying a failed job, doubled per attempt"
+    )
+    job_retry_max_delay: float = Field(
+        1800.0, ge=0, description="Maximum backoff between attempts of a failed job"
+    )
+    job_poll_interval: float = Field(
+        2.0, gt=0, description="Seconds an idle queue worker waits before polling again"
+    )
+
+    # Server settings
+    server_host: str = Field("127.0.0.1", description="Address the crew server listens on")
+    server_port: int = Field(8080, ge=1, le=65535, description="Port the crew server listens on")
+    server_max_concurrent_jobs: int = Field(
+        2, ge=1, description="Number of crew jobs the server runs concurrently"
+    )
+    server_max_queue_size: int = Field(
+        100, ge=0, description="Maximum number of queued crew jobs (0 = unbounded)"
+    )
+    server_job_retention: int = Field(
+        500, ge=1, description="Number of finished jobs whose status and result are kept"
+    )
+    server_max_buffered_tokens: int = Field(
+        10_000, ge=0, description="Token events kept per running job for late event subscribers"
+    )
+    server_warm_components: List[str] = Field(
+        ["agent_manager", "task_manager", "crew_runner"],
+        description="Dependencies built when the server starts instead of on the first job",
+    )
 
     @validator("log_level")
     def log_level_must_be_valid(cls, v):
@@ -44,6 +265,27 @@ class AppConfig(BaseSettings):
             raise ValueError(f"Log level must be one of {valid_levels}")
         return v.upper()
 
+    @validator("search_result_format")
+    def search_result_format_must_be_valid(cls, v):
+        valid_formats = ["compact", "full"]
+        if v.lower() not in valid_formats:
+            raise ValueError(f"Search result format must be one of {valid_formats}")
+        return v.lower()
+
+    @validator("filing_text_extractor")
+    def filing_text_extractor_must_be_valid(cls, v):
+        valid_extractors = ["unstructured", "edgar"]
+        if v.lower() not in valid_extractors:
+            raise ValueError(f"Filing text extractor must be one of {valid_extractors}")
+        return v.lower()
+
+    @validator("filing_parse_executor")
+    def filing_parse_executor_must_be_valid(cls, v):
+        valid_executors = ["process", "thread"]
+        if v.lower() not in valid_executors:
+            raise ValueError(f"Filing parse executor must be one of {valid_executors}")
+        return v.lower()
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -53,5 +295,15 @@ def load_config() -> AppConfig:
     return AppConfig()
 
 
-# Global config object
-config = load_config()
+@lru_cache(maxsize=None)
+def get_config() -> AppConfig:
+    """Return the global config object, loading it on first use."""
+    return load_config()
+
+
+def __getattr__(name: str) -> Any:
+    # Global config object, built on first access rather than at import so
+    # that importing modules does not read and validate the settings.
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
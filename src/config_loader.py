@@ -1,10 +1,13 @@
 import os
 from typing import Dict, Any, Tuple, List
 from utils import load_yaml_config, load_environment_variables, get_crew_configs
-from logging_config import setup_logging
+from logging_config import setup_logging, get_logger
+from task_graph import build_task_graph
+from llm_pool import LLM_PARAMS
 from exceptions import ConfigError, FileNotFoundError, InvalidConfigError, APIKeyError
 
-logger = setup_logging()
+setup_logging()
+logger = get_logger(__name__)
 
 
 def load_main_config() -> Dict[str, Any]:
@@ -103,4 +106,27 @@ def validate_crew_config(config: Dict[str, Any]) -> None:
         )
     if "tasks" not in config or not isinstance(config["tasks"], list):
         raise InvalidConfigError("Crew configuration must contain a 'tasks' list")
+    if any("depends_on" in task for task in config["tasks"]):
+        build_task_graph(config["tasks"])  # Rejects unknown dependencies and cycles
+    for owner, owner_config in [("crew", config), *config["agents"].items()]:
+        validate_llm_config(owner, owner_config)
+    if not isinstance(config.get("llm_cache", True), bool):
+        raise InvalidConfigError("Crew 'llm_cache' must be true or false")
     # Add more specific validations as needed
+
+
+def validate_llm_config(owner: str, config: Dict[str, Any]) -> None:
+    """Validate the ``llm_model``/``llm_params`` overrides of a crew or agent."""
+    if not isinstance(config, dict):
+        raise InvalidConfigError(f"Configuration of {owner} must be a dictionary")
+    if "llm_model" in config and not isinstance(config["llm_model"], str):
+        raise InvalidConfigError(f"llm_model of {owner} must be a model name")
+    params = config.get("llm_params") or {}
+    if not isinstance(params, dict):
+        raise InvalidConfigError(f"llm_params of {owner} must be a dictionary")
+    unknown = sorted(set(params) - set(LLM_PARAMS))
+    if unknown:
+        raise InvalidConfigError(
+            f"Unknown llm_params of {owner}: {', '.join(unknown)}"
+            f" (expected some of: {', '.join(LLM_PARAMS)})"
+        )
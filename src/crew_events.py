@@ -0,0 +1,139 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional
+
+EVENT_TYPES = (
+    "crew_started",
+    "task_started",
+    "tool_call",
+    "token",
+    "task_finished",
+    "crew_finished",
+    "error",
+)
+
+EventSink = Callable[[Dict[str, Any]], None]
+
+# Where events of the current crew run go, plus fields (task index, agent)
+# added to every event. Context variables follow the crew into its worker
+# threads because asyncio.to_thread copies the caller's context.
+_event_sink: ContextVar[Optional[EventSink]] = ContextVar(
+    "crew_event_sink", default=None
+)
+_event_scope: ContextVar[Dict[str, Any]] = ContextVar("crew_event_scope", default={})
+
+_CLOSED: Any = object()
+
+
+def make_event(event_type: str, **fields: Any) -> Dict[str, Any]:
+    """Build an event of ``event_type`` stamped with the current time and scope."""
+    return {"type": event_type, "time": time.time(), **_event_scope.get(), **fields}
+
+
+def emit(event_type: str, **fields: Any) -> None:
+    """Send an event to the crew run being streamed, if any."""
+    sink = _event_sink.get()
+    if sink is not None:
+        sink(make_event(event_type, **fields))
+
+
+def streaming() -> bool:
+    """Whether the current crew run is being streamed."""
+    return _event_sink.get() is not None
+
+
+@contextmanager
+def event_scope(**fields: Any) -> Iterator[None]:
+    """Add ``fields`` (e.g. the task being run) to the events emitted inside."""
+    token = _event_scope.set({**_event_scope.get(), **fields})
+    try:
+        yield
+    finally:
+        _event_scope.reset(token)
+
+
+def set_event_scope(**fields: Any) -> None:
+    """
+    Like ``event_scope``, for the rest of the current context: used by
+    callbacks of a crew running in a worker thread, whose context is a copy.
+    """
+    _event_scope.set({**_event_scope.get(), **fields})
+
+
+def emit_agent_step(step_output: Any) -> None:
+    """crewai ``step_callback``: emit a tool_call event for each tool the agent used."""
+    if not streaming() or not isinstance(step_output, list):
+        return
+    for step in step_output:
+        action, observation = (
+            (step.action, step.observation) if hasattr(step, "action") else step
+        )
+        emit(
+            "tool_call",
+            tool=getattr(action, "tool", ""),
+            tool_input=str(getattr(action, "tool_input", "")),
+            observation=str(observation)[:500],
+        )
+
+
+class EventStream:
+    """
+    Async iterator over the events of one crew run.
+
+    Events may be published from any thread; they are handed to the event
+    loop the stream was created on.
+    """
+
+    def __init__(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queue: "asyncio.Queue[Any]" = asyncio.Queue()
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+
+    def close(self) -> None:
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, _CLOSED)
+
+    @contextmanager
+    def bind(self) -> Iterator[None]:
+        """Route the events emitted inside (and in threads started inside) here."""
+        token = _event_sink.set(self.publish)
+        try:
+            yield
+        finally:
+            _event_sink.reset(token)
+
+    def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        event = await self._queue.get()
+        if event is _CLOSED:
+            raise StopAsyncIteration
+        event_dict: Dict[str, Any] = event
+        return event_dict
+
+
+def render_event(event: Dict[str, Any]) -> str:
+    """
+    Render an event for a terminal: tokens inline, task boundaries and tool
+    calls on their own lines. Errors render as nothing; the caller reports
+    the exception the stream raises.
+    """
+    event_type = event["type"]
+    if event_type == "token":
+        text: str = event["text"]
+        return text
+    if event_type == "task_started":
+        return f"\n\n=== Task {event['task'] + 1}: {event['agent']} ===\n"
+    if event_type == "tool_call":
+        return f"\n[{event['tool']}] {event['tool_input'][:200]}\n"
+    if event_type == "task_finished":
+        return (
+            f"\n--- Task {event['task'] + 1} finished in {event['duration']:.1f}s ---\n"
+        )
+    if event_type == "crew_finished":
+        return f"\n\nCrew's work result:\n{event['result']}\n"
+    return ""
@@ -1,9 +1,24 @@
-from typing import Dict, List, Any
+import asyncio
+import time
+from typing import AsyncIterator, Dict, List, Any, Optional
 from crewai import Crew, Agent, Task
-from logging_config import setup_logging
+from logging_config import setup_logging, get_logger
 from exceptions import CrewExecutionError
+from crew_events import (
+    EventStream,
+    emit,
+    emit_agent_step,
+    event_scope,
+    make_event,
+    set_event_scope,
+)
+from task_graph import critical_path, sink_nodes, topological_order
 
-logger = setup_logging()
+setup_logging()
+logger = get_logger(__name__)
+
+DAG_PROCESS = "dag"
+SEQUENTIAL_PROCESS = "sequential"
 
 
 class CrewRunner:
@@ -15,14 +30,203 @@ class CrewRunner:
     ) -> str:
         """Set up and run the crew with given agents and tasks."""
         try:
+            if process == DAG_PROCESS:
+                return await self.run_dag(tasks)
+
             crew = Crew(
                 agents=list(agents.values()), tasks=tasks, verbose=2, process=process
             )
 
             logger.info("Starting crew execution")
-            result: str = await crew.kickoff()
+            # kickoff() is blocking; run it in a worker thread so that several
+            # crews can execute concurrently on the same event loop.
+            result: str = await asyncio.to_thread(crew.kickoff)
+            logger.info("Crew execution completed successfully")
+            return result
+        except Exception as e:
+            logger.error(f"Error during crew execution: {e}")
+            raise CrewExecutionError(f"Error during crew execution: {e}")
+
+    async def run_dag(self, tasks: List[Task]) -> str:
+        """
+        Run tasks as a dependency graph, each as soon as the tasks in its
+        ``context`` have finished.
+
+        Independent branches run concurrently (at most ``dag_max_parallel_tasks``
+        at once, and never two tasks of the same agent), upstream outputs reach
+        a task through its context, and the result is the output of the tasks
+        nothing depends on.
+        """
+        positions = {id(task): index for index, task in enumerate(tasks)}
+        graph: Dict[int, List[int]] = {
+            index: [positions[id(upstream)] for upstream in (task.context or [])]
+            for index, task in enumerate(tasks)
+        }
+        semaphore = asyncio.Semaphore(self.config.get("dag_max_parallel_tasks", 4))
+        agent_locks: Dict[int, asyncio.Lock] = {
+            id(task.agent): asyncio.Lock() for task in tasks
+        }
+        durations: Dict[int, float] = {}
+
+        async def run_task(index: int, upstream: List["asyncio.Task[str]"]) -> str:
+            await asyncio.gather(*upstream)
+            task = tasks[index]
+            async with semaphore, agent_locks[id(task.agent)]:
+                with event_scope(task=index, agent=task.agent.role):
+                    logger.info("Starting DAG task", task=index, agent=task.agent.role)
+                    emit("task_started", description=task.description)
+                    start_time = time.monotonic()
+                    output: str = await asyncio.to_thread(self._execute_task, task)
+                    durations[index] = time.monotonic() - start_time
+                    logger.info(
+                        "DAG task completed",
+                        task=index,
+                        agent=task.agent.role,
+                        duration=durations[index],
+                    )
+                    emit("task_finished", output=output, duration=durations[index])
+                return output
+
+        logger.info("Starting crew execution", process=DAG_PROCESS, tasks=len(tasks))
+        start_time = time.monotonic()
+        runs: Dict[int, "asyncio.Task[str]"] = {}
+        for index in topological_order(graph):
+            runs[index] = asyncio.create_task(
+                run_task(index, [runs[upstream] for upstream in graph[index]])
+            )
+        try:
+            await asyncio.gather(*runs.values())
+        except BaseException:
+            for run in runs.values():
+                run.cancel()
+            await asyncio.gather(*runs.values(), return_exceptions=True)
+            raise
+        wall_time = time.monotonic() - start_time
+
+        path_time, path = critical_path(graph, durations)
+        task_time = sum(durations.values())
+        logger.info(
+            "Crew execution completed successfully",
+            process=DAG_PROCESS,
+            wall_time=wall_time,
+            critical_path_time=path_time,
+            critical_path=[tasks[index].agent.role for index in path],
+            task_time=task_time,
+            parallelism=task_time / wall_time if wall_time else 1.0,
+        )
+        return "\n\n".join(runs[index].result() for index in sink_nodes(graph))
+
+    async def stream_crew(
+        self, agents: Dict[str, Agent], tasks: List[Task], process: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the crew and yield its events as they happen: ``crew_started``,
+        ``task_started``, ``tool_call``, ``token`` (LLM output chunks),
+        ``task_finished`` and finally ``crew_finished`` with the result, or
+        ``error`` followed by the CrewExecutionError being raised.
+
+        Sequential crews run through ``kickoff`` as with ``run_crew``, task
+        boundaries being reported by the crew's callbacks. Other processes
+        besides ``dag`` only stream tokens.
+        """
+        stream = EventStream()
+        start_time = time.monotonic()
+        first_output: Optional[float] = None
+
+        async def run() -> None:
+            with stream.bind():
+                try:
+                    stream.publish(
+                        make_event("crew_started", process=process, tasks=len(tasks))
+                    )
+                    if process == SEQUENTIAL_PROCESS:
+                        result = await self._run_sequential_with_events(agents, tasks)
+                    else:
+                        result = await self.run_crew(agents, tasks, process)
+                    stream.publish(make_event("crew_finished", result=result))
+                except BaseException as e:
+                    stream.publish(make_event("error", error=str(e)))
+                    raise
+                finally:
+                    stream.close()
+
+        runner = asyncio.create_task(run())
+        try:
+            async for event in stream:
+                if first_output is None and event["type"] in ("token", "tool_call"):
+                    first_output = time.monotonic() - start_time
+                    logger.info("Crew first output", time_to_first_output=first_output)
+                yield event
+            await runner
+        finally:
+            if not runner.done():
+                runner.cancel()
+                await asyncio.gather(runner, return_exceptions=True)
+        logger.info(
+            "Crew stream completed",
+            time_to_first_output=first_output,
+            duration=time.monotonic() - start_time,
+        )
+
+    async def _run_sequential_with_events(
+        self, agents: Dict[str, Agent], tasks: List[Task]
+    ) -> str:
+        try:
+            logger.info("Starting crew execution", process=SEQUENTIAL_PROCESS)
+            result: str = await asyncio.to_thread(
+                self._kickoff_with_events, agents, tasks
+            )
             logger.info("Crew execution completed successfully")
             return result
         except Exception as e:
             logger.error(f"Error during crew execution: {e}")
             raise CrewExecutionError(f"Error during crew execution: {e}")
+
+    @staticmethod
+    def _kickoff_with_events(agents: Dict[str, Agent], tasks: List[Task]) -> str:
+        # Runs in a worker thread: the crew's callbacks run here in task
+        # order, so they can move the event scope from task to task.
+        current = 0
+        start_time = time.monotonic()
+
+        def task_started(index: int) -> None:
+            nonlocal current, start_time
+            current, start_time = index, time.monotonic()
+            set_event_scope(task=index, agent=tasks[index].agent.role)
+            emit("task_started", description=tasks[index].description)
+
+        def task_finished(output: Any) -> None:
+            emit(
+                "task_finished",
+                output=str(getattr(output, "raw_output", output)),
+                duration=time.monotonic() - start_time,
+            )
+            if current + 1 < len(tasks):
+                task_started(current + 1)
+
+        crew = Crew(
+            agents=list(agents.values()),
+            tasks=tasks,
+            verbose=2,
+            process=SEQUENTIAL_PROCESS,
+            step_callback=emit_agent_step,
+            task_callback=task_finished,
+        )
+        if tasks:
+            task_started(0)
+        result: str = crew.kickoff()
+        return result
+
+    @staticmethod
+    def _execute_task(task: Task) -> str:
+        # A one-task crew sets the agent up the way kickoff() does; the task
+        # itself reads its upstream outputs from its context.
+        crew = Crew(
+            agents=[task.agent],
+            tasks=[task],
+            verbose=2,
+            process=SEQUENTIAL_PROCESS,
+            step_callback=emit_agent_step,
+        )
+        result: str = crew.kickoff()
+        return result
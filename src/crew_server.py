@@ -0,0 +1,371 @@
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from aiohttp import web
+from logging_config import LoggerMixin
+from exceptions import (
+    BaseError,
+    ConfigError,
+    InvalidConfigError,
+    JobNotFoundError,
+    JobQueueFullError,
+)
+
+RunCrew = Callable[[str, Dict[str, str]], Awaitable[str]]
+StreamCrew = Callable[[str, Dict[str, str]], AsyncIterator[Dict[str, Any]]]
+ListCrews = Callable[[], List[str]]
+
+JOB_STATUSES = ("queued", "running", "success", "error", "cancelled")
+FINISHED_STATUSES = ("success", "error", "cancelled")
+
+
+class CrewJobManager(LoggerMixin):
+    """
+    In-process table of crew jobs executed by a bounded worker pool.
+
+    Jobs are queued in submission order and run by ``max_concurrency``
+    workers. The status and result of the last ``max_finished_jobs`` finished
+    jobs are kept for querying; older ones are forgotten.
+
+    Given ``stream_crew``, jobs are run through it and their events can be
+    followed live with ``subscribe``. Token events are only kept while the
+    job runs, and at most ``max_buffered_tokens`` of them: later ones still
+    reach the current subscribers but are not replayed to new ones.
+    Afterwards the job's task, tool and result events remain.
+    """
+
+    def __init__(
+        self,
+        run_crew: RunCrew,
+        max_concurrency: int = 2,
+        max_queue_size: int = 100,
+        max_finished_jobs: int = 500,
+        stream_crew: Optional[StreamCrew] = None,
+        max_buffered_tokens: int = 10_000,
+    ) -> None:
+        """
+        Args:
+            run_crew (RunCrew): Coroutine running a crew file with task variables.
+            max_concurrency (int): Number of jobs run at the same time.
+            max_queue_size (int): Maximum number of queued jobs (0 = unbounded).
+            max_finished_jobs (int): Number of finished jobs kept for status queries.
+            stream_crew (StreamCrew, optional): Async generator running a crew
+                file and yielding its events, used instead of ``run_crew``.
+            max_buffered_tokens (int): Token events kept per running job for
+                subscribers joining late.
+        """
+        if max_concurrency < 1:
+            raise ConfigError("Server max_concurrent_jobs must be at least 1")
+        self.run_crew: RunCrew = run_crew
+        self.max_concurrency: int = max_concurrency
+        self.max_queue_size: int = max_queue_size
+        self.max_finished_jobs: int = max_finished_jobs
+        self.stream_crew: Optional[StreamCrew] = stream_crew
+        self.max_buffered_tokens: int = max_buffered_tokens
+        self.jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._events: Dict[str, List[Dict[str, Any]]] = {}
+        self._buffered_tokens: Dict[str, int] = {}
+        self._subscribers: Dict[str, List["asyncio.Queue[Any]"]] = {}
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._workers: List["asyncio.Task[None]"] = []
+
+    async def start(self) -> None:
+        """Start the worker pool."""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.max_concurrency)
+        ]
+        self.logger.info("Crew job workers started", workers=self.max_concurrency)
+
+    async def stop(self) -> None:
+        """Stop the worker pool, cancelling running jobs."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self.logger.info("Crew job workers stopped", **self.stats())
+
+    def submit(
+        self, crew: str, variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Queue a crew run.
+
+        Returns:
+            dict: The new job.
+
+        Raises:
+            JobQueueFullError: If ``max_queue_size`` jobs are already queued.
+        """
+        if self.max_queue_size and self._queue.qsize() >= self.max_queue_size:
+            raise JobQueueFullError(
+                f"Job queue is full ({self.max_queue_size} jobs queued)"
+            )
+        job: Dict[str, Any] = {
+            "id": uuid.uuid4().hex,
+            "crew": crew,
+            "variables": {str(k): str(v) for k, v in (variables or {}).items()},
+            "status": "queued",
+            "submitted_at": datetime.now(timezone.utc).isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "duration": None,
+            "result": None,
+            "error": None,
+        }
+        self.jobs[job["id"]] = job
+        self._events[job["id"]] = []
+        self._subscribers[job["id"]] = []
+        self._queue.put_nowait(job["id"])
+        self.logger.info(
+            "Crew job queued",
+            job_id=job["id"],
+            crew=crew,
+            queue_depth=self._queue.qsize(),
+        )
+        return dict(job)
+
+    def get(self, job_id: str) -> Dict[str, Any]:
+        """Return a job by id, raising JobNotFoundError if it is unknown."""
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise JobNotFoundError(f"Unknown job: {job_id}")
+        return dict(job)
+
+    def subscribe(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Follow the events of a job: those emitted so far, then new ones as
+        they happen, until the job finishes.
+
+        Raises:
+            JobNotFoundError: If the job is unknown.
+        """
+        job = self.get(job_id)
+        queue: "asyncio.Queue[Any]" = asyncio.Queue()
+        for event in self._events[job_id]:
+            queue.put_nowait(event)
+        if job["status"] in FINISHED_STATUSES:
+            queue.put_nowait(None)
+        else:
+            self._subscribers[job_id].append(queue)
+
+        async def events() -> AsyncIterator[Dict[str, Any]]:
+            try:
+                while True:
+                    event = await queue.get()
+                    if event is None:
+                        return
+                    yield event
+            finally:
+                if queue in self._subscribers.get(job_id, []):
+                    self._subscribers[job_id].remove(queue)
+
+        return events()
+
+    def list_jobs(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return the known jobs, optionally only those in ``status``, without results."""
+        return [
+            {k: v for k, v in job.items() if k != "result"}
+            for job in self.jobs.values()
+            if status is None or job["status"] == status
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the queue depth and the number of jobs per status."""
+        counts = {status: 0 for status in JOB_STATUSES}
+        for job in self.jobs.values():
+            counts[job["status"]] += 1
+        return {
+            "queue_depth": self._queue.qsize(),
+            "running": counts["running"],
+            "max_concurrency": self.max_concurrency,
+            "counts": counts,
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self.jobs.get(job_id)
+                if job is not None:
+                    await self._run_job(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job: Dict[str, Any]) -> None:
+        start_time = time.time()
+        job["status"] = "running"
+        job["started_at"] = datetime.now(timezone.utc).isoformat()
+        self.logger.info("Crew job started", job_id=job["id"], crew=job["crew"])
+        try:
+            if self.stream_crew is None:
+                job["result"] = await self.run_crew(job["crew"], job["variables"])
+            else:
+                async for event in self.stream_crew(job["crew"], job["variables"]):
+                    self._publish(job["id"], event)
+                    if event["type"] == "crew_finished":
+                        job["result"] = event["result"]
+            job["status"] = "success"
+        except asyncio.CancelledError:
+            job["status"] = "cancelled"
+            raise
+        except Exception as e:
+            self.logger.error("Crew job failed", job_id=job["id"], error=str(e))
+            job["status"] = "error"
+            job["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            job["duration"] = time.time() - start_time
+            job["finished_at"] = datetime.now(timezone.utc).isoformat()
+            self.logger.info(
+                "Crew job finished",
+                job_id=job["id"],
+                status=job["status"],
+                duration=job["duration"],
+            )
+            self._finish_events(job["id"])
+            self._forget_finished()
+
+    def _publish(self, job_id: str, event: Dict[str, Any]) -> None:
+        if event["type"] != "token":
+            self._events[job_id].append(event)
+        elif self._buffered_tokens.get(job_id, 0) < self.max_buffered_tokens:
+            self._events[job_id].append(event)
+            self._buffered_tokens[job_id] = self._buffered_tokens.get(job_id, 0) + 1
+            if self._buffered_tokens[job_id] == self.max_buffered_tokens:
+                self.logger.warning(
+                    "Token event buffer full, later tokens are not replayed",
+                    job_id=job_id,
+                    max_buffered_tokens=self.max_buffered_tokens,
+                )
+        for queue in self._subscribers[job_id]:
+            queue.put_nowait(event)
+
+    def _finish_events(self, job_id: str) -> None:
+        self._events[job_id] = [
+            event for event in self._events[job_id] if event["type"] != "token"
+        ]
+        self._buffered_tokens.pop(job_id, None)
+        for queue in self._subscribers.pop(job_id, []):
+            queue.put_nowait(None)
+
+    def _forget_finished(self) -> None:
+        finished = [
+            job_id
+            for job_id, job in self.jobs.items()
+            if job["status"] in FINISHED_STATUSES
+        ]
+        for job_id in finished[: max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job_id]
+            del self._events[job_id]
+
+
+class CrewServer(LoggerMixin):
+    """
+    Local HTTP/JSON API over a CrewJobManager.
+
+    Routes:
+        GET  /health         Queue depth and job counts.
+        GET  /crews          Available crew configuration files.
+        POST /jobs           Submit ``{"crew": "<file>", "variables": {...}}``.
+        GET  /jobs           List jobs (``?status=`` filters), without results.
+        GET  /jobs/{job_id}  Status and result of one job.
+        GET  /jobs/{job_id}/events
+                             The job's events as newline-delimited JSON,
+                             streamed until the job finishes.
+    """
+
+    def __init__(self, manager: CrewJobManager, list_crews: ListCrews) -> None:
+        self.manager: CrewJobManager = manager
+        self.list_crews: ListCrews = list_crews
+
+    def create_app(self) -> web.Application:
+        """Build the aiohttp application; the worker pool runs with the app."""
+        app = web.Application(middlewares=[self._error_middleware])
+        app.add_routes(
+            [
+                web.get("/health", self.health),
+                web.get("/crews", self.crews),
+                web.post("/jobs", self.submit_job),
+                web.get("/jobs", self.list_jobs),
+                web.get("/jobs/{job_id}", self.get_job),
+                web.get("/jobs/{job_id}/events", self.job_events),
+            ]
+        )
+        app.on_startup.append(self._on_startup)
+        app.on_cleanup.append(self._on_cleanup)
+        return app
+
+    async def serve(self, host: str, port: int) -> None:
+        """Serve the API until cancelled."""
+        runner = web.AppRunner(self.create_app())
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, host, port).start()
+            self.logger.info("Crew server listening", host=host, port=port)
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok", **self.manager.stats()})
+
+    async def crews(self, request: web.Request) -> web.Response:
+        return web.json_response({"crews": self.list_crews()})
+
+    async def submit_job(self, request: web.Request) -> web.Response:
+        try:
+            body = await request.json()
+        except ValueError:
+            raise InvalidConfigError("Request body must be a JSON object")
+        if not isinstance(body, dict) or not isinstance(body.get("crew"), str):
+            raise InvalidConfigError("Request body must contain a 'crew' file name")
+        variables = body.get("variables") or {}
+        if not isinstance(variables, dict):
+            raise InvalidConfigError("'variables' must be a JSON object")
+        if body["crew"] not in self.list_crews():
+            raise JobNotFoundError(f"Unknown crew: {body['crew']}")
+        job = self.manager.submit(body["crew"], variables)
+        return web.json_response(job, status=202)
+
+    async def list_jobs(self, request: web.Request) -> web.Response:
+        status = request.query.get("status")
+        return web.json_response(
+            {"jobs": self.manager.list_jobs(status), **self.manager.stats()}
+        )
+
+    async def get_job(self, request: web.Request) -> web.Response:
+        return web.json_response(self.manager.get(request.match_info["job_id"]))
+
+    async def job_events(self, request: web.Request) -> web.StreamResponse:
+        events = self.manager.subscribe(request.match_info["job_id"])
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        async for event in events:
+            await response.write(json.dumps(event).encode() + b"\n")
+        await response.write_eof()
+        return response
+
+    @web.middleware
+    async def _error_middleware(
+        self, request: web.Request, handler: Any
+    ) -> web.StreamResponse:
+        try:
+            response: web.StreamResponse = await handler(request)
+            return response
+        except JobNotFoundError as e:
+            return web.json_response({"error": str(e)}, status=404)
+        except JobQueueFullError as e:
+            return web.json_response({"error": str(e)}, status=503)
+        except BaseError as e:
+            return web.json_response({"error": str(e)}, status=400)
+
+    async def _on_startup(self, app: web.Application) -> None:
+        await self.manager.start()
+
+    async def _on_cleanup(self, app: web.Application) -> None:
+        await self.manager.stop()
@@ -1,36 +1,362 @@
-from typing import Dict, Any
-from langchain_community.llms import Ollama
-from search_tool import create_search_tool
-from sec_tools import SECTools
-from config import config
+import asyncio
+import inspect
+import os
+from functools import cached_property
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Union,
+)
+from search_cache import SearchCache
+from config import AppConfig, get_config
 from exceptions import ConfigError, OllamaInitializationError
-from agent_manager import AgentManager
-from task_manager import TaskManager
-from crew_runner import CrewRunner
-from embedding_manager import EmbeddingManager
-
-class Dependencies:
-    def __init__(self):
-        self.config: Dict[str, Any] = config.dict()
-        self.ollama_llm: Ollama = self._initialize_ollama()
-        self.search_tool = create_search_tool(self.config, config.serper_api_key.get_secret_value())
-        self.sec_tools = SECTools(self.config, config.sec_api_key.get_secret_value())
-        self.embedding_manager = EmbeddingManager()
-
-        self.agent_manager = AgentManager(
+from http_client import HTTPClient
+from limiter import LimiterRegistry
+from error_handling import configure_retry_budget, CircuitBreakerRegistry
+from filing_processor import FilingProcessor
+from filing_store import FilingStore
+from job_queue import JobQueue
+from lazy import Lazy
+from logging_config import LoggerMixin
+from utils import get_project_root
+
+# Modules that pull in crewai, langchain, faiss or sec_api are imported by
+# the properties that need them, so that importing this module stays cheap.
+if TYPE_CHECKING:
+    from langchain_community.llms import Ollama
+    from sec_tools import SECTools
+    from agent_manager import AgentManager
+    from task_manager import TaskManager
+    from crew_runner import CrewRunner
+    from embedding_manager import EmbeddingManager
+    from index_store import FilingIndexStore
+    from llm_cache import LLMResponseCache
+    from ollama_pool import OllamaEndpointPool
+    from llm_pool import LLMPool
+    from model_warmup import ModelWarmer
+
+Hook = Callable[[], Union[Awaitable[None], None]]
+
+
+class Dependencies(LoggerMixin):
+    """
+    Lazy dependency container.
+
+    Every component is created on first access and cached, so a crew that
+    uses no tools never builds the search or SEC tools. Components that hold
+    resources register a shutdown hook when they are created; ``aclose``
+    runs those hooks in reverse order. Startup hooks registered with
+    ``on_startup`` run once in ``startup``, or right away for components
+    created after it.
+    """
+
+    def __init__(self, app_config: Optional[AppConfig] = None):
+        self._app_config = app_config
+        self._startup_hooks: List[Hook] = []
+        self._shutdown_hooks: List[Hook] = []
+        self._started = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._late_hooks: Set["asyncio.Task[None]"] = set()
+
+    def on_startup(self, hook: Hook) -> None:
+        """
+        Register a sync or async hook run by ``startup``. Once the container
+        has started, the hook is scheduled on its event loop right away
+        instead, even if the component was created in another thread.
+        """
+        if not self._started or self._loop is None:
+            self._startup_hooks.append(hook)
+            return
+        self._loop.call_soon_threadsafe(self._start_late_hook, hook)
+
+    def on_shutdown(self, hook: Hook) -> None:
+        """Register a sync or async hook run by ``aclose``."""
+        self._shutdown_hooks.append(hook)
+
+    async def startup(self) -> None:
+        """Run the startup hooks once."""
+        if self._started:
+            return
+        self._started = True
+        self._loop = asyncio.get_running_loop()
+        for hook in self._startup_hooks:
+            await self._run_hook(hook)
+
+    def warm_up(self, names: List[str]) -> None:
+        """Build the named components now rather than on first use."""
+        for name in names:
+            getattr(self, name)
+        self.logger.info("Dependencies warmed up", components=names)
+
+    async def aclose(self) -> None:
+        """Release resources held by the components created so far and reset the container."""
+        if self._late_hooks:
+            await asyncio.gather(*self._late_hooks, return_exceptions=True)
+        while self._shutdown_hooks:
+            hook = self._shutdown_hooks.pop()
+            try:
+                await self._run_hook(hook)
+            except Exception as e:
+                self.logger.error(
+                    "Shutdown hook failed",
+                    hook=getattr(hook, "__qualname__", repr(hook)),
+                    error=str(e),
+                )
+        # Drop the cached components so that later use starts from scratch
+        # instead of reusing closed resources.
+        for name in [name for name in vars(self) if not name.startswith("_")]:
+            del self.__dict__[name]
+        # Components register their hooks again when they are rebuilt.
+        self._startup_hooks.clear()
+        self._started = False
+        self._loop = None
+
+    @cached_property
+    def app_config(self) -> AppConfig:
+        return self._app_config or get_config()
+
+    @cached_property
+    def config(self) -> Dict[str, Any]:
+        config: Dict[str, Any] = self.app_config.dict()
+        configure_retry_budget(
+            config["retry_budget_ratio"], config["retry_budget_min_retries"]
+        )
+        return config
+
+    @cached_property
+    def breakers(self) -> CircuitBreakerRegistry:
+        breakers = CircuitBreakerRegistry.from_config(self.config)
+        self.on_shutdown(breakers.log_metrics)
+        return breakers
+
+    @cached_property
+    def limiters(self) -> LimiterRegistry:
+        limiters = LimiterRegistry.from_config(self.config)
+        self.on_shutdown(limiters.log_metrics)
+        return limiters
+
+    @cached_property
+    def llm_pool(self) -> "LLMPool":
+        from llm_pool import LLMPool
+
+        return LLMPool(self._initialize_ollama, self.config["default_llm_model"])
+
+    @cached_property
+    def ollama_llm(self) -> "Ollama":
+        return self.llm_pool.get()
+
+    @cached_property
+    def ollama_pool(self) -> "OllamaEndpointPool":
+        return self._create_ollama_pool("generation")
+
+    @cached_property
+    def embedding_pool(self) -> "OllamaEndpointPool":
+        return self._create_ollama_pool("embedding")
+
+    @cached_property
+    def model_warmer(self) -> "ModelWarmer":
+        from model_warmup import ModelWarmer
+
+        model_warmer = ModelWarmer(
+            self.ollama_pool,
+            self.embedding_pool,
+            self.http_client,
+            keep_alive=self.config["llm_keep_alive"] or None,
+            interval=self.config["llm_keep_warm_interval"],
+        )
+        self.on_shutdown(model_warmer.stop)
+        return model_warmer
+
+    @cached_property
+    def llm_cache(self) -> Optional["LLMResponseCache"]:
+        from llm_cache import LLMResponseCache
+
+        embeddings = None
+        if self.config["llm_cache_semantic_enabled"]:
+            embeddings = self.embedding_manager.embeddings
+        llm_cache = LLMResponseCache.from_config(
+            self.config, get_project_root(), embeddings
+        )
+        if llm_cache is not None:
+            self.on_shutdown(llm_cache.close)
+            self.on_shutdown(llm_cache.log_stats)
+        return llm_cache
+
+    @cached_property
+    def http_client(self) -> HTTPClient:
+        http_client = HTTPClient.from_config(self.config)
+        self.on_shutdown(http_client.close)
+        return http_client
+
+    @cached_property
+    def search_cache(self) -> Optional[SearchCache]:
+        search_cache = SearchCache.from_config(self.config, get_project_root())
+        if search_cache is not None:
+            self.on_shutdown(search_cache.save)
+        return search_cache
+
+    @cached_property
+    def search_tool(self) -> Lazy[List[Any]]:
+        from search_tool import create_search_tools
+
+        # The tools are built by a coroutine; Lazy awaits it on first use.
+        return Lazy(
+            lambda: create_search_tools(
+                self.config,
+                self.app_config.serper_api_key.get_secret_value(),
+                self.http_client,
+                self.search_cache,
+                self.limiters,
+                self.breakers,
+            )
+        )
+
+    @cached_property
+    def index_store(self) -> "FilingIndexStore":
+        from index_store import FilingIndexStore
+
+        return FilingIndexStore(
+            os.path.join(get_project_root(), self.config["index_cache_dir"]),
+            max_entries=self.config["index_cache_max_entries"],
+            max_bytes=self.config["index_cache_max_bytes"],
+            memory_entries=self.config["index_cache_memory_entries"],
+        )
+
+    @cached_property
+    def embedding_manager(self) -> "EmbeddingManager":
+        from embedding_manager import EmbeddingManager
+
+        return EmbeddingManager(
+            breaker=self.breakers.get("embeddings"), endpoint_pool=self.embedding_pool
+        )
+
+    @cached_property
+    def filing_processor(self) -> FilingProcessor:
+        filing_processor = FilingProcessor.from_config(self.config)
+        self.on_shutdown(filing_processor.shutdown)
+        return filing_processor
+
+    @cached_property
+    def filing_store(self) -> FilingStore:
+        filing_store = FilingStore(
+            os.path.join(get_project_root(), self.config["filing_cache_dir"])
+        )
+        self.on_shutdown(filing_store.close)
+        return filing_store
+
+    @cached_property
+    def job_queue(self) -> JobQueue:
+        job_queue = JobQueue(
+            os.path.join(get_project_root(), self.config["job_queue_path"]),
+            lease_timeout=self.config["job_lease_timeout"],
+            max_attempts=self.config["job_max_attempts"],
+            retry_base_delay=self.config["job_retry_base_delay"],
+            retry_max_delay=self.config["job_retry_max_delay"],
+        )
+        self.on_shutdown(job_queue.close)
+        return job_queue
+
+    @cached_property
+    def sec_tools(self) -> "SECTools":
+        from sec_tools import SECTools
+
+        return SECTools(
             self.config,
-            self.ollama_llm,
+            self.app_config.sec_api_key.get_secret_value(),
+            self.index_store,
+            self.http_client,
+            self.embedding_manager.embeddings,
+            self.filing_processor,
+            self.filing_store,
+            self.limiters,
+            self.breakers,
+        )
+
+    @cached_property
+    def agent_manager(self) -> "AgentManager":
+        from agent_manager import AgentManager
+
+        return AgentManager(
+            self.config,
+            self.llm_pool,
             self.search_tool,
-            self.sec_tools,
-            self.embedding_manager
+            Lazy(lambda: self.sec_tools),
         )
-        self.task_manager = TaskManager(self.config)
-        self.crew_runner = CrewRunner(self.config)
 
-    def _initialize_ollama(self) -> Ollama:
+    @cached_property
+    def task_manager(self) -> "TaskManager":
+        from task_manager import TaskManager
+
+        return TaskManager(self.config)
+
+    @cached_property
+    def crew_runner(self) -> "CrewRunner":
+        from crew_runner import CrewRunner
+
+        return CrewRunner(self.config)
+
+    def _create_ollama_pool(self, name: str) -> "OllamaEndpointPool":
+        from ollama_pool import OllamaEndpointPool
+
+        pool = OllamaEndpointPool.from_config(self.config, name)
+        self.on_startup(lambda: pool.start_health_checks(self.http_client))
+        self.on_shutdown(pool.log_stats)
+        self.on_shutdown(pool.stop_health_checks)
+        return pool
+
+    def _initialize_ollama(
+        self, model: str, params: Dict[str, Any], cache: bool = True
+    ) -> "Ollama":
+        from guarded_models import CircuitBreakerCallbackHandler
+        from llm_callbacks import TokenEventCallbackHandler
+        from ollama_pool import PooledOllama
+
         try:
-            return Ollama(model=self.config["default_llm_model"])
+            if self.config["llm_keep_alive"]:
+                params = {"keep_alive": self.config["llm_keep_alive"], **params}
+            return PooledOllama(
+                model=model,
+                base_url=self.ollama_pool.urls[0],
+                pool=self.ollama_pool,
+                callbacks=[
+                    CircuitBreakerCallbackHandler(self.breakers.get("ollama")),
+                    TokenEventCallbackHandler(),
+                ],
+                cache=(self.llm_cache or False) if cache else False,
+                **params,
+            )
         except Exception as e:
-            raise OllamaInitializationError(f"Failed to initialize Ollama: {str(e)}")
+            raise OllamaInitializationError(
+                f"Failed to initialize Ollama model {model}: {str(e)}"
+            )
+
+    def _start_late_hook(self, hook: Hook) -> None:
+        async def run() -> None:
+            try:
+                await self._run_hook(hook)
+            except Exception as e:
+                self.logger.error(
+                    "Startup hook failed",
+                    hook=getattr(hook, "__qualname__", repr(hook)),
+                    error=str(e),
+                )
+
+        task = asyncio.ensure_future(run())
+        # Keep a reference until the task is done so it is not collected.
+        self._late_hooks.add(task)
+        task.add_done_callback(self._late_hooks.discard)
+
+    @staticmethod
+    async def _run_hook(hook: Hook) -> None:
+        result = hook()
+        if inspect.isawaitable(result):
+            await result
+
 
-dependencies = Dependencies()
\ No newline at end of file
+dependencies = Dependencies()
@@ -0,0 +1,93 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+from langchain_core.embeddings import Embeddings
+from logging_config import LoggerMixin
+
+
+class BatchedEmbeddings(Embeddings, LoggerMixin):
+    """
+    Embeddings wrapper that sends chunks to the underlying embeddings object in
+    fixed-size batches, with a bounded number of batches in flight at once.
+    """
+
+    def __init__(
+        self, embeddings: Embeddings, batch_size: int = 32, max_concurrency: int = 4
+    ) -> None:
+        """
+        Args:
+            embeddings (Embeddings): Embeddings object doing the actual work.
+            batch_size (int): Number of chunks per request batch.
+            max_concurrency (int): Maximum number of batches embedded concurrently.
+        """
+        if batch_size < 1 or max_concurrency < 1:
+            raise ValueError("batch_size and max_concurrency must be at least 1")
+        self.embeddings: Embeddings = embeddings
+        self.batch_size: int = batch_size
+        self.max_concurrency: int = max_concurrency
+        self.total_chunks: int = 0
+        self.total_seconds: float = 0.0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        start_time = time.perf_counter()
+        batches = self._batches(texts)
+        if len(batches) <= 1:
+            results = [self.embeddings.embed_documents(batch) for batch in batches]
+        else:
+            workers = min(self.max_concurrency, len(batches))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self.embeddings.embed_documents, batches))
+        return self._finish(results, len(texts), start_time)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        start_time = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self.embeddings.aembed_documents(batch)
+
+        results = await asyncio.gather(
+            *(embed_batch(batch) for batch in self._batches(texts))
+        )
+        return self._finish(results, len(texts), start_time)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.embeddings.aembed_query(text)
+
+    def throughput(self) -> Dict[str, Any]:
+        """Return cumulative chunk count, time spent and chunks/sec."""
+        return {
+            "chunks": self.total_chunks,
+            "seconds": self.total_seconds,
+            "chunks_per_sec": (
+                self.total_chunks / self.total_seconds if self.total_seconds else 0.0
+            ),
+        }
+
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        return [
+            texts[start : start + self.batch_size]
+            for start in range(0, len(texts), self.batch_size)
+        ]
+
+    def _finish(
+        self, results: List[List[List[float]]], chunks: int, start_time: float
+    ) -> List[List[float]]:
+        elapsed = time.perf_counter() - start_time
+        self.total_chunks += chunks
+        self.total_seconds += elapsed
+        if chunks:
+            self.logger.info(
+                "Embedding batches completed",
+                chunks=chunks,
+                batch_size=self.batch_size,
+                max_concurrency=self.max_concurrency,
+                seconds=elapsed,
+                chunks_per_sec=chunks / elapsed if elapsed else 0.0,
+            )
+        return [vector for batch in results for vector in batch]
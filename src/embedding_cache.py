@@ -0,0 +1,216 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from langchain_core.embeddings import Embeddings
+from logging_config import LoggerMixin
+
+
+def hash_text(text: str) -> str:
+    """Return the cache key digest of a chunk of text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache(LoggerMixin):
+    """
+    Persistent SQLite store of embedding vectors keyed by (model, sha256(text)).
+
+    Vectors are stored as packed float32 arrays. The store can be shared by
+    several embedding wrappers and threads.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        """
+        Args:
+            db_path (str): Path to the SQLite database file.
+        """
+        self.db_path: str = os.path.abspath(db_path)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL,"
+            " text_hash TEXT NOT NULL,"
+            " vector BLOB NOT NULL,"
+            " PRIMARY KEY (model, text_hash))"
+        )
+        self._conn.commit()
+
+    def get_many(self, model: str, hashes: Sequence[str]) -> Dict[str, List[float]]:
+        """Return the cached vectors found for the given text hashes."""
+        found: Dict[str, List[float]] = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._lock:
+            # Stay well below SQLite's host parameter limit.
+            for start in range(0, len(unique), 500):
+                batch = unique[start : start + 500]
+                placeholders = ",".join("?" for _ in batch)
+                rows = self._conn.execute(
+                    "SELECT text_hash, vector FROM embeddings"
+                    f" WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *batch],
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = array("f", blob).tolist()
+        return found
+
+    def put_many(
+        self, model: str, hashes: Sequence[str], vectors: Sequence[List[float]]
+    ) -> None:
+        """Store vectors for the given text hashes."""
+        rows = [
+            (model, text_hash, array("f", vector).tobytes())
+            for text_hash, vector in zip(hashes, vectors)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector)"
+                " VALUES (?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def warm_from(self, other_db_path: str) -> int:
+        """
+        Import all entries of another cache database, e.g. from a previous run.
+
+        Returns:
+            int: Number of new entries imported.
+        """
+        if not os.path.exists(other_db_path):
+            self.logger.warning(
+                "Embedding cache to warm from not found", path=other_db_path
+            )
+            return 0
+
+        with self._lock:
+            before = self._count()
+            self._conn.execute("ATTACH DATABASE ? AS warm", (other_db_path,))
+            try:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO embeddings (model, text_hash, vector)"
+                    " SELECT model, text_hash, vector FROM warm.embeddings"
+                )
+                self._conn.commit()
+            finally:
+                self._conn.execute("DETACH DATABASE warm")
+            imported = self._count() - before
+        self.logger.info(
+            "Embedding cache warmed", path=other_db_path, imported=imported
+        )
+        return imported
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _count(self) -> int:
+        count: int = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        return count
+
+
+class CachedEmbeddings(Embeddings, LoggerMixin):
+    """
+    Embeddings wrapper that only sends chunks missing from an EmbeddingCache to
+    the underlying embeddings object.
+    """
+
+    def __init__(
+        self, embeddings: Embeddings, cache: EmbeddingCache, model: str
+    ) -> None:
+        self.embeddings: Embeddings = embeddings
+        self.cache: EmbeddingCache = cache
+        self.model: str = model
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes, cached, missing = self._lookup(texts)
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            self._store(missing, vectors, cached)
+        return self._finish(texts, hashes, cached, missing)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes, cached, missing = await asyncio.to_thread(self._lookup, texts)
+        if missing:
+            vectors = await self.embeddings.aembed_documents(list(missing.values()))
+            await asyncio.to_thread(self._store, missing, vectors, cached)
+        return self._finish(texts, hashes, cached, missing)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.embeddings.aembed_query(text)
+
+    def _lookup(
+        self, texts: List[str]
+    ) -> Tuple[List[str], Dict[str, List[float]], Dict[str, str]]:
+        hashes = [hash_text(text) for text in texts]
+        cached = self.cache.get_many(self.model, hashes)
+        missing: Dict[str, str] = {}
+        for text_hash, text in zip(hashes, texts):
+            if text_hash not in cached:
+                missing.setdefault(text_hash, text)
+        return hashes, cached, missing
+
+    def _store(
+        self,
+        missing: Dict[str, str],
+        vectors: List[List[float]],
+        cached: Dict[str, List[float]],
+    ) -> None:
+        self.cache.put_many(self.model, list(missing.keys()), vectors)
+        cached.update(zip(missing.keys(), vectors))
+
+    def _finish(
+        self,
+        texts: List[str],
+        hashes: List[str],
+        cached: Dict[str, List[float]],
+        missing: Dict[str, str],
+    ) -> List[List[float]]:
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        self.logger.info(
+            "Embedding cache lookup",
+            model=self.model,
+            requested=len(texts),
+            embedded=len(missing),
+            **self.stats(),
+        )
+        return [cached[text_hash] for text_hash in hashes]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache hit/miss counters and the hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def create_cached_embeddings(
+    embeddings: Embeddings,
+    model: str,
+    cache_path: Optional[str],
+    warm_paths: Sequence[str] = (),
+) -> Embeddings:
+    """Wrap ``embeddings`` with a persistent cache, or return it as is when disabled."""
+    if not cache_path:
+        return embeddings
+    cache = EmbeddingCache(cache_path)
+    for path in warm_paths:
+        cache.warm_from(path)
+    return CachedEmbeddings(embeddings, cache, model)
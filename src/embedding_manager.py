@@ -1,13 +1,30 @@
-from typing import List, Dict, Any
-from langchain_community.embeddings import OllamaEmbeddings
-from langchain_community.vectorstores import FAISS
-from langchain.text_splitter import CharacterTextSplitter
-from langchain.docstore.document import Document
-from config import config
+import os
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
+from langchain_core.embeddings import Embeddings
+from config import get_config
+from embedding_cache import create_cached_embeddings
+from embedding_batcher import BatchedEmbeddings
+from error_handling import CircuitBreaker
+from guarded_models import CircuitBreakerEmbeddings
+from utils import get_project_root
+
+if TYPE_CHECKING:
+    from langchain.docstore.document import Document
+    from ollama_pool import OllamaEndpointPool
+
 
 class EmbeddingManager:
-    def __init__(self):
-        self.embeddings = OllamaEmbeddings(model=config.embedding_model)
+    def __init__(
+        self,
+        embeddings: Optional[Embeddings] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        endpoint_pool: Optional["OllamaEndpointPool"] = None,
+    ):
+        # Imported here because langchain is slow to import.
+        from langchain.text_splitter import CharacterTextSplitter
+
+        config = get_config()
+        self.embeddings = embeddings or self._create_embeddings(breaker, endpoint_pool)
         self.vectorstore = None
         self.text_splitter = CharacterTextSplitter(
             separator="\n",
@@ -16,8 +33,48 @@ class EmbeddingManager:
             length_function=len,
         )
 
-    def add_texts(self, texts: List[str], metadatas: List[Dict[str, Any]] = None) -> List[str]:
+    @staticmethod
+    def _create_embeddings(
+        breaker: Optional[CircuitBreaker] = None,
+        endpoint_pool: Optional["OllamaEndpointPool"] = None,
+    ) -> Embeddings:
+        """
+        Create batched Ollama embeddings, fronted by the persistent cache if
+        enabled, guarded by ``breaker`` and spread over the endpoints of
+        ``endpoint_pool`` if given.
+        """
+        from langchain_community.embeddings import OllamaEmbeddings
+
+        config = get_config()
+        cache_path: Optional[str] = None
+        if config.embedding_cache_enabled:
+            cache_path = os.path.join(get_project_root(), config.embedding_cache_path)
+        embeddings: Embeddings
+        if endpoint_pool is not None:
+            from ollama_pool import PooledEmbeddings
+
+            embeddings = PooledEmbeddings.create(config.embedding_model, endpoint_pool)
+        else:
+            embeddings = OllamaEmbeddings(model=config.embedding_model)
+        if breaker is not None:
+            embeddings = CircuitBreakerEmbeddings(embeddings, breaker)
+        return create_cached_embeddings(
+            BatchedEmbeddings(
+                embeddings,
+                batch_size=config.embedding_batch_size,
+                max_concurrency=config.embedding_max_concurrency,
+            ),
+            config.embedding_model,
+            cache_path,
+            config.embedding_cache_warm_paths,
+        )
+
+    def add_texts(
+        self, texts: List[str], metadatas: List[Dict[str, Any]] = None
+    ) -> List[str]:
         """Add texts to the vectorstore."""
+        from langchain_community.vectorstores import FAISS
+
         documents = self.text_splitter.create_documents(texts, metadatas=metadatas)
         if self.vectorstore is None:
             self.vectorstore = FAISS.from_documents(documents, self.embeddings)
@@ -25,7 +82,7 @@ class EmbeddingManager:
             self.vectorstore.add_documents(documents)
         return [doc.page_content for doc in documents]
 
-    def similarity_search(self, query: str, k: int = 4) -> List[Document]:
+    def similarity_search(self, query: str, k: int = 4) -> List["Document"]:
         """Perform a similarity search."""
         if self.vectorstore is None:
             raise ValueError("No documents have been added to the vectorstore yet.")
@@ -38,8 +95,10 @@ class EmbeddingManager:
 
     def load_vectorstore(self, path: str):
         """Load the vectorstore from disk."""
+        from langchain_community.vectorstores import FAISS
+
         if self.vectorstore is None:
             self.vectorstore = FAISS.load_local(path, self.embeddings)
         else:
             loaded_vectorstore = FAISS.load_local(path, self.embeddings)
-            self.vectorstore.merge_from(loaded_vectorstore)
\ No newline at end of file
+            self.vectorstore.merge_from(loaded_vectorstore)
@@ -1,10 +1,28 @@
 import asyncio
-import logging
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
 from functools import wraps
-from typing import Type, Tuple, Callable, Any
+from typing import (
+    Any,
+    AsyncContextManager,
+    Callable,
+    Deque,
+    Dict,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 import aiohttp
+from logging_config import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
+
+JITTER_MODES = ("none", "full", "decorrelated")
 
 
 class RetryExhaustedError(Exception):
@@ -13,6 +31,176 @@ class RetryExhaustedError(Exception):
     pass
 
 
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its circuit breaker is open."""
+
+    pass
+
+
+def caused_by_open_circuit(exc: BaseException) -> bool:
+    """Return whether an exception is, or was raised while handling, a CircuitOpenError."""
+    seen = set()
+    current: Optional[BaseException] = exc
+    while current is not None and id(current) not in seen:
+        if isinstance(current, CircuitOpenError):
+            return True
+        seen.add(id(current))
+        current = current.__cause__ or current.__context__
+    return False
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of recent calls so that retries cannot
+    multiply load on an upstream that is already failing.
+
+    Within a sliding ``window`` of seconds, a retry is allowed while the
+    number of retries stays below ``max(min_retries, ratio * calls)``.
+    """
+
+    def __init__(
+        self, ratio: float = 0.2, min_retries: int = 10, window: float = 10.0
+    ) -> None:
+        self.ratio: float = ratio
+        self.min_retries: int = min_retries
+        self.window: float = window
+        self._calls: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def record_call(self) -> None:
+        """Record a first attempt of a call."""
+        with self._lock:
+            self._calls.append(time.monotonic())
+
+    def try_acquire(self) -> bool:
+        """Take a retry from the budget, returning False if it is spent."""
+        with self._lock:
+            now = time.monotonic()
+            for events in (self._calls, self._retries):
+                while events and events[0] < now - self.window:
+                    events.popleft()
+            if len(self._retries) >= max(
+                self.min_retries, self.ratio * len(self._calls)
+            ):
+                return False
+            self._retries.append(now)
+            return True
+
+
+default_retry_budget = RetryBudget()
+
+
+def configure_retry_budget(
+    ratio: float, min_retries: int, window: float = 10.0
+) -> None:
+    """Set the parameters of the retry budget shared by all retry policies."""
+    default_retry_budget.ratio = ratio
+    default_retry_budget.min_retries = min_retries
+    default_retry_budget.window = window
+
+
+def retry_after_from_exception(exc: BaseException) -> Optional[float]:
+    """Return the delay requested by a ``Retry-After`` header on an HTTP error."""
+    headers = getattr(exc, "headers", None)
+    if not isinstance(exc, aiohttp.ClientResponseError) or not headers:
+        return None
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    How a call is retried: attempt count, jittered backoff, ``Retry-After``
+    handling, a total deadline per call and a shared retry budget.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        backoff_factor: float = 2.0,
+        jitter: str = "full",
+        deadline: Optional[float] = None,
+        budget: Optional[RetryBudget] = None,
+        retry_after: Optional[Callable[[BaseException], Optional[float]]] = (
+            retry_after_from_exception
+        ),
+    ) -> None:
+        """
+        Args:
+            max_attempts (int): Maximum number of attempts, including the first.
+            base_delay (float): Initial delay between attempts in seconds.
+            max_delay (float): Maximum delay between attempts in seconds.
+            backoff_factor (float): Multiplicative factor for exponential backoff.
+            jitter (str): "none", "full" (uniform between 0 and the exponential
+                delay) or "decorrelated" (uniform between ``base_delay`` and 3x
+                the previous delay).
+            deadline (Optional[float]): Total seconds allowed for the call,
+                retries included.
+            budget (Optional[RetryBudget]): Retry budget, shared by default.
+            retry_after (Optional[Callable]): Hook returning the delay an error
+                asks for (e.g. from a ``Retry-After`` header), or None.
+        """
+        if jitter not in JITTER_MODES:
+            raise ValueError(f"jitter must be one of {JITTER_MODES}")
+        self.max_attempts: int = max_attempts
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.backoff_factor: float = backoff_factor
+        self.jitter: str = jitter
+        self.deadline: Optional[float] = deadline
+        self.budget: RetryBudget = budget or default_retry_budget
+        self.retry_after = retry_after
+
+    def next_delay(
+        self, attempt: int, previous_delay: float, exc: BaseException
+    ) -> float:
+        """Return how long to wait after failed attempt number ``attempt`` (from 1)."""
+        exponential = min(
+            self.base_delay * (self.backoff_factor ** (attempt - 1)), self.max_delay
+        )
+        if self.jitter == "full":
+            delay = random.uniform(0, exponential)
+        elif self.jitter == "decorrelated":
+            delay = min(
+                self.max_delay,
+                random.uniform(
+                    self.base_delay, max(self.base_delay, previous_delay * 3)
+                ),
+            )
+        else:
+            delay = exponential
+        requested = self.retry_after(exc) if self.retry_after else None
+        if requested is not None:
+            delay = max(delay, min(requested, self.max_delay))
+        return delay
+
+
+class _RetryScope:
+    def __init__(self, retries_left: int, deadline_at: Optional[float]) -> None:
+        self.retries_left = retries_left
+        self.deadline_at = deadline_at
+
+
+# The retry scope of the outermost retrying call in the current task. Nested
+# retrying calls draw from its retries and respect its deadline, so a failure
+# deep in a call chain does not multiply into attempts at every level.
+_retry_scope: ContextVar[Optional[_RetryScope]] = ContextVar(
+    "retry_scope", default=None
+)
+
+
 def async_retry(
     max_retries: int = 3,
     base_delay: float = 1.0,
@@ -22,42 +210,121 @@ def async_retry(
         aiohttp.ClientError,
         asyncio.TimeoutError,
     ),
-    logger: logging.Logger = logger,
+    logger: Any = logger,
+    jitter: str = "full",
+    deadline: Optional[float] = None,
+    policy: Optional[RetryPolicy] = None,
 ) -> Callable:
     """
-    A decorator for asynchronous retry logic with exponential backoff.
+    A decorator for asynchronous retry logic with jittered exponential backoff.
+
+    Retries honour ``Retry-After`` headers, stop at the call's deadline and
+    draw from a shared retry budget. Errors caused by an open circuit breaker
+    are never retried. When decorated functions call each
+    other, the inner calls share the retries and deadline of the outermost
+    one instead of retrying independently.
 
     Args:
-        max_retries (int): Maximum number of retry attempts.
+        max_retries (int): Maximum number of attempts, including the first.
         base_delay (float): Initial delay between retries in seconds.
         max_delay (float): Maximum delay between retries in seconds.
         backoff_factor (float): Multiplicative factor for exponential backoff.
         exceptions (Tuple[Type[Exception], ...]): Exception types to catch and retry on.
-        logger (logging.Logger): Logger to use for logging retry attempts.
+        logger (Any): Structured logger to use for logging retry attempts.
+        jitter (str): Jitter mode, see RetryPolicy.
+        deadline (Optional[float]): Total seconds allowed for the call.
+        policy (Optional[RetryPolicy]): Policy overriding the arguments above.
 
     Returns:
         Callable: Decorated function with retry logic.
     """
+    retry_policy = policy or RetryPolicy(
+        max_attempts=max_retries,
+        base_delay=base_delay,
+        max_delay=max_delay,
+        backoff_factor=backoff_factor,
+        jitter=jitter,
+        deadline=deadline,
+    )
 
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            last_exception = None
-            for attempt in range(max_retries):
-                try:
-                    return await func(*args, **kwargs)
-                except exceptions as e:
-                    last_exception = e
-                    delay = min(base_delay * (backoff_factor**attempt), max_delay)
-                    logger.warning(
-                        f"Attempt {attempt + 1}/{max_retries} failed. "
-                        f"Retrying in {delay:.2f} seconds. Error: {str(e)}"
-                    )
-                    await asyncio.sleep(delay)
-
-            logger.error(f"All {max_retries} retry attempts exhausted.")
+            start_time = time.monotonic()
+            deadline_at = (
+                start_time + retry_policy.deadline if retry_policy.deadline else None
+            )
+            outer_scope = _retry_scope.get()
+            if outer_scope is None:
+                scope = _RetryScope(retry_policy.max_attempts - 1, deadline_at)
+                token = _retry_scope.set(scope)
+            else:
+                scope = outer_scope
+                token = None
+                if outer_scope.deadline_at is not None and (
+                    deadline_at is None or outer_scope.deadline_at < deadline_at
+                ):
+                    deadline_at = outer_scope.deadline_at
+            retry_policy.budget.record_call()
+
+            last_exception: Optional[BaseException] = None
+            delay = retry_policy.base_delay
+            attempt = 0
+            reason = "attempts"
+            try:
+                while True:
+                    attempt += 1
+                    try:
+                        return await func(*args, **kwargs)
+                    except exceptions as e:
+                        last_exception = e
+                        if caused_by_open_circuit(e):
+                            reason = "circuit_open"
+                            break
+                        if (
+                            attempt >= retry_policy.max_attempts
+                            or scope.retries_left <= 0
+                        ):
+                            reason = "attempts"
+                            break
+                        delay = retry_policy.next_delay(attempt, delay, e)
+                        if (
+                            deadline_at is not None
+                            and time.monotonic() + delay > deadline_at
+                        ):
+                            reason = "deadline"
+                            break
+                        if not retry_policy.budget.try_acquire():
+                            reason = "budget"
+                            break
+                        scope.retries_left -= 1
+                        logger.warning(
+                            "Retrying after failed attempt",
+                            function=func.__qualname__,
+                            attempt=attempt,
+                            max_attempts=retry_policy.max_attempts,
+                            delay=round(delay, 3),
+                            error_type=type(e).__name__,
+                            error=str(e),
+                            elapsed=round(time.monotonic() - start_time, 3),
+                            nested=outer_scope is not None,
+                        )
+                        await asyncio.sleep(delay)
+            finally:
+                if token is not None:
+                    _retry_scope.reset(token)
+
+            logger.error(
+                "Retries exhausted",
+                function=func.__qualname__,
+                attempts=attempt,
+                reason=reason,
+                error_type=type(last_exception).__name__,
+                error=str(last_exception),
+                elapsed=round(time.monotonic() - start_time, 3),
+            )
             raise RetryExhaustedError(
-                f"Operation failed after {max_retries} attempts"
+                f"Operation failed after {attempt} attempts ({reason})"
             ) from last_exception
 
         return wrapper
@@ -66,13 +333,17 @@ def async_retry(
 
 
 async def with_semaphore(
-    semaphore: asyncio.Semaphore, func: Callable, *args: Any, **kwargs: Any
+    semaphore: Union[asyncio.Semaphore, AsyncContextManager[Any]],
+    func: Callable,
+    *args: Any,
+    **kwargs: Any,
 ) -> Any:
     """
     Execute a function with a semaphore to limit concurrent operations.
 
     Args:
-        semaphore (asyncio.Semaphore): Semaphore to use for limiting concurrency.
+        semaphore (Union[asyncio.Semaphore, AsyncContextManager[Any]]): Semaphore
+            or limiter (e.g. ``limiter.EndpointLimiter``) limiting concurrency.
         func (Callable): Function to execute.
         *args: Positional arguments to pass to the function.
         **kwargs: Keyword arguments to pass to the function.
@@ -82,3 +353,201 @@ async def with_semaphore(
     """
     async with semaphore:
         return await func(*args, **kwargs)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker failing calls fast while a dependency is unhealthy.
+
+    Closed: calls go through and their outcomes are recorded over a sliding
+    ``window``. Once at least ``min_calls`` were made and the failure rate
+    reaches ``failure_rate_threshold`` the breaker opens. Open: calls raise
+    CircuitOpenError for ``cooldown`` seconds. Half-open: up to
+    ``half_open_max_calls`` trial calls go through; a success closes the
+    breaker, a failure opens it again.
+
+    Thread-safe, so it can also guard calls made from worker threads.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        window: float = 30.0,
+        min_calls: int = 5,
+        cooldown: float = 30.0,
+        half_open_max_calls: int = 1,
+        exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+    ) -> None:
+        """
+        Args:
+            name (str): Name of the guarded dependency, used in logs and errors.
+            failure_rate_threshold (float): Failure rate (0-1) that opens the breaker.
+            window (float): Seconds of call outcomes considered.
+            min_calls (int): Calls needed in the window before the breaker can open.
+            cooldown (float): Seconds the breaker stays open before a trial call.
+            half_open_max_calls (int): Concurrent trial calls while half-open.
+            exceptions (Tuple[Type[BaseException], ...]): Exceptions counted as failures.
+        """
+        self.name: str = name
+        self.failure_rate_threshold: float = failure_rate_threshold
+        self.window: float = window
+        self.min_calls: int = min_calls
+        self.cooldown: float = cooldown
+        self.half_open_max_calls: int = half_open_max_calls
+        self.exceptions: Tuple[Type[BaseException], ...] = exceptions
+        self.rejected: int = 0
+        self._state: str = self.CLOSED
+        self._opened_at: float = 0.0
+        self._half_open_calls: int = 0
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def before_call(self) -> None:
+        """Admit a call or raise CircuitOpenError. Must be paired with a record_* call."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.OPEN or (
+                state == self.HALF_OPEN
+                and self._half_open_calls >= self.half_open_max_calls
+            ):
+                self.rejected += 1
+                raise CircuitOpenError(
+                    f"Circuit for {self.name} is open; failing fast until it recovers"
+                )
+            if state == self.HALF_OPEN:
+                self._half_open_calls += 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._current_state() == self.HALF_OPEN:
+                self._transition(self.CLOSED)
+            else:
+                self._record(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            state = self._current_state()
+            if state == self.HALF_OPEN:
+                self._transition(self.OPEN)
+            elif state == self.CLOSED:
+                self._record(False)
+                failures = sum(1 for _, ok in self._outcomes if not ok)
+                if (
+                    len(self._outcomes) >= self.min_calls
+                    and failures / len(self._outcomes) >= self.failure_rate_threshold
+                ):
+                    self._transition(self.OPEN)
+
+    def record_outcome(self, exc: Optional[BaseException]) -> None:
+        """Record the outcome of an admitted call from the exception it raised, if any."""
+        if exc is None:
+            self.record_success()
+        elif isinstance(exc, self.exceptions):
+            self.record_failure()
+        else:
+            # Errors that say nothing about the dependency's health (e.g.
+            # cancellation) still free a half-open trial slot.
+            with self._lock:
+                if self._half_open_calls:
+                    self._half_open_calls -= 1
+
+    async def call(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Await ``func(*args, **kwargs)`` through the breaker."""
+        self.before_call()
+        try:
+            result = await func(*args, **kwargs)
+        except BaseException as e:
+            self.record_outcome(e)
+            raise
+        self.record_success()
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return the state, windowed call counts and rejected calls."""
+        with self._lock:
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            return {
+                "state": self._current_state(),
+                "calls": len(self._outcomes),
+                "failures": failures,
+                "rejected": self.rejected,
+            }
+
+    def _current_state(self) -> str:
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.cooldown
+        ):
+            self._transition(self.HALF_OPEN)
+        return self._state
+
+    def _record(self, ok: bool) -> None:
+        now = time.monotonic()
+        self._outcomes.append((now, ok))
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            self._outcomes.popleft()
+
+    def _transition(self, state: str) -> None:
+        previous, self._state = self._state, state
+        self._half_open_calls = 0
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+        if state == self.CLOSED:
+            self._outcomes.clear()
+        logger.warning(
+            "Circuit breaker state changed",
+            breaker=self.name,
+            previous_state=previous,
+            state=state,
+        )
+
+
+class CircuitBreakerRegistry:
+    """Creates and shares one CircuitBreaker per dependency name."""
+
+    def __init__(self, settings: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """
+        Args:
+            settings (Optional[Dict[str, Dict[str, Any]]]): CircuitBreaker keyword
+                arguments per dependency name; the "default" entry applies to all.
+        """
+        self.settings: Dict[str, Dict[str, Any]] = settings or {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "CircuitBreakerRegistry":
+        """Create a registry from the ``circuit_breakers`` configuration section."""
+        return cls(config.get("circuit_breakers"))
+
+    def get(self, name: str) -> CircuitBreaker:
+        """Return the breaker of a dependency, creating it on first use."""
+        with self._lock:
+            if name not in self._breakers:
+                options = {
+                    **self.settings.get("default", {}),
+                    **self.settings.get(name, {}),
+                }
+                self._breakers[name] = CircuitBreaker(name, **options)
+            return self._breakers[name]
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Return the metrics of every breaker."""
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {name: breaker.metrics() for name, breaker in breakers}
+
+    def log_metrics(self) -> None:
+        """Log the metrics of every breaker."""
+        for name, metrics in self.metrics().items():
+            logger.info("Circuit breaker metrics", breaker=name, **metrics)
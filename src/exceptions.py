@@ -46,6 +46,14 @@ class CrewExecutionError(CrewError):
     """Raised when there's an error during crew execution."""
     pass
 
+class JobNotFoundError(CrewError):
+    """Raised when a crew job id is unknown."""
+    pass
+
+class JobQueueFullError(CrewError):
+    """Raised when a crew job is submitted while the job queue is full."""
+    pass
+
 # SEC Tools related exceptions
 class SECToolsError(BaseError):
     """Base exception for SEC tools related errors."""
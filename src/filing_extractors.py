@@ -0,0 +1,185 @@
+import re
+from abc import ABC, abstractmethod
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+
+class FilingTextExtractor(ABC):
+    """Turns the HTML of a filing into plain text for chunking and embedding."""
+
+    name: str = ""
+
+    @abstractmethod
+    def extract(self, html: str) -> str:
+        """Return the text content of ``html``, one block per line."""
+
+    def iter_lines(self, html_chunks: Iterable[str]) -> Iterator[str]:
+        """Yield text lines from HTML given in chunks."""
+        yield from self.extract("".join(html_chunks)).split("\n")
+
+    def iter_file_lines(self, path: str, read_size: int = 65_536) -> Iterator[str]:
+        """Yield text lines from an HTML file, reading it ``read_size`` chars at a time."""
+        with open(path, "r", encoding="utf-8", errors="replace") as file:
+            yield from self.iter_lines(iter(lambda: file.read(read_size), ""))
+
+
+class UnstructuredExtractor(FilingTextExtractor):
+    """Extractor backed by ``unstructured``'s ``partition_html``."""
+
+    name = "unstructured"
+
+    def extract(self, html: str) -> str:
+        # Imported here because unstructured is slow to import.
+        from unstructured.partition.html import partition_html
+
+        elements: List[Any] = partition_html(text=html)
+        return "\n".join([str(el) for el in elements])
+
+    def iter_file_lines(self, path: str, read_size: int = 65_536) -> Iterator[str]:
+        from unstructured.partition.html import partition_html
+
+        for el in partition_html(filename=path):
+            yield from str(el).split("\n")
+
+
+BLOCK_TAGS = {
+    "address", "article", "blockquote", "br", "center", "dd", "div", "dl", "dt",
+    "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "ol",
+    "p", "pre", "section", "table", "tbody", "thead", "tfoot", "ul",
+}  # fmt: skip
+CELL_TAGS = {"td", "th"}
+SKIP_TAGS = {"head", "script", "style", "title", "noscript", "ix:header"}
+VOID_TAGS = {"br", "hr", "img", "input", "meta", "link", "col", "area", "base", "wbr"}
+HIDDEN_STYLE = re.compile(r"display\s*:\s*none", re.IGNORECASE)
+WHITESPACE = re.compile(r"\s+")
+CELL_SEPARATOR = " | "
+
+
+class _EdgarTextParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.lines: List[str] = []
+        self._parts: List[str] = []
+        self._row: Optional[List[str]] = None
+        self._skip_tag: Optional[str] = None
+        self._skip_depth: int = 0
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if self._skip_tag is not None:
+            if tag == self._skip_tag and tag not in VOID_TAGS:
+                self._skip_depth += 1
+            return
+
+        style = dict(attrs).get("style") or ""
+        if tag in SKIP_TAGS or HIDDEN_STYLE.search(style):
+            if tag not in VOID_TAGS:
+                self._skip_tag = tag
+                self._skip_depth = 1
+            return
+
+        if tag == "tr":
+            self._flush_line()
+            self._row = []
+        elif tag in CELL_TAGS:
+            self._flush_cell()
+        elif tag in BLOCK_TAGS:
+            self._flush_line()
+
+    def handle_startendtag(
+        self, tag: str, attrs: List[Tuple[str, Optional[str]]]
+    ) -> None:
+        if self._skip_tag is None and tag in BLOCK_TAGS:
+            self._flush_line()
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if self._skip_depth == 0:
+                    self._skip_tag = None
+            return
+
+        if tag in CELL_TAGS:
+            self._flush_cell()
+        elif tag == "tr" or tag == "table":
+            self._flush_row()
+        elif tag in BLOCK_TAGS and self._row is None:
+            self._flush_line()
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_tag is None:
+            self._parts.append(data)
+
+    def close(self) -> None:
+        super().close()
+        self._flush_row()
+        self._flush_line()
+
+    def _take_text(self) -> str:
+        text = WHITESPACE.sub(" ", "".join(self._parts)).strip()
+        self._parts = []
+        return text
+
+    def _flush_cell(self) -> None:
+        if self._row is None:
+            return
+        text = self._take_text()
+        if text:
+            self._row.append(text)
+
+    def _flush_row(self) -> None:
+        if self._row is None:
+            return
+        self._flush_cell()
+        if self._row:
+            self.lines.append(CELL_SEPARATOR.join(self._row))
+        self._row = None
+
+    def _flush_line(self) -> None:
+        if self._row is not None:
+            # Block tags inside a table cell only separate text within the cell.
+            self._parts.append(" ")
+            return
+        text = self._take_text()
+        if text:
+            self.lines.append(text)
+
+
+class EdgarHTMLExtractor(FilingTextExtractor):
+    """
+    Lightweight streaming extractor tuned for EDGAR filing HTML.
+
+    Built on ``html.parser``. Block elements become lines, table rows become
+    single lines of cells separated by `` | ``, and the inline XBRL header,
+    hidden elements, scripts and styles are dropped.
+    """
+
+    name = "edgar"
+
+    def extract(self, html: str) -> str:
+        return "\n".join(self.iter_lines([html]))
+
+    def iter_lines(self, html_chunks: Iterable[str]) -> Iterator[str]:
+        parser = _EdgarTextParser()
+        for chunk in html_chunks:
+            parser.feed(chunk)
+            yield from parser.lines
+            parser.lines = []
+        parser.close()
+        yield from parser.lines
+
+
+EXTRACTORS: Dict[str, Type[FilingTextExtractor]] = {
+    UnstructuredExtractor.name: UnstructuredExtractor,
+    EdgarHTMLExtractor.name: EdgarHTMLExtractor,
+}
+
+
+def get_extractor(name: str) -> FilingTextExtractor:
+    """Return an instance of the filing text extractor registered as ``name``."""
+    try:
+        return EXTRACTORS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown filing text extractor '{name}', expected one of {list(EXTRACTORS)}"
+        )
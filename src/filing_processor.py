@@ -0,0 +1,155 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+from filing_extractors import EXTRACTORS, get_extractor
+from logging_config import LoggerMixin
+
+EXECUTOR_TYPES = ("process", "thread")
+SEPARATOR = "\n"
+
+
+def iter_text_chunks(
+    lines: Iterable[str], chunk_size: int, chunk_overlap: int
+) -> Iterator[str]:
+    """
+    Merge lines into chunks of at most ``chunk_size`` characters.
+
+    Mirrors ``CharacterTextSplitter`` with a newline separator: consecutive
+    chunks share trailing lines totalling at most ``chunk_overlap`` characters,
+    and a single line longer than ``chunk_size`` becomes its own chunk. Only
+    the lines of the current chunk are held in memory.
+    """
+    current: Deque[str] = deque()
+    total = 0
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if current and total + len(SEPARATOR) + len(line) > chunk_size:
+            yield SEPARATOR.join(current)
+            while current and (
+                total > chunk_overlap or total + len(SEPARATOR) + len(line) > chunk_size
+            ):
+                removed = current.popleft()
+                total -= len(removed) + (len(SEPARATOR) if current else 0)
+        total += len(line) + (len(SEPARATOR) if current else 0)
+        current.append(line)
+    if current:
+        yield SEPARATOR.join(current)
+
+
+def split_filing_file(
+    path: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    extractor: str = "unstructured",
+    read_size: int = 65_536,
+) -> List[str]:
+    """
+    Extract the text of a filing file and split it into chunks.
+
+    The file is read and extracted incrementally, so the full document is
+    never held in memory as a single string by the streaming extractors.
+    This is CPU-bound and runs inside a worker process or thread, so it must
+    stay a picklable module-level function. The extractor is passed by name
+    for the same reason.
+    """
+    lines = get_extractor(extractor).iter_file_lines(path, read_size)
+    return list(iter_text_chunks(lines, chunk_size, chunk_overlap))
+
+
+class FilingProcessor(LoggerMixin):
+    """
+    Runs filing parsing and chunking off the event loop.
+
+    Work is sent to a ``ProcessPoolExecutor`` so that concurrent lookups scale
+    with cores. If a process pool cannot be created or breaks, the processor
+    falls back to a thread pool.
+    """
+
+    def __init__(
+        self,
+        executor_type: str = "process",
+        max_workers: int = 0,
+        extractor: str = "unstructured",
+        read_size: int = 65_536,
+    ) -> None:
+        """
+        Args:
+            executor_type (str): Either "process" or "thread".
+            max_workers (int): Number of workers (0 = executor default).
+            extractor (str): Name of the filing text extractor to use.
+            read_size (int): Number of characters read from a filing at a time.
+        """
+        if executor_type not in EXECUTOR_TYPES:
+            raise ValueError(f"executor_type must be one of {EXECUTOR_TYPES}")
+        if extractor not in EXTRACTORS:
+            raise ValueError(f"extractor must be one of {list(EXTRACTORS)}")
+        self.extractor: str = extractor
+        self.read_size: int = read_size
+        self.executor_type: str = executor_type
+        self.max_workers: Optional[int] = max_workers or None
+        self._executor: Optional[Executor] = None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "FilingProcessor":
+        """Create a processor from the application configuration dictionary."""
+        return cls(
+            executor_type=config.get("filing_parse_executor", "process"),
+            max_workers=config.get("filing_parse_workers", 0),
+            extractor=config.get("filing_text_extractor", "unstructured"),
+            read_size=config.get("filing_download_chunk_size", 65_536),
+        )
+
+    async def split_file(
+        self, path: str, chunk_size: int, chunk_overlap: int
+    ) -> List[str]:
+        """Extract and chunk a filing file in the executor, returning the text chunks."""
+        loop = asyncio.get_running_loop()
+        args = (path, chunk_size, chunk_overlap, self.extractor, self.read_size)
+        try:
+            return await loop.run_in_executor(
+                self._get_executor(), split_filing_file, *args
+            )
+        except BrokenProcessPool as e:
+            self.logger.warning(
+                "Filing process pool broke, falling back to threads", error=str(e)
+            )
+            self._use_threads()
+            return await loop.run_in_executor(
+                self._get_executor(), split_filing_file, *args
+            )
+
+    def shutdown(self) -> None:
+        """Shut down the executor and its workers."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                try:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                except (OSError, NotImplementedError, PermissionError) as e:
+                    self.logger.warning(
+                        "Process pool unavailable, falling back to threads",
+                        error=str(e),
+                    )
+                    self.executor_type = "thread"
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="filing-parse"
+                )
+            self.logger.info(
+                "Filing executor created",
+                executor_type=self.executor_type,
+                max_workers=self.max_workers,
+            )
+        return self._executor
+
+    def _use_threads(self) -> None:
+        self.shutdown()
+        self.executor_type = "thread"
@@ -0,0 +1,189 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from logging_config import LoggerMixin
+
+
+class FilingStore(LoggerMixin):
+    """
+    Local mirror of EDGAR filings.
+
+    Keeps a SQLite metadata index (ticker, form type, filing date, accession
+    number, CIK, source URL and local path) next to the downloaded filing
+    documents, plus the HTTP validators (ETag/Last-Modified) needed to make
+    conditional requests for resources that may change.
+    """
+
+    DB_FILE = "filings.sqlite3"
+
+    def __init__(self, root_dir: str) -> None:
+        """
+        Args:
+            root_dir (str): Directory holding the metadata index and filing files.
+        """
+        self.root_dir: str = os.path.abspath(root_dir)
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(self.root_dir, self.DB_FILE), check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS filings (
+                accession TEXT PRIMARY KEY,
+                ticker TEXT NOT NULL,
+                form_type TEXT NOT NULL,
+                filed_at TEXT NOT NULL,
+                cik TEXT,
+                url TEXT NOT NULL,
+                local_path TEXT,
+                downloaded_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS filings_by_ticker
+                ON filings (ticker, form_type, filed_at);
+            CREATE TABLE IF NOT EXISTS freshness_checks (
+                ticker TEXT NOT NULL,
+                form_type TEXT NOT NULL,
+                checked_at REAL NOT NULL,
+                PRIMARY KEY (ticker, form_type)
+            );
+            CREATE TABLE IF NOT EXISTS http_validators (
+                url TEXT NOT NULL,
+                scope TEXT NOT NULL DEFAULT '',
+                etag TEXT,
+                last_modified TEXT,
+                PRIMARY KEY (url, scope)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def upsert_filing(
+        self,
+        ticker: str,
+        form_type: str,
+        accession: str,
+        filed_at: str,
+        url: str,
+        cik: Optional[str] = None,
+    ) -> None:
+        """Record the metadata of a filing, keeping any existing local copy."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO filings (accession, ticker, form_type, filed_at, cik, url)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (accession) DO UPDATE SET"
+                " ticker = excluded.ticker, form_type = excluded.form_type,"
+                " filed_at = excluded.filed_at, url = excluded.url,"
+                " cik = COALESCE(excluded.cik, filings.cik)",
+                (accession, ticker.upper(), form_type, filed_at, cik, url),
+            )
+            self._conn.commit()
+
+    def latest(self, ticker: str, form_type: str) -> Optional[Dict[str, Any]]:
+        """Return the most recent known filing of a form type for a ticker."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM filings WHERE ticker = ? AND form_type = ?"
+                " ORDER BY filed_at DESC LIMIT 1",
+                (ticker.upper(), form_type),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def list_filings(self, ticker: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List known filings, optionally for a single ticker, newest first."""
+        query = "SELECT * FROM filings"
+        params: Tuple[Any, ...] = ()
+        if ticker:
+            query += " WHERE ticker = ?"
+            params = (ticker.upper(),)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY filed_at DESC", params)
+            return [dict(row) for row in rows.fetchall()]
+
+    def path_for(self, accession: str) -> str:
+        """Return where the document of a filing is stored locally."""
+        return os.path.join(self.root_dir, f"{accession}.html")
+
+    def local_path(self, accession: str) -> Optional[str]:
+        """Return the local path of a downloaded filing, if it is on disk."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT local_path FROM filings WHERE accession = ?", (accession,)
+            ).fetchone()
+        if row and row["local_path"] and os.path.exists(row["local_path"]):
+            local_path: str = row["local_path"]
+            return local_path
+        return None
+
+    def set_local_path(self, accession: str, path: str) -> None:
+        """Record that the document of a filing has been downloaded to ``path``."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE filings SET local_path = ?, downloaded_at = ?"
+                " WHERE accession = ?",
+                (path, time.time(), accession),
+            )
+            self._conn.commit()
+
+    def last_checked(self, ticker: str, form_type: str) -> Optional[float]:
+        """Return when the latest filing of a ticker and form type was last checked."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT checked_at FROM freshness_checks"
+                " WHERE ticker = ? AND form_type = ?",
+                (ticker.upper(), form_type),
+            ).fetchone()
+        return row["checked_at"] if row else None
+
+    def mark_checked(self, ticker: str, form_type: str) -> None:
+        """Record that the latest filing of a ticker and form type was just checked."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO freshness_checks (ticker, form_type, checked_at)"
+                " VALUES (?, ?, ?)",
+                (ticker.upper(), form_type, time.time()),
+            )
+            self._conn.commit()
+
+    def get_validators(
+        self, url: str, scope: str = ""
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Return the stored (ETag, Last-Modified) validators of a URL.
+
+        ``scope`` separates the validators of a URL read for different
+        purposes, e.g. a submissions feed checked for each form type: a 304
+        only means nothing changed since the last check of the same scope.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified FROM http_validators"
+                " WHERE url = ? AND scope = ?",
+                (url, scope),
+            ).fetchone()
+        return (row["etag"], row["last_modified"]) if row else (None, None)
+
+    def set_validators(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        scope: str = "",
+    ) -> None:
+        """Store the validators returned for a URL."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_validators"
+                " (url, scope, etag, last_modified) VALUES (?, ?, ?, ?)",
+                (url, scope, etag, last_modified),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
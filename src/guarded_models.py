@@ -0,0 +1,74 @@
+from typing import Any, Callable, Dict, List, TypeVar
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.embeddings import Embeddings
+from langchain_core.outputs import LLMResult
+from error_handling import CircuitBreaker
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class CircuitBreakerCallbackHandler(BaseCallbackHandler):
+    """
+    Puts an LLM behind a circuit breaker.
+
+    Attached to the LLM's callbacks: a call is rejected from ``on_llm_start``
+    with CircuitOpenError while the breaker is open (``raise_error`` makes
+    LangChain propagate it), and each call's outcome is recorded when it ends.
+    """
+
+    raise_error = True
+
+    def __init__(self, breaker: CircuitBreaker) -> None:
+        self.breaker: CircuitBreaker = breaker
+
+    def on_llm_start(
+        self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any
+    ) -> None:
+        self.breaker.before_call()
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        self.breaker.record_success()
+
+    def on_llm_error(self, error: BaseException, **kwargs: Any) -> None:
+        self.breaker.record_outcome(error)
+
+
+class CircuitBreakerEmbeddings(Embeddings):
+    """Embeddings wrapper sending every call through a circuit breaker."""
+
+    def __init__(self, embeddings: Embeddings, breaker: CircuitBreaker) -> None:
+        self.embeddings: Embeddings = embeddings
+        self.breaker: CircuitBreaker = breaker
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors: List[List[float]] = self._call(self.embeddings.embed_documents, texts)
+        return vectors
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors: List[List[float]] = await self.breaker.call(
+            self.embeddings.aembed_documents, texts
+        )
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        # Not embed_documents([text]): models may embed queries differently,
+        # e.g. with a "query: " rather than a "passage: " prefix.
+        vector: List[float] = self._call(self.embeddings.embed_query, text)
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        vector: List[float] = await self.breaker.call(
+            self.embeddings.aembed_query, text
+        )
+        return vector
+
+    def _call(self, function: Callable[[T], R], argument: T) -> R:
+        self.breaker.before_call()
+        try:
+            result = function(argument)
+        except BaseException as e:
+            self.breaker.record_outcome(e)
+            raise
+        self.breaker.record_success()
+        return result
@@ -0,0 +1,82 @@
+import asyncio
+from typing import Any, Dict, Optional
+import aiohttp
+from logging_config import LoggerMixin
+
+
+class HTTPClient(LoggerMixin):
+    """
+    Process-wide pooled aiohttp client.
+
+    Owns a single ``aiohttp.ClientSession`` backed by a ``TCPConnector`` so that
+    every tool shares DNS caching, keep-alive connections and connection limits
+    instead of paying connection setup on each request.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+        timeout: float = 30.0,
+    ) -> None:
+        """
+        Args:
+            limit (int): Maximum number of simultaneous connections.
+            limit_per_host (int): Maximum number of simultaneous connections per host.
+            dns_cache_ttl (int): Time in seconds to cache DNS lookups.
+            keepalive_timeout (float): Seconds to keep idle connections open.
+            timeout (float): Default total timeout per request in seconds.
+        """
+        self.limit: int = limit
+        self.limit_per_host: int = limit_per_host
+        self.dns_cache_ttl: int = dns_cache_ttl
+        self.keepalive_timeout: float = keepalive_timeout
+        self.timeout: float = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "HTTPClient":
+        """Create a client from the application configuration dictionary."""
+        return cls(
+            limit=config.get("http_connection_limit", 100),
+            limit_per_host=config.get("http_connection_limit_per_host", 10),
+            dns_cache_ttl=config.get("http_dns_cache_ttl", 300),
+            keepalive_timeout=config.get("http_keepalive_timeout", 30.0),
+            timeout=config.get("http_request_timeout", 30.0),
+        )
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use."""
+        if self._session is not None and not self._session.closed:
+            return self._session
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                    keepalive_timeout=self.keepalive_timeout,
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                )
+                self.logger.info(
+                    "HTTP session created",
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared session and release pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            self.logger.info("HTTP session closed")
+        self._session = None
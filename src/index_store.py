@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from logging_config import LoggerMixin
+
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import FAISS
+
+
+class FilingIndexStore(LoggerMixin):
+    """
+    Content-addressed on-disk store of per-filing FAISS indexes.
+
+    Each index lives in its own directory under ``root_dir`` and is written and
+    read through ``FAISS.save_local``/``FAISS.load_local``. Entries are keyed by
+    filing identity plus the embedding parameters that produced them, and the
+    least recently used entries are evicted once the store exceeds its bounds.
+    Up to ``memory_entries`` loaded indexes are also kept in memory, so that a
+    long-running process does not reload an index from disk on every query.
+    """
+
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(
+        self,
+        root_dir: str,
+        max_entries: int = 50,
+        max_bytes: int = 0,
+        memory_entries: int = 0,
+    ) -> None:
+        """
+        Args:
+            root_dir (str): Directory holding the persisted indexes.
+            max_entries (int): Maximum number of indexes to keep (0 = unbounded).
+            max_bytes (int): Maximum total size on disk in bytes (0 = unbounded).
+            memory_entries (int): Number of loaded indexes kept in memory (0 = none).
+        """
+        self.root_dir: str = os.path.abspath(root_dir)
+        self.max_entries: int = max_entries
+        self.max_bytes: int = max_bytes
+        self.memory_entries: int = memory_entries
+        self._loaded: "OrderedDict[str, Any]" = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = self._load_manifest()
+
+    @staticmethod
+    def make_key(
+        filing_id: str,
+        embedding_model: str,
+        chunk_size: int,
+        chunk_overlap: int,
+        extractor: str,
+    ) -> str:
+        """
+        Build the content address of an index from its filing, the extractor
+        its text came from and the embedding settings.
+        """
+        payload = json.dumps(
+            [filing_id, embedding_model, chunk_size, chunk_overlap, extractor],
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, embeddings: Any) -> Optional["FAISS"]:
+        """Load a persisted index, or return None if it is not in the store."""
+        with self._lock:
+            entry = self._entries.get(key)
+            path = self._path(key)
+            if entry is None or not os.path.isdir(path):
+                self._entries.pop(key, None)
+                self.misses += 1
+                self._log_lookup("Index cache miss", key)
+                return None
+
+            vectorstore = self._loaded.get(key)
+            if vectorstore is not None:
+                self._loaded.move_to_end(key)
+            else:
+                try:
+                    vectorstore = self._load(path, embeddings)
+                except Exception as e:
+                    self.logger.warning(
+                        "Failed to load cached index", key=key, error=str(e)
+                    )
+                    self._remove(key)
+                    self._save_manifest()
+                    self.misses += 1
+                    self._log_lookup("Index cache miss", key)
+                    return None
+                self._keep_loaded(key, vectorstore)
+
+            entry["last_access"] = time.time()
+            self._entries.move_to_end(key)
+            self._save_manifest()
+            self.hits += 1
+            self._log_lookup("Index cache hit", key)
+            return vectorstore
+
+    def put(self, key: str, vectorstore: "FAISS", source: str = "") -> None:
+        """Persist an index under the given key and evict old entries if needed."""
+        with self._lock:
+            path = self._path(key)
+            tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+            vectorstore.save_local(tmp_path)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            os.replace(tmp_path, path)
+
+            self._entries[key] = {
+                "source": source,
+                "size": self._dir_size(path),
+                "last_access": time.time(),
+            }
+            self._entries.move_to_end(key)
+            self._keep_loaded(key, vectorstore)
+            self._evict()
+            self._save_manifest()
+            self.logger.info(
+                "Index cached", key=key, source=source, entries=len(self._entries)
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size of the store."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "loaded": len(self._loaded),
+            "bytes": sum(e.get("size", 0) for e in self._entries.values()),
+        }
+
+    def _evict(self) -> None:
+        total_bytes = sum(e.get("size", 0) for e in self._entries.values())
+        while len(self._entries) > 1 and (
+            (self.max_entries and len(self._entries) > self.max_entries)
+            or (self.max_bytes and total_bytes > self.max_bytes)
+        ):
+            key = next(iter(self._entries))
+            total_bytes -= self._entries[key].get("size", 0)
+            self._remove(key)
+            self.logger.info("Index evicted", key=key)
+
+    @staticmethod
+    def _load(path: str, embeddings: Any) -> "FAISS":
+        # Imported here because langchain_community and faiss are slow to import.
+        from langchain_community.vectorstores import FAISS
+
+        return FAISS.load_local(path, embeddings, allow_dangerous_deserialization=True)
+
+    def _keep_loaded(self, key: str, vectorstore: "FAISS") -> None:
+        if not self.memory_entries:
+            return
+        self._loaded[key] = vectorstore
+        self._loaded.move_to_end(key)
+        while len(self._loaded) > self.memory_entries:
+            self._loaded.popitem(last=False)
+
+    def _remove(self, key: str) -> None:
+        self._entries.pop(key, None)
+        self._loaded.pop(key, None)
+        shutil.rmtree(self._path(key), ignore_errors=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root_dir, key)
+
+    def _log_lookup(self, event: str, key: str) -> None:
+        self.logger.info(event, key=key, **self.stats())
+
+    def _load_manifest(self) -> "OrderedDict[str, Dict[str, Any]]":
+        manifest_path = os.path.join(self.root_dir, self.MANIFEST_FILE)
+        try:
+            with open(manifest_path, "r") as file:
+                entries: Dict[str, Dict[str, Any]] = json.load(file)
+        except (OSError, ValueError):
+            entries = {}
+        ordered = sorted(
+            entries.items(), key=lambda item: item[1].get("last_access", 0)
+        )
+        return OrderedDict(ordered)
+
+    def _save_manifest(self) -> None:
+        manifest_path = os.path.join(self.root_dir, self.MANIFEST_FILE)
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(self._entries, file)
+        os.replace(tmp_path, manifest_path)
+
+    @staticmethod
+    def _dir_size(path: str) -> int:
+        return sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, files in os.walk(path)
+            for name in files
+        )
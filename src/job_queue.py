@@ -0,0 +1,462 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+from logging_config import LoggerMixin
+
+RunCrew = Callable[[str, Dict[str, str]], Awaitable[str]]
+
+JOB_STATES = ("pending", "leased", "succeeded", "dead")
+
+
+def job_id_for(crew: str, variables: Dict[str, Any]) -> str:
+    """
+    Return the id of a crew run over the given task variables.
+
+    The id depends on the variables themselves rather than where they were
+    read from, so re-submitting the same rows is a no-op while new or changed
+    rows of a rewritten input file are queued.
+    """
+    key = json.dumps(
+        [crew, {str(k): str(v) for k, v in variables.items()}], sort_keys=True
+    )
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+class JobQueue(LoggerMixin):
+    """
+    Durable queue of crew jobs in a SQLite database (WAL mode).
+
+    A worker leases a job for ``lease_timeout`` seconds and keeps the lease
+    alive with ``heartbeat``. A job whose lease expires, because its worker
+    was killed or hung, is delivered again. Failed jobs are retried with
+    jittered exponential backoff until ``max_attempts`` attempts have been
+    made, after which they are moved to the dead letters (state ``dead``).
+    Several processes can share one queue file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lease_timeout: float = 600.0,
+        max_attempts: int = 3,
+        retry_base_delay: float = 30.0,
+        retry_max_delay: float = 1800.0,
+    ) -> None:
+        """
+        Args:
+            path (str): SQLite file holding the queue.
+            lease_timeout (float): Seconds a lease lasts without a heartbeat.
+            max_attempts (int): Attempts per job before it is dead-lettered.
+            retry_base_delay (float): Backoff before the first retry in seconds.
+            retry_max_delay (float): Maximum backoff between attempts in seconds.
+        """
+        self.path: str = os.path.abspath(path)
+        self.lease_timeout: float = lease_timeout
+        self.max_attempts: int = max_attempts
+        self.retry_base_delay: float = retry_base_delay
+        self.retry_max_delay: float = retry_max_delay
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit mode: transactions are opened explicitly with BEGIN
+        # IMMEDIATE so that two processes never lease the same job.
+        self._conn = sqlite3.connect(
+            self.path, timeout=30.0, check_same_thread=False, isolation_level=None
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                crew TEXT NOT NULL,
+                variables TEXT NOT NULL,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                available_at REAL NOT NULL,
+                lease_owner TEXT,
+                lease_expires_at REAL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                finished_at REAL,
+                result TEXT,
+                last_error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS jobs_by_state
+                ON jobs (state, available_at);
+            """
+        )
+
+    def enqueue(
+        self,
+        crew: str,
+        variables: Optional[Dict[str, Any]] = None,
+        job_id: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+        delay: float = 0.0,
+    ) -> str:
+        """
+        Add a job to the queue.
+
+        Args:
+            crew (str): Crew configuration file name.
+            variables (Optional[Dict[str, Any]]): Task variables of the run.
+            job_id (Optional[str]): Job id; enqueueing an existing id is a no-op,
+                which makes re-submitting a batch idempotent.
+            max_attempts (Optional[int]): Overrides the queue's ``max_attempts``.
+            delay (float): Seconds before the job becomes available.
+
+        Returns:
+            str: The job id.
+        """
+        job_id = job_id or uuid.uuid4().hex
+        now = time.time()
+        with self._transaction() as conn:
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO jobs (id, crew, variables, state, max_attempts,"
+                " available_at, created_at, updated_at)"
+                " VALUES (?, ?, ?, 'pending', ?, ?, ?, ?)",
+                (
+                    job_id,
+                    crew,
+                    json.dumps({str(k): str(v) for k, v in (variables or {}).items()}),
+                    max_attempts or self.max_attempts,
+                    now + delay,
+                    now,
+                    now,
+                ),
+            ).rowcount
+        if inserted:
+            self.logger.info("Job enqueued", job_id=job_id, crew=crew)
+        return job_id
+
+    def lease(
+        self, worker_id: str, lease_timeout: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Lease the next available job, or return None if there is none.
+
+        Pending jobs whose backoff has elapsed and leased jobs whose lease has
+        expired are both available. An expired job that already used all of
+        its attempts is dead-lettered instead of being delivered again.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            while True:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE (state = 'pending' AND available_at <= ?)"
+                    " OR (state = 'leased' AND lease_expires_at <= ?)"
+                    " ORDER BY available_at, created_at LIMIT 1",
+                    (now, now),
+                ).fetchone()
+                if row is None:
+                    return None
+                if row["state"] == "leased":
+                    self.logger.warning(
+                        "Job lease expired",
+                        job_id=row["id"],
+                        worker=row["lease_owner"],
+                        attempts=row["attempts"],
+                    )
+                    if row["attempts"] >= row["max_attempts"]:
+                        self._dead_letter(conn, row["id"], "Lease expired", now)
+                        continue
+                conn.execute(
+                    "UPDATE jobs SET state = 'leased', attempts = attempts + 1,"
+                    " lease_owner = ?, lease_expires_at = ?, updated_at = ?"
+                    " WHERE id = ?",
+                    (
+                        worker_id,
+                        now + (lease_timeout or self.lease_timeout),
+                        now,
+                        row["id"],
+                    ),
+                )
+                job = self._to_dict(row)
+                job.update(
+                    state="leased", attempts=row["attempts"] + 1, lease_owner=worker_id
+                )
+                return job
+
+    def heartbeat(
+        self, job_id: str, worker_id: str, lease_timeout: Optional[float] = None
+    ) -> bool:
+        """Extend a lease; returns False if the worker no longer holds it."""
+        now = time.time()
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ?"
+                " WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (now + (lease_timeout or self.lease_timeout), now, job_id, worker_id),
+            ).rowcount
+        return bool(updated)
+
+    def complete(self, job_id: str, worker_id: str, result: str) -> bool:
+        """Record the result of a leased job; returns False if the lease was lost."""
+        now = time.time()
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET state = 'succeeded', result = ?, lease_owner = NULL,"
+                " lease_expires_at = NULL, finished_at = ?, updated_at = ?"
+                " WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (result, now, now, job_id, worker_id),
+            ).rowcount
+        if updated:
+            self.logger.info("Job succeeded", job_id=job_id, worker=worker_id)
+        return bool(updated)
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> Optional[str]:
+        """
+        Record a failed attempt of a leased job.
+
+        Returns:
+            Optional[str]: "pending" if the job will be retried, "dead" if it was
+            dead-lettered, or None if the worker no longer held the lease.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs"
+                " WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (job_id, worker_id),
+            ).fetchone()
+            if row is None:
+                return None
+            if row["attempts"] >= row["max_attempts"]:
+                self._dead_letter(conn, job_id, error, now)
+                return "dead"
+            delay = self.retry_delay(row["attempts"])
+            conn.execute(
+                "UPDATE jobs SET state = 'pending', available_at = ?, last_error = ?,"
+                " lease_owner = NULL, lease_expires_at = NULL, updated_at = ?"
+                " WHERE id = ?",
+                (now + delay, error, now, job_id),
+            )
+        self.logger.warning(
+            "Job failed, retrying",
+            job_id=job_id,
+            attempts=row["attempts"],
+            retry_in=round(delay, 1),
+            error=error,
+        )
+        return "pending"
+
+    def retry_delay(self, attempts: int) -> float:
+        """Backoff after ``attempts`` failed attempts: exponential, with equal jitter."""
+        delay = min(self.retry_base_delay * 2 ** (attempts - 1), self.retry_max_delay)
+        return random.uniform(delay / 2, delay)
+
+    def requeue(self, job_id: Optional[str] = None) -> int:
+        """
+        Move a dead-lettered job (or all of them if ``job_id`` is None) back to
+        pending with a fresh set of attempts.
+
+        Returns:
+            int: Number of jobs requeued.
+        """
+        now = time.time()
+        query = (
+            "UPDATE jobs SET state = 'pending', attempts = 0, available_at = ?,"
+            " finished_at = NULL, updated_at = ? WHERE state = 'dead'"
+        )
+        params: List[Any] = [now, now]
+        if job_id is not None:
+            query += " AND id = ?"
+            params.append(job_id)
+        with self._transaction() as conn:
+            requeued = conn.execute(query, params).rowcount
+        self.logger.info("Dead-lettered jobs requeued", count=requeued)
+        return int(requeued)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job by id, or None if it is unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    def list_jobs(
+        self, state: Optional[str] = None, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Return the most recently updated jobs, optionally only those in ``state``."""
+        query = "SELECT * FROM jobs"
+        params: List[Any] = []
+        if state is not None:
+            query += " WHERE state = ?"
+            params.append(state)
+        query += " ORDER BY updated_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of jobs per state plus ready and expired-lease counts."""
+        now = time.time()
+        with self._lock:
+            counts = dict(
+                self._conn.execute(
+                    "SELECT state, COUNT(*) FROM jobs GROUP BY state"
+                ).fetchall()
+            )
+            ready = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state = 'pending' AND available_at <= ?",
+                (now,),
+            ).fetchone()[0]
+            expired = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state = 'leased' AND lease_expires_at <= ?",
+                (now,),
+            ).fetchone()[0]
+        stats: Dict[str, Any] = {state: counts.get(state, 0) for state in JOB_STATES}
+        stats.update(ready=ready, expired_leases=expired)
+        return stats
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _dead_letter(
+        self, conn: sqlite3.Connection, job_id: str, error: str, now: float
+    ) -> None:
+        conn.execute(
+            "UPDATE jobs SET state = 'dead', last_error = ?, lease_owner = NULL,"
+            " lease_expires_at = NULL, finished_at = ?, updated_at = ? WHERE id = ?",
+            (error, now, now, job_id),
+        )
+        self.logger.error("Job dead-lettered", job_id=job_id, error=error)
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["variables"] = json.loads(job["variables"])
+        return job
+
+
+class JobWorkerPool(LoggerMixin):
+    """
+    Pool of async workers executing crew jobs leased from a JobQueue.
+
+    Each worker leases one job at a time, heartbeats its lease while the crew
+    runs and records the result or failure. Crews run in threads (see
+    CrewRunner), so throughput grows with the number of workers; several
+    processes can also work the same queue.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        run_crew: RunCrew,
+        workers: int = 4,
+        poll_interval: float = 2.0,
+        heartbeat_interval: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+            queue (JobQueue): Queue to pull jobs from.
+            run_crew (RunCrew): Coroutine running a crew file with task variables.
+            workers (int): Number of jobs run concurrently.
+            poll_interval (float): Seconds an idle worker waits before polling again.
+            heartbeat_interval (Optional[float]): Seconds between lease heartbeats
+                (defaults to a third of the lease timeout).
+        """
+        self.queue: JobQueue = queue
+        self.run_crew: RunCrew = run_crew
+        self.workers: int = workers
+        self.poll_interval: float = poll_interval
+        self.heartbeat_interval: float = heartbeat_interval or queue.lease_timeout / 3
+        self.worker_prefix: str = f"{socket.gethostname()}-{os.getpid()}"
+        self.summary: Dict[str, int] = {"succeeded": 0, "failed": 0, "lost": 0}
+
+    async def run(self, until_idle: bool = False) -> Dict[str, int]:
+        """
+        Run the workers until cancelled, or until no job is ready if
+        ``until_idle`` is set.
+
+        Returns:
+            dict: Counts of succeeded, failed and lost (lease expired) jobs.
+        """
+        self.logger.info(
+            "Job workers started", workers=self.workers, queue=self.queue.path
+        )
+        await asyncio.gather(
+            *(
+                self._worker(f"{self.worker_prefix}-{index}", until_idle)
+                for index in range(self.workers)
+            )
+        )
+        self.logger.info("Job workers stopped", **self.summary)
+        return self.summary
+
+    async def _worker(self, worker_id: str, until_idle: bool) -> None:
+        while True:
+            job = await asyncio.to_thread(self.queue.lease, worker_id)
+            if job is None:
+                if until_idle:
+                    return
+                await asyncio.sleep(self.poll_interval)
+                continue
+            await self._run_job(worker_id, job)
+
+    async def _run_job(self, worker_id: str, job: Dict[str, Any]) -> None:
+        self.logger.info(
+            "Job started",
+            job_id=job["id"],
+            crew=job["crew"],
+            worker=worker_id,
+            attempt=job["attempts"],
+        )
+        run = asyncio.ensure_future(self.run_crew(job["crew"], job["variables"]))
+        heartbeat = asyncio.ensure_future(self._heartbeat(worker_id, job["id"], run))
+        try:
+            result = await run
+        except asyncio.CancelledError:
+            if not heartbeat.done():
+                raise
+            # The lease was lost: another worker may already be running the job.
+            self.summary["lost"] += 1
+            return
+        except Exception as e:
+            self.summary["failed"] += 1
+            await asyncio.to_thread(
+                self.queue.fail, job["id"], worker_id, f"{type(e).__name__}: {e}"
+            )
+            return
+        finally:
+            heartbeat.cancel()
+        self.summary["succeeded"] += 1
+        if not await asyncio.to_thread(
+            self.queue.complete, job["id"], worker_id, result
+        ):
+            self.logger.warning("Job result discarded, lease lost", job_id=job["id"])
+
+    async def _heartbeat(
+        self, worker_id: str, job_id: str, run: "asyncio.Future[str]"
+    ) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            if not await asyncio.to_thread(self.queue.heartbeat, job_id, worker_id):
+                self.logger.warning("Job lease lost", job_id=job_id, worker=worker_id)
+                run.cancel()
+                return
@@ -0,0 +1,48 @@
+import asyncio
+import inspect
+import threading
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+_UNSET: Any = object()
+
+
+class Lazy(Generic[T]):
+    """
+    Deferred component: ``factory`` runs on first access and its result is
+    cached. If the factory returns an awaitable, ``aget`` awaits it once and
+    caches the awaited value.
+    """
+
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        self.factory: Callable[[], Any] = factory
+        self._value: Any = _UNSET
+        self._lock = threading.Lock()
+        self._async_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def created(self) -> bool:
+        """Whether the factory has run."""
+        return self._value is not _UNSET
+
+    def get(self) -> T:
+        """Return the component, creating it on first call."""
+        if self._value is _UNSET:
+            with self._lock:
+                if self._value is _UNSET:
+                    self._value = self.factory()
+        value: T = self._value
+        return value
+
+    async def aget(self) -> T:
+        """Return the component, awaiting the factory's result on first call."""
+        value = self.get()
+        if inspect.isawaitable(value):
+            if self._async_lock is None:
+                self._async_lock = asyncio.Lock()
+            async with self._async_lock:
+                if inspect.isawaitable(self._value):
+                    self._value = await self._value
+            value = self._value
+        return value
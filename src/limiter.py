@@ -0,0 +1,229 @@
+import asyncio
+import time
+from types import TracebackType
+from typing import Any, Dict, Optional, Type
+import aiohttp
+from logging_config import LoggerMixin
+
+OVERLOAD_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """
+    Token bucket allowing ``rate`` requests per second with bursts of up to
+    ``burst`` requests.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """
+        Args:
+            rate (float): Tokens added per second (0 = unlimited).
+            burst (int): Maximum number of tokens the bucket holds.
+        """
+        self.rate: float = rate
+        self.burst: int = max(1, burst)
+        self.tokens: float = float(self.burst)
+        self._updated_at: float = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Take a token, waiting for one if the bucket is empty. Returns the wait in seconds."""
+        if not self.rate:
+            return 0.0
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.burst, self.tokens + (now - self._updated_at) * self.rate
+                )
+                self._updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limit adjusted with AIMD (additive increase, multiplicative
+    decrease): every success raises the limit by about one per window of
+    requests, every overload signal cuts it by ``decrease_factor``.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        decrease_factor: float = 0.5,
+        cooldown: float = 1.0,
+    ) -> None:
+        """
+        Args:
+            initial_limit (int): Starting concurrency limit.
+            min_limit (int): Lowest limit the backoff may reach.
+            max_limit (int): Highest limit the ramp-up may reach.
+            decrease_factor (float): Factor applied to the limit on overload.
+            cooldown (float): Seconds after a decrease during which further
+                overload signals (from the same burst) are ignored.
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        self.limit: float = float(initial_limit)
+        self.min_limit: int = min_limit
+        self.max_limit: int = max_limit
+        self.decrease_factor: float = decrease_factor
+        self.cooldown: float = cooldown
+        self.in_flight: int = 0
+        self._decreased_at: float = float("-inf")
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> float:
+        """Wait for a free slot under the current limit. Returns the wait in seconds."""
+        start_time = time.monotonic()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return time.monotonic() - start_time
+
+    async def release(self, overloaded: Optional[bool] = False) -> None:
+        """
+        Free a slot and adjust the limit.
+
+        Args:
+            overloaded (Optional[bool]): True on an overload signal, False on
+                success, None for failures that say nothing about load.
+        """
+        async with self._condition:
+            self.in_flight -= 1
+            if overloaded:
+                now = time.monotonic()
+                if now - self._decreased_at >= self.cooldown:
+                    self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                    self._decreased_at = now
+            elif overloaded is False:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class EndpointLimiter(LoggerMixin):
+    """
+    Rate and concurrency limiter for one remote endpoint.
+
+    Used as an async context manager around a single request (so it also
+    works with ``error_handling.with_semaphore``). Leaving the block with an
+    HTTP 429/5xx error or a timeout counts as an overload signal.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float = 0.0,
+        burst: int = 1,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        initial_concurrency: Optional[int] = None,
+    ) -> None:
+        self.name: str = name
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = AdaptiveConcurrencyLimiter(
+            initial_limit=initial_concurrency or max_concurrency,
+            min_limit=min_concurrency,
+            max_limit=max_concurrency,
+        )
+        self.requests: int = 0
+        self.successes: int = 0
+        self.overloads: int = 0
+        self.errors: int = 0
+        self.wait_seconds: float = 0.0
+
+    async def __aenter__(self) -> "EndpointLimiter":
+        self.wait_seconds += await self.concurrency.acquire()
+        try:
+            self.wait_seconds += await self.bucket.acquire()
+        except BaseException:
+            await self.concurrency.release(None)
+            raise
+        self.requests += 1
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        overloaded: Optional[bool] = False
+        if exc is not None:
+            overloaded = True if self.is_overload(exc) else None
+        if overloaded:
+            self.overloads += 1
+            self.logger.warning(
+                "Endpoint overloaded, reducing concurrency",
+                endpoint=self.name,
+                error=str(exc),
+            )
+        elif overloaded is None:
+            self.errors += 1
+        else:
+            self.successes += 1
+        await self.concurrency.release(overloaded)
+
+    @staticmethod
+    def is_overload(exc: BaseException) -> bool:
+        """Return whether an exception signals that the endpoint is overloaded."""
+        if isinstance(exc, aiohttp.ClientResponseError):
+            return exc.status in OVERLOAD_STATUSES
+        return isinstance(exc, asyncio.TimeoutError)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return live counters and the current concurrency limit."""
+        return {
+            "concurrency_limit": int(self.concurrency.limit),
+            "in_flight": self.concurrency.in_flight,
+            "tokens": round(self.bucket.tokens, 2),
+            "requests": self.requests,
+            "successes": self.successes,
+            "overloads": self.overloads,
+            "errors": self.errors,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
+
+
+class LimiterRegistry(LoggerMixin):
+    """Creates and shares one EndpointLimiter per endpoint name."""
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """
+        Args:
+            limits (Optional[Dict[str, Dict[str, Any]]]): Per-endpoint keyword
+                arguments for EndpointLimiter (rate, burst, max_concurrency,
+                min_concurrency, initial_concurrency).
+        """
+        self.limits: Dict[str, Dict[str, Any]] = limits or {}
+        self._limiters: Dict[str, EndpointLimiter] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "LimiterRegistry":
+        """Create a registry from the ``rate_limits`` configuration section."""
+        return cls(config.get("rate_limits"))
+
+    def get(self, name: str) -> EndpointLimiter:
+        """Return the limiter of an endpoint, creating it on first use."""
+        if name not in self._limiters:
+            self._limiters[name] = EndpointLimiter(name, **self.limits.get(name, {}))
+        return self._limiters[name]
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Return the live metrics of every endpoint limiter."""
+        return {name: limiter.metrics() for name, limiter in self._limiters.items()}
+
+    def log_metrics(self) -> None:
+        """Log the live metrics of every endpoint limiter."""
+        for name, metrics in self.metrics().items():
+            self.logger.info("Endpoint limiter metrics", endpoint=name, **metrics)
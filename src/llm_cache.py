@@ -0,0 +1,350 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.embeddings import Embeddings
+from langchain_core.outputs import Generation
+from crew_events import emit, streaming
+from logging_config import LoggerMixin
+
+
+# Digest of the task variables of the crew run the current context belongs to.
+# asyncio.to_thread copies it into the threads the crew's LLM calls run in.
+_cache_inputs: ContextVar[str] = ContextVar("llm_cache_inputs", default="")
+
+
+def hash_key(text: str) -> str:
+    """Return the digest a prompt or LLM configuration is stored under."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def set_cache_inputs(variables: Dict[str, str]) -> None:
+    """
+    Record the task variables of the crew run in the current context, so
+    that semantic cache hits are limited to runs over the same variables.
+    """
+    _cache_inputs.set(
+        hash_key(json.dumps(variables, sort_keys=True)) if variables else ""
+    )
+
+
+class LLMResponseCache(BaseCache, LoggerMixin):
+    """
+    Persistent cache of LLM completions, set as an LLM's ``cache``.
+
+    Completions are stored in SQLite keyed by the LLM configuration (model and
+    parameters, as LangChain's ``llm_string``) and the exact prompt. With
+    ``embeddings`` given, a prompt missing from the cache may also be answered
+    by the completion of the most similar cached prompt of the same LLM
+    configuration, if their cosine similarity reaches ``similarity_threshold``
+    and both were made with the same task variables (see ``set_cache_inputs``).
+    Long crew prompts that differ only in a company name or ticker embed
+    almost identically, so similarity alone would serve one company's
+    analysis for another. Prompts made outside a crew run share one scope and
+    are matched on similarity only.
+
+    Entries expire ``ttl`` seconds after they were stored, and the least
+    recently used ones are evicted beyond ``max_entries``.
+    """
+
+    # Vectors computed by lookups that missed, kept for the update that follows.
+    _PENDING_VECTORS = 64
+    # Nearest prompts considered for a semantic hit.
+    _SEMANTIC_CANDIDATES = 8
+
+    def __init__(
+        self,
+        db_path: str,
+        ttl: float = 604_800,
+        max_entries: int = 10_000,
+        embeddings: Optional[Embeddings] = None,
+        similarity_threshold: float = 0.97,
+    ) -> None:
+        """
+        Args:
+            db_path (str): Path to the SQLite database file.
+            ttl (float): Seconds an entry stays valid (0 = never expires).
+            max_entries (int): Maximum number of entries (0 = unbounded).
+            embeddings (Optional[Embeddings]): Embeddings used for semantic
+                matching; exact matching only if None.
+            similarity_threshold (float): Minimum cosine similarity of a
+                semantic match.
+        """
+        self.db_path: str = os.path.abspath(db_path)
+        self.ttl: float = ttl
+        self.max_entries: int = max_entries
+        self.embeddings: Optional[Embeddings] = embeddings
+        self.similarity_threshold: float = similarity_threshold
+        self.hits: int = 0
+        self.semantic_hits: int = 0
+        self.misses: int = 0
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, Any] = {}
+        self._pending: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            " llm_hash TEXT NOT NULL,"
+            " prompt_hash TEXT NOT NULL,"
+            " generations TEXT NOT NULL,"
+            " vector BLOB,"
+            " inputs_hash TEXT NOT NULL DEFAULT '',"
+            " created_at REAL NOT NULL,"
+            " last_used_at REAL NOT NULL,"
+            " PRIMARY KEY (llm_hash, prompt_hash))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_responses_last_used"
+            " ON llm_responses (last_used_at)"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Dict[str, Any],
+        root_dir: str = "",
+        embeddings: Optional[Embeddings] = None,
+    ) -> Optional["LLMResponseCache"]:
+        """
+        Create a cache from the application configuration, or None if disabled.
+
+        ``embeddings`` is only used if ``llm_cache_semantic_enabled`` is set.
+        """
+        if not config.get("llm_cache_enabled", True):
+            return None
+        return cls(
+            os.path.join(root_dir, config["llm_cache_path"]),
+            ttl=config.get("llm_cache_ttl", 604_800),
+            max_entries=config.get("llm_cache_max_entries", 10_000),
+            embeddings=(
+                embeddings if config.get("llm_cache_semantic_enabled") else None
+            ),
+            similarity_threshold=config.get("llm_cache_similarity_threshold", 0.97),
+        )
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Return the cached completion of a prompt, or None on a miss."""
+        key = (hash_key(llm_string), hash_key(prompt))
+        generations = self._get(*key)
+        if generations is not None:
+            self.hits += 1
+        elif self.embeddings is not None:
+            generations = self._get_similar(key, prompt)
+            if generations is not None:
+                self.semantic_hits += 1
+        if generations is None:
+            self.misses += 1
+            return None
+        if streaming():
+            # Cached completions are not generated, so stream them whole.
+            emit("token", text="".join(generation.text for generation in generations))
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store the completion of a prompt, evicting expired and old entries."""
+        llm_hash, prompt_hash = hash_key(llm_string), hash_key(prompt)
+        vector = None
+        if self.embeddings is not None:
+            with self._lock:
+                vector = self._pending.pop((llm_hash, prompt_hash), None)
+            if vector is None:
+                vector = self._embed(prompt)
+        generations = json.dumps(
+            [
+                {"text": generation.text, "generation_info": generation.generation_info}
+                for generation in return_val
+            ],
+            default=str,
+        )
+        now = time.time()
+        with self._lock:
+            self._remove(
+                "SELECT rowid FROM llm_responses WHERE llm_hash = ? AND prompt_hash = ?",
+                (llm_hash, prompt_hash),
+            )
+            cursor = self._conn.execute(
+                "INSERT INTO llm_responses (llm_hash, prompt_hash, generations,"
+                " vector, inputs_hash, created_at, last_used_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    llm_hash,
+                    prompt_hash,
+                    generations,
+                    None if vector is None else vector.tobytes(),
+                    _cache_inputs.get(),
+                    now,
+                    now,
+                ),
+            )
+            if vector is not None and llm_hash in self._indexes:
+                self._indexes[llm_hash].add_with_ids(
+                    vector.reshape(1, -1), self._ids([cursor.lastrowid])
+                )
+            self._evict(now)
+            self._conn.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+            self._conn.commit()
+            self._indexes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of entries, hit/miss counters and the hit rate."""
+        lookups = self.hits + self.semantic_hits + self.misses
+        return {
+            "entries": self.count(),
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.semantic_hits) / lookups if lookups else 0.0,
+        }
+
+    def log_stats(self) -> None:
+        self.logger.info("LLM cache stats", path=self.db_path, **self.stats())
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def count(self) -> int:
+        """Return the number of stored entries."""
+        # Not __len__: LangChain skips caches that are falsy, i.e. empty.
+        with self._lock:
+            count: int = self._conn.execute(
+                "SELECT COUNT(*) FROM llm_responses"
+            ).fetchone()[0]
+            return count
+
+    def _get(self, llm_hash: str, prompt_hash: str) -> Optional[List[Generation]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rowid, generations, created_at FROM llm_responses"
+                " WHERE llm_hash = ? AND prompt_hash = ?",
+                (llm_hash, prompt_hash),
+            ).fetchone()
+            return self._use(row)
+
+    def _get_similar(
+        self, key: Tuple[str, str], prompt: str
+    ) -> Optional[List[Generation]]:
+        vector = self._embed(prompt)
+        with self._lock:
+            self._pending[key] = vector
+            while len(self._pending) > self._PENDING_VECTORS:
+                self._pending.popitem(last=False)
+            index = self._index(key[0], len(vector))
+            if index.ntotal == 0:
+                return None
+            scores, ids = index.search(
+                vector.reshape(1, -1), min(self._SEMANTIC_CANDIDATES, index.ntotal)
+            )
+            for score, rowid in zip(scores[0], ids[0]):
+                if score < self.similarity_threshold:
+                    return None
+                # Only completions of a run over the same task variables.
+                row = self._conn.execute(
+                    "SELECT rowid, generations, created_at FROM llm_responses"
+                    " WHERE rowid = ? AND inputs_hash = ?",
+                    (int(rowid), _cache_inputs.get()),
+                ).fetchone()
+                generations = self._use(row)
+                if generations is not None:
+                    self.logger.debug("LLM cache semantic hit", similarity=float(score))
+                    return generations
+        return None
+
+    def _use(self, row: Optional[Tuple[int, str, float]]) -> Optional[List[Generation]]:
+        # Called with the lock held: returns the generations of an unexpired
+        # row and marks it as recently used.
+        if row is None:
+            return None
+        rowid, generations, created_at = row
+        now = time.time()
+        if self.ttl and created_at + self.ttl < now:
+            return None
+        self._conn.execute(
+            "UPDATE llm_responses SET last_used_at = ? WHERE rowid = ?", (now, rowid)
+        )
+        self._conn.commit()
+        return [Generation(**generation) for generation in json.loads(generations)]
+
+    def _embed(self, prompt: str) -> Any:
+        import numpy as np
+
+        assert self.embeddings is not None
+        vector = np.asarray(self.embeddings.embed_query(prompt), dtype="float32")
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _index(self, llm_hash: str, dimension: int) -> Any:
+        # Called with the lock held: the FAISS index of one LLM configuration's
+        # prompts, built from the stored vectors on first use.
+        index = self._indexes.get(llm_hash)
+        if index is None:
+            import faiss
+            import numpy as np
+
+            index = faiss.IndexIDMap(faiss.IndexFlatIP(dimension))
+            stored = [
+                (rowid, array("f", blob))
+                for rowid, blob in self._conn.execute(
+                    "SELECT rowid, vector FROM llm_responses"
+                    " WHERE llm_hash = ? AND vector IS NOT NULL",
+                    (llm_hash,),
+                )
+            ]
+            # Vectors of another embedding model cannot be compared; skip them.
+            stored = [
+                (rowid, vector) for rowid, vector in stored if len(vector) == dimension
+            ]
+            if stored:
+                index.add_with_ids(
+                    np.array([vector for _, vector in stored], dtype="float32"),
+                    self._ids([rowid for rowid, _ in stored]),
+                )
+            self._indexes[llm_hash] = index
+        return index
+
+    def _evict(self, now: float) -> None:
+        # Called with the lock held.
+        if self.ttl:
+            self._remove(
+                "SELECT rowid FROM llm_responses WHERE created_at < ?",
+                (now - self.ttl,),
+            )
+        if self.max_entries:
+            self._remove(
+                "SELECT rowid FROM llm_responses ORDER BY last_used_at DESC"
+                " LIMIT -1 OFFSET ?",
+                (self.max_entries,),
+            )
+
+    def _remove(self, query: str, params: Tuple[Any, ...]) -> None:
+        # Called with the lock held: deletes the rows ``query`` selects, from
+        # the table and the semantic indexes.
+        rowids = [rowid for (rowid,) in self._conn.execute(query, params).fetchall()]
+        if not rowids:
+            return
+        self._conn.executemany(
+            "DELETE FROM llm_responses WHERE rowid = ?", [(rowid,) for rowid in rowids]
+        )
+        for index in self._indexes.values():
+            index.remove_ids(self._ids(rowids))
+
+    @staticmethod
+    def _ids(rowids: List[int]) -> Any:
+        import numpy as np
+
+        return np.array(rowids, dtype="int64")
@@ -0,0 +1,16 @@
+from typing import Any
+from langchain_core.callbacks import BaseCallbackHandler
+from crew_events import emit, streaming
+
+
+class TokenEventCallbackHandler(BaseCallbackHandler):
+    """
+    Emits each generated token as a ``token`` crew event.
+
+    Attached to the shared LLM; it does nothing unless the crew run the call
+    belongs to is being streamed (see ``crew_events``).
+    """
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        if token and streaming():
+            emit("token", text=token)
@@ -0,0 +1,106 @@
+import json
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from logging_config import LoggerMixin
+
+# Ollama LLM fields a crew or agent may set in ``llm_params``.
+LLM_PARAMS = (
+    "temperature",
+    "num_ctx",
+    "num_predict",
+    "num_gpu",
+    "num_thread",
+    "top_k",
+    "top_p",
+    "tfs_z",
+    "repeat_penalty",
+    "repeat_last_n",
+    "mirostat",
+    "mirostat_eta",
+    "mirostat_tau",
+    "stop",
+    "system",
+    "template",
+    "format",
+    "keep_alive",
+    "timeout",
+)
+
+LLMFactory = Callable[[str, Dict[str, Any], bool], Any]
+
+
+def resolve_llm_config(
+    crew_config: Dict[str, Any], agent_config: Dict[str, Any], default_model: str
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Return the model and parameters an agent runs with: its own ``llm_model``
+    and ``llm_params``, else the crew's, else the default model.
+    """
+    model: str = (
+        agent_config.get("llm_model") or crew_config.get("llm_model") or default_model
+    )
+    params = {
+        **(crew_config.get("llm_params") or {}),
+        **(agent_config.get("llm_params") or {}),
+    }
+    return model, params
+
+
+def crew_models(crew_config: Dict[str, Any], default_model: str) -> List[str]:
+    """Return the distinct models the agents of a crew run with."""
+    models = {
+        resolve_llm_config(crew_config, agent_config, default_model)[0]
+        for agent_config in crew_config.get("agents", {}).values()
+    }
+    return sorted(models)
+
+
+class LLMPool(LoggerMixin):
+    """
+    Shared LLM instances, one per distinct (model, parameters, cache) config.
+
+    Agents asking for the same configuration get the same instance, so
+    crews do not multiply clients and their callbacks.
+    """
+
+    def __init__(self, factory: LLMFactory, default_model: str) -> None:
+        """
+        Args:
+            factory (LLMFactory): Creates an LLM from a model name, parameters
+                and whether its completions are cached.
+            default_model (str): Model used when none is given.
+        """
+        self.factory: LLMFactory = factory
+        self.default_model: str = default_model
+        self._llms: Dict[Tuple[str, str, bool], Any] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        model: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        cache: bool = True,
+    ) -> Any:
+        """Return the LLM for a configuration, creating it on first use."""
+        model = model or self.default_model
+        params = params or {}
+        key = (model, json.dumps(params, sort_keys=True), cache)
+        with self._lock:
+            llm = self._llms.get(key)
+            if llm is None:
+                llm = self.factory(model, params, cache)
+                self._llms[key] = llm
+                self.logger.info(
+                    "LLM created",
+                    model=model,
+                    params=params,
+                    cache=cache,
+                    pooled=len(self._llms),
+                )
+            return llm
+
+    @property
+    def models(self) -> List[str]:
+        """Return the distinct models of the LLMs created so far."""
+        with self._lock:
+            return sorted({model for model, _, _ in self._llms})
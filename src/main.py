@@ -1,8 +1,27 @@
+import argparse
 import asyncio
-from typing import Dict, List, Any
+import json
+import os
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
 from logging_config import setup_logging, get_logger, log_execution_time
 from config_loader import get_available_crew_configs, load_crew_config
 from dependencies import dependencies
+from batch_runner import BatchRunner, load_batch_inputs
+from job_queue import JobWorkerPool, job_id_for
+from crew_server import CrewJobManager, CrewServer
+from crew_events import render_event
+from llm_pool import crew_models
+from startup_profile import format_import_profile, profile_imports
 from exceptions import (
     ConfigError,
     APIKeyError,
@@ -11,13 +30,16 @@ from exceptions import (
     AgentCreationError,
     TaskCreationError,
     CrewExecutionError,
+    JobNotFoundError,
     BaseError,
     AsyncOperationError,
     NetworkError,
     TimeoutError,
     APIError,
 )
-from crewai import Agent, Task
+
+if TYPE_CHECKING:
+    from crewai import Agent, Task
 
 setup_logging()
 logger = get_logger(__name__)
@@ -32,7 +54,9 @@ async def get_crew_config() -> Dict[str, Any]:
     logger.info("Available crew configurations", configurations=crew_files)
 
     try:
-        choice: int = int(input("Enter the number of the configuration you want to run: ")) - 1
+        choice: int = int(
+            await asyncio.to_thread(input, "Enter the number of the configuration you want to run: ")
+        ) - 1
         chosen_file: str = crew_files[choice]
         logger.info("Configuration chosen", choice=chosen_file)
     except (ValueError, IndexError):
@@ -41,27 +65,115 @@ async def get_crew_config() -> Dict[str, Any]:
 
     return load_crew_config(chosen_file)
 
-async def create_and_run_crew(crew_config: Dict[str, Any]) -> str:
-    agents: Dict[str, Agent] = await dependencies.agent_manager.create_agents(crew_config)
-    logger.info("Agents created", agent_count=len(agents))
-
-    tasks: List[Task] = await dependencies.task_manager.create_tasks(crew_config, agents)
-    logger.info("Tasks created", task_count=len(tasks))
+async def preload_crew_models(crew_config: Dict[str, Any]) -> None:
+    """Load the crew's models on every Ollama instance, so no task waits for a model load."""
+    models = crew_models(crew_config, dependencies.config["default_llm_model"])
+    await asyncio.gather(
+        *(
+            dependencies.ollama_pool.preload(
+                dependencies.http_client, model, dependencies.config["llm_keep_alive"]
+            )
+            for model in models
+        )
+    )
 
-    result: str = await dependencies.crew_runner.run_crew(
-        agents,
-        tasks,
-        crew_config.get("process", dependencies.config["default_crew_process"])
+def start_model_warmup(
+    crew_files: Optional[List[str]] = None, is_busy: Optional[Callable[[], bool]] = None
+) -> None:
+    """
+    Preload the models of the given crews (default: all) and the embedding
+    model in the background, keeping them loaded while ``is_busy()``.
+    """
+    if not dependencies.config["llm_warmup_enabled"]:
+        return
+    models: List[str] = []
+    for crew_file in crew_files or get_available_crew_configs():
+        try:
+            crew_config = load_crew_config(crew_file)
+        except BaseError as e:
+            # Warm-up is best effort; the crew itself reports its config errors.
+            logger.warning("Crew skipped by model warm-up", crew=crew_file, error=str(e))
+            continue
+        models += crew_models(crew_config, dependencies.config["default_llm_model"])
+    dependencies.model_warmer.start(
+        models, [dependencies.config["embedding_model"]], is_busy
     )
+
+async def create_crew(
+    crew_config: Dict[str, Any], variables: Optional[Dict[str, str]] = None
+) -> Tuple[Dict[str, "Agent"], List["Task"], str]:
+    preload: Optional["asyncio.Task[None]"] = None
+    if dependencies.config["llm_preload"]:
+        # Runs while the agents and their tools are created.
+        preload = asyncio.create_task(preload_crew_models(crew_config))
+    try:
+        agents: Dict[str, Agent] = await dependencies.agent_manager.create_agents(crew_config)
+        logger.info("Agents created", agent_count=len(agents))
+
+        tasks: List[Task] = await dependencies.task_manager.create_tasks(
+            crew_config, agents, variables
+        )
+        logger.info("Tasks created", task_count=len(tasks))
+    except BaseException:
+        if preload is not None:
+            preload.cancel()
+        raise
+
+    if preload is not None:
+        await preload
+    return agents, tasks, crew_config.get("process", dependencies.config["default_crew_process"])
+
+async def create_and_run_crew(
+    crew_config: Dict[str, Any], variables: Optional[Dict[str, str]] = None
+) -> str:
+    agents, tasks, process = await create_crew(crew_config, variables)
+    result: str = await dependencies.crew_runner.run_crew(agents, tasks, process)
     logger.info("Crew execution completed", result_length=len(result))
     return result
 
-async def async_main() -> None:
+async def create_and_stream_crew(
+    crew_config: Dict[str, Any], variables: Optional[Dict[str, str]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """Run a crew, yielding its events (see ``CrewRunner.stream_crew``) as they happen."""
+    agents, tasks, process = await create_crew(crew_config, variables)
+    async for event in dependencies.crew_runner.stream_crew(agents, tasks, process):
+        yield event
+
+def make_crew_file_runner() -> Callable[[str, Dict[str, str]], Awaitable[str]]:
+    """Return a coroutine function running a crew file, reading each file once."""
+    crew_configs: Dict[str, Dict[str, Any]] = {}
+
+    async def run_crew(crew_file: str, variables: Dict[str, str]) -> str:
+        if crew_file not in crew_configs:
+            crew_configs[crew_file] = load_crew_config(crew_file)
+        return await create_and_run_crew(crew_configs[crew_file], variables)
+
+    return run_crew
+
+def make_crew_file_streamer() -> Callable[[str, Dict[str, str]], AsyncIterator[Dict[str, Any]]]:
+    """Like ``make_crew_file_runner``, but the crews' events are streamed."""
+    crew_configs: Dict[str, Dict[str, Any]] = {}
+
+    async def stream_crew(crew_file: str, variables: Dict[str, str]) -> AsyncIterator[Dict[str, Any]]:
+        if crew_file not in crew_configs:
+            crew_configs[crew_file] = load_crew_config(crew_file)
+        async for event in create_and_stream_crew(crew_configs[crew_file], variables):
+            yield event
+
+    return stream_crew
+
+async def async_main(stream: bool = False) -> None:
     try:
+        # Models load while the user picks a crew.
+        start_model_warmup()
         crew_config = await get_crew_config()
-        result = await create_and_run_crew(crew_config)
-        print("Crew's work result:")
-        print(result)
+        if stream:
+            async for event in create_and_stream_crew(crew_config):
+                print(render_event(event), end="", flush=True)
+        else:
+            result = await create_and_run_crew(crew_config)
+            print("Crew's work result:")
+            print(result)
     except AsyncOperationError as e:
         logger.error("Async operation error", error=str(e), exc_info=True)
         print(f"An error occurred during an asynchronous operation: {e}")
@@ -89,9 +201,240 @@ async def async_main() -> None:
     except Exception as e:
         logger.error("Unexpected error", error=str(e), exc_info=True)
         print("An unexpected error occurred. Please check the logs for more information.")
+    finally:
+        await dependencies.aclose()
+
+async def async_batch_main(
+    crew_file: str, input_path: str, output_path: str, workers: Optional[int] = None
+) -> None:
+    """Run a crew non-interactively over every row of a CSV/JSONL input file."""
+    try:
+        crew_config = load_crew_config(crew_file)
+
+        async def run_job(variables: Dict[str, str]) -> str:
+            return await create_and_run_crew(crew_config, variables)
+
+        runner = BatchRunner(
+            run_job, workers or dependencies.config["batch_max_workers"]
+        )
+        start_model_warmup([crew_file], is_busy=lambda: True)
+        summary = await runner.run(input_path, output_path)
+        print(
+            f"Batch finished: {summary['succeeded']} succeeded, "
+            f"{summary['failed']} failed, {summary['skipped']} already completed. "
+            f"Results written to {output_path}"
+        )
+    except BaseError as e:
+        logger.error(f"{type(e).__name__}", error=str(e), exc_info=True)
+        print(f"{type(e).__name__}: {e}")
+    finally:
+        await dependencies.aclose()
+
+async def async_sync_main(
+    tickers: List[str], watchlist: Optional[str] = None, forms: Optional[List[str]] = None
+) -> None:
+    """Pre-sync the latest filings of a watchlist of tickers into the local mirror."""
+    try:
+        tickers = list(tickers or [])
+        if watchlist:
+            with open(watchlist, "r") as file:
+                tickers += [
+                    line.strip()
+                    for line in file
+                    if line.strip() and not line.startswith("#")
+                ]
+        tickers = tickers or dependencies.config["filing_watchlist"]
+        if not tickers:
+            raise ConfigError("No tickers given and filing_watchlist is empty.")
+
+        summaries = await dependencies.sec_tools.sync_filings(
+            tickers, forms or dependencies.config["sec_form_types"]
+        )
+        for summary in summaries:
+            logger.info("Filing synced", **summary)
+            print(
+                f"{summary['ticker']:8} {summary['form_type']:6} {summary['status']:10} "
+                f"{summary.get('accession', '')} {summary.get('error', '')}".rstrip()
+            )
+    except BaseError as e:
+        logger.error(f"{type(e).__name__}", error=str(e), exc_info=True)
+        print(f"{type(e).__name__}: {e}")
+    finally:
+        await dependencies.aclose()
+
+async def async_serve_main(
+    host: Optional[str] = None, port: Optional[int] = None, workers: Optional[int] = None
+) -> None:
+    """Serve the crew job API, keeping dependencies and caches warm between jobs."""
+    try:
+        run_crew = make_crew_file_runner()
+        dependencies.warm_up(dependencies.config["server_warm_components"])
+        await dependencies.startup()
+        manager = CrewJobManager(
+            run_crew,
+            workers or dependencies.config["server_max_concurrent_jobs"],
+            dependencies.config["server_max_queue_size"],
+            dependencies.config["server_job_retention"],
+            stream_crew=make_crew_file_streamer(),
+            max_buffered_tokens=dependencies.config["server_max_buffered_tokens"],
+        )
+        start_model_warmup(
+            is_busy=lambda: manager.stats()["queue_depth"] + manager.stats()["running"] > 0
+        )
+        server = CrewServer(manager, get_available_crew_configs)
+        await server.serve(
+            host or dependencies.config["server_host"],
+            port or dependencies.config["server_port"],
+        )
+    except BaseError as e:
+        logger.error(f"{type(e).__name__}", error=str(e), exc_info=True)
+        print(f"{type(e).__name__}: {e}")
+    finally:
+        await dependencies.aclose()
+
+async def async_queue_main(args: argparse.Namespace) -> None:
+    """Enqueue crew jobs, work the durable job queue, or inspect it."""
+    try:
+        queue = dependencies.job_queue
+        if args.queue_command == "enqueue":
+            load_crew_config(args.crew)  # Fail early on an unknown or invalid crew
+            inserted = skipped = 0
+            for variables in load_batch_inputs(os.path.abspath(args.input)):
+                # Ids derived from the row's variables skip rows already queued.
+                job_id = job_id_for(args.crew, variables)
+                if queue.get(job_id) is not None:
+                    skipped += 1
+                    continue
+                queue.enqueue(args.crew, variables, job_id=job_id)
+                inserted += 1
+            print(
+                f"Enqueued {inserted} job(s) from {args.input} for {args.crew}, "
+                f"skipped {skipped} already queued: {queue.stats()}"
+            )
+        elif args.queue_command == "work":
+            start_model_warmup(
+                is_busy=lambda: queue.stats()["pending"] + queue.stats()["leased"] > 0
+            )
+            pool = JobWorkerPool(
+                queue,
+                make_crew_file_runner(),
+                args.workers or dependencies.config["job_queue_workers"],
+                dependencies.config["job_poll_interval"],
+            )
+            summary = await pool.run(until_idle=args.until_idle)
+            print(
+                f"Workers finished: {summary['succeeded']} succeeded, "
+                f"{summary['failed']} failed, {summary['lost']} lost their lease"
+            )
+        elif args.queue_command == "requeue":
+            count = queue.requeue(args.job_id)
+            print(f"Requeued {count} dead-lettered job(s)")
+        elif args.job_id:
+            job = queue.get(args.job_id)
+            if job is None:
+                raise JobNotFoundError(f"Unknown job: {args.job_id}")
+            print(json.dumps(job, indent=2))
+        else:
+            stats = queue.stats()
+            print("  ".join(f"{state}={count}" for state, count in stats.items()))
+            for job in queue.list_jobs(args.state, args.limit):
+                print(
+                    f"{job['id']}  {job['state']:9} {job['attempts']}/{job['max_attempts']}  "
+                    f"{job['crew']}  {json.dumps(job['variables'])}  {job['last_error'] or ''}".rstrip()
+                )
+    except BaseError as e:
+        logger.error(f"{type(e).__name__}", error=str(e), exc_info=True)
+        print(f"{type(e).__name__}: {e}")
+    finally:
+        await dependencies.aclose()
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run AI agent crews.")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print an -X importtime breakdown of the application's startup and exit",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print the crew's progress and LLM output as it is generated",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    batch_parser = subparsers.add_parser(
+        "batch", help="Run a crew over a CSV/JSONL file of task variables"
+    )
+    batch_parser.add_argument("crew", help="Crew YAML file name, e.g. financial_analysis_crew.yaml")
+    batch_parser.add_argument("input", help="CSV or JSONL file with one row of task variables per crew run")
+    batch_parser.add_argument("output", help="JSONL file to append results to (used to resume)")
+    batch_parser.add_argument(
+        "--workers", type=int, default=None, help="Number of crews to run concurrently"
+    )
+
+    sync_parser = subparsers.add_parser(
+        "sync", help="Pre-sync the latest SEC filings of a watchlist into the local mirror"
+    )
+    sync_parser.add_argument("tickers", nargs="*", help="Tickers to sync (default: filing_watchlist)")
+    sync_parser.add_argument("--watchlist", help="File with one ticker per line")
+    sync_parser.add_argument(
+        "--forms", nargs="+", default=None, help="Form types to sync (default: sec_form_types)"
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Run a long-lived server accepting crew jobs over a local JSON API"
+    )
+    serve_parser.add_argument("--host", default=None, help="Address to listen on (default: server_host)")
+    serve_parser.add_argument("--port", type=int, default=None, help="Port to listen on (default: server_port)")
+    serve_parser.add_argument(
+        "--workers", type=int, default=None, help="Number of crew jobs run concurrently"
+    )
+
+    queue_parser = subparsers.add_parser(
+        "queue", help="Durable crew job queue: enqueue, work, status, requeue"
+    )
+    queue_subparsers = queue_parser.add_subparsers(dest="queue_command", required=True)
+    enqueue_parser = queue_subparsers.add_parser(
+        "enqueue", help="Enqueue one crew job per row of a CSV/JSONL file"
+    )
+    enqueue_parser.add_argument("crew", help="Crew YAML file name")
+    enqueue_parser.add_argument("input", help="CSV or JSONL file with one row of task variables per job")
+    work_parser = queue_subparsers.add_parser("work", help="Run queued jobs")
+    work_parser.add_argument(
+        "--workers", type=int, default=None, help="Number of jobs run concurrently (default: job_queue_workers)"
+    )
+    work_parser.add_argument(
+        "--until-idle", action="store_true", help="Exit once no job is ready instead of polling"
+    )
+    status_parser = queue_subparsers.add_parser("status", help="Show queue counts and jobs")
+    status_parser.add_argument("job_id", nargs="?", help="Show one job in full")
+    status_parser.add_argument(
+        "--state", choices=["pending", "leased", "succeeded", "dead"], default=None
+    )
+    status_parser.add_argument("--limit", type=int, default=20)
+    requeue_parser = queue_subparsers.add_parser(
+        "requeue", help="Move dead-lettered jobs back to pending"
+    )
+    requeue_parser.add_argument("job_id", nargs="?", help="Job to requeue (default: all dead jobs)")
+    return parser.parse_args(argv)
 
-def main() -> None:
-    asyncio.run(async_main())
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.profile_startup:
+        print(format_import_profile(profile_imports("main")))
+    elif args.command == "batch":
+        asyncio.run(async_batch_main(args.crew, args.input, args.output, args.workers))
+    elif args.command == "sync":
+        asyncio.run(async_sync_main(args.tickers, args.watchlist, args.forms))
+    elif args.command == "queue":
+        asyncio.run(async_queue_main(args))
+    elif args.command == "serve":
+        try:
+            asyncio.run(async_serve_main(args.host, args.port, args.workers))
+        except KeyboardInterrupt:
+            logger.info("Crew server stopped")
+    else:
+        asyncio.run(async_main(args.stream))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,149 @@
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+from http_client import HTTPClient
+from logging_config import LoggerMixin
+from ollama_pool import OllamaEndpointPool
+
+IsBusy = Callable[[], bool]
+
+# A keep-alive request slower than this had to load the model again.
+RELOAD_THRESHOLD = 1.0
+
+
+class ModelWarmer(LoggerMixin):
+    """
+    Loads Ollama models before they are needed and keeps them loaded while
+    there is work for them.
+
+    ``start`` preloads the given generation and embedding models on every
+    endpoint in the background, logging how long the loads took: latency the
+    first crew would otherwise have paid. Given an ``is_busy`` check, it then
+    refreshes the models every ``interval`` seconds while that check is true,
+    so that Ollama does not unload them between queued jobs.
+    """
+
+    def __init__(
+        self,
+        generation_pool: OllamaEndpointPool,
+        embedding_pool: OllamaEndpointPool,
+        http_client: HTTPClient,
+        keep_alive: Optional[str] = None,
+        interval: float = 240.0,
+    ) -> None:
+        """
+        Args:
+            generation_pool (OllamaEndpointPool): Endpoints of the LLM models.
+            embedding_pool (OllamaEndpointPool): Endpoints of the embedding models.
+            http_client (HTTPClient): Shared HTTP client for the requests.
+            keep_alive (Optional[str]): How long Ollama keeps a model loaded
+                after each request, e.g. "30m" (None = Ollama's default).
+            interval (float): Seconds between keep-alive refreshes; keep it
+                below the keep-alive duration.
+        """
+        self.generation_pool: OllamaEndpointPool = generation_pool
+        self.embedding_pool: OllamaEndpointPool = embedding_pool
+        self.http_client: HTTPClient = http_client
+        self.keep_alive: Optional[str] = keep_alive
+        self.interval: float = interval
+        self.hidden_load_seconds: float = 0.0
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def start(
+        self,
+        models: Sequence[str],
+        embedding_models: Sequence[str] = (),
+        is_busy: Optional[IsBusy] = None,
+    ) -> None:
+        """Warm the models up in the background, then keep them loaded while ``is_busy()``."""
+        if self._task is None:
+            self._task = asyncio.create_task(
+                self._run(list(models), list(embedding_models), is_busy)
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            self.logger.info(
+                "Model warmer stopped", hidden_load_seconds=self.hidden_load_seconds
+            )
+
+    async def warm_up(
+        self, models: Sequence[str], embedding_models: Sequence[str] = ()
+    ) -> Dict[str, float]:
+        """
+        Load the models on every endpoint now.
+
+        Returns:
+            dict: The slowest endpoint's load time of each model, in seconds.
+        """
+        start_time = time.monotonic()
+        seconds = await self._load(models, embedding_models)
+        hidden = sum(seconds.values())
+        self.hidden_load_seconds += hidden
+        self.logger.info(
+            "Models warmed up",
+            models=seconds,
+            hidden_load_seconds=hidden,
+            wall_time=time.monotonic() - start_time,
+        )
+        return seconds
+
+    async def refresh(
+        self, models: Sequence[str], embedding_models: Sequence[str] = ()
+    ) -> Dict[str, float]:
+        """Extend the keep-alive of the models, logging those Ollama had unloaded."""
+        seconds = await self._load(models, embedding_models)
+        reloaded = {
+            model: elapsed
+            for model, elapsed in seconds.items()
+            if elapsed >= RELOAD_THRESHOLD
+        }
+        self.hidden_load_seconds += sum(reloaded.values())
+        if reloaded:
+            self.logger.info(
+                "Models reloaded by keep-alive",
+                models=reloaded,
+                hidden_load_seconds=sum(reloaded.values()),
+            )
+        else:
+            self.logger.debug("Models kept alive", models=list(seconds))
+        return seconds
+
+    async def _run(
+        self,
+        models: List[str],
+        embedding_models: List[str],
+        is_busy: Optional[IsBusy],
+    ) -> None:
+        await self.warm_up(models, embedding_models)
+        if is_busy is None:
+            return
+        while True:
+            await asyncio.sleep(self.interval)
+            if is_busy():
+                await self.refresh(models, embedding_models)
+
+    async def _load(
+        self, models: Sequence[str], embedding_models: Sequence[str]
+    ) -> Dict[str, float]:
+        requests = [
+            (model, model, self.generation_pool, False)
+            for model in dict.fromkeys(models)
+        ] + [
+            (f"{model} (embedding)", model, self.embedding_pool, True)
+            for model in dict.fromkeys(embedding_models)
+        ]
+        results = await asyncio.gather(
+            *(
+                pool.preload(self.http_client, model, self.keep_alive, embedding)
+                for _, model, pool, embedding in requests
+            )
+        )
+        return {
+            label: max(loaded.values())
+            for (label, _, _, _), loaded in zip(requests, results)
+            if loaded
+        }
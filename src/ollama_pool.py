@@ -0,0 +1,396 @@
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TypeVar
+import aiohttp
+from langchain_community.llms import Ollama
+from langchain_core.embeddings import Embeddings
+from exceptions import ConfigError
+from http_client import HTTPClient
+from logging_config import LoggerMixin
+
+T = TypeVar("T")
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """
+    Whether ``error`` (or the error it was raised from) means the endpoint
+    could not be reached, as opposed to a bad request or model error.
+    """
+    seen: Optional[BaseException] = error
+    while seen is not None:
+        # requests' and aiohttp's connection errors and timeouts are OSErrors.
+        if isinstance(seen, (OSError, asyncio.TimeoutError)):
+            return True
+        seen = seen.__cause__ or seen.__context__
+    return False
+
+
+class OllamaEndpoint:
+    """Load and health state of one Ollama instance."""
+
+    def __init__(self, url: str) -> None:
+        self.url: str = url.rstrip("/")
+        self.outstanding: int = 0
+        self.requests: int = 0
+        self.failures: int = 0
+        self.healthy: bool = True
+        self.retry_at: float = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+class OllamaEndpointPool(LoggerMixin):
+    """
+    Set of Ollama instances serving the same models, balanced by least
+    outstanding requests.
+
+    An endpoint that cannot be reached is taken out of rotation for
+    ``health_check_interval`` seconds, after which it gets a trial request
+    again. In long-running processes, ``start_health_checks`` also probes
+    every endpoint on that interval so that recovered instances come back
+    without a trial request.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        urls: Sequence[str],
+        health_check_interval: float = 30.0,
+        load_timeout: float = 300.0,
+    ) -> None:
+        """
+        Args:
+            name (str): Pool name used in logs, e.g. "generation".
+            urls (Sequence[str]): Base URLs of the Ollama instances.
+            health_check_interval (float): Seconds between health checks, and
+                before an unreachable endpoint is tried again.
+            load_timeout (float): Seconds a ``preload`` request may take.
+        """
+        if not urls:
+            raise ConfigError(f"Ollama {name} pool needs at least one endpoint")
+        self.name: str = name
+        self.endpoints: List[OllamaEndpoint] = [OllamaEndpoint(url) for url in urls]
+        self.health_check_interval: float = health_check_interval
+        self.load_timeout: float = load_timeout
+        self._lock = threading.Lock()
+        self._health_task: Optional["asyncio.Task[None]"] = None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], name: str) -> "OllamaEndpointPool":
+        """
+        Create the ``generation`` or ``embedding`` pool from the application
+        configuration. The embedding pool uses the generation endpoints
+        unless ``ollama_embedding_endpoints`` is set.
+        """
+        urls: List[str] = config["ollama_endpoints"]
+        if name == "embedding" and config.get("ollama_embedding_endpoints"):
+            urls = config["ollama_embedding_endpoints"]
+        return cls(
+            name,
+            urls,
+            config.get("ollama_health_check_interval", 30.0),
+            config.get("ollama_load_timeout", 300.0),
+        )
+
+    @property
+    def urls(self) -> List[str]:
+        return [endpoint.url for endpoint in self.endpoints]
+
+    def acquire(self, exclude: Sequence[OllamaEndpoint] = ()) -> OllamaEndpoint:
+        """
+        Pick the available endpoint with the fewest requests in flight and
+        count a request against it; ``release`` it when the request is done.
+
+        Unhealthy endpoints are only picked once their retry time has come, or
+        when no endpoint is available at all.
+        """
+        with self._lock:
+            now = time.monotonic()
+            candidates = [
+                endpoint for endpoint in self.endpoints if endpoint not in exclude
+            ] or self.endpoints
+            available = [
+                endpoint
+                for endpoint in candidates
+                if endpoint.healthy or endpoint.retry_at <= now
+            ] or candidates
+            endpoint = min(
+                available,
+                key=lambda endpoint: (endpoint.outstanding, endpoint.requests),
+            )
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def release(
+        self, endpoint: OllamaEndpoint, error: Optional[BaseException] = None
+    ) -> None:
+        """Finish a request, taking the endpoint out of rotation if it was unreachable."""
+        with self._lock:
+            endpoint.outstanding -= 1
+        if error is None:
+            self._mark(endpoint, healthy=True)
+        elif is_connection_error(error):
+            self._mark(endpoint, healthy=False, error=error)
+
+    def call(self, request: Callable[[str], T]) -> T:
+        """
+        Run ``request`` with an endpoint's base URL, failing over to the other
+        endpoints while they cannot be reached.
+        """
+        tried: List[OllamaEndpoint] = []
+        while True:
+            endpoint = self.acquire(exclude=tried)
+            try:
+                result = request(endpoint.url)
+            except BaseException as e:
+                self.release(endpoint, e)
+                tried.append(endpoint)
+                if not self.should_fail_over(e, len(tried)):
+                    raise
+                continue
+            self.release(endpoint)
+            return result
+
+    def should_fail_over(self, error: BaseException, attempts: int) -> bool:
+        """Whether a request that failed on ``attempts`` endpoints should try another."""
+        return attempts < len(self.endpoints) and is_connection_error(error)
+
+    async def check_health(self, http_client: HTTPClient) -> None:
+        """Probe every endpoint and update its health."""
+        session = await http_client.get_session()
+
+        async def probe(endpoint: OllamaEndpoint) -> None:
+            try:
+                async with session.get(
+                    f"{endpoint.url}/api/tags", timeout=aiohttp.ClientTimeout(total=5)
+                ) as response:
+                    response.raise_for_status()
+            except Exception as e:
+                self._mark(endpoint, healthy=False, error=e)
+            else:
+                self._mark(endpoint, healthy=True)
+
+        await asyncio.gather(*(probe(endpoint) for endpoint in self.endpoints))
+
+    async def preload(
+        self,
+        http_client: HTTPClient,
+        model: str,
+        keep_alive: Optional[str] = None,
+        embedding: bool = False,
+    ) -> Dict[str, float]:
+        """
+        Load ``model`` into memory on every endpoint, so that the first real
+        request does not wait for it. Empty requests make Ollama load a model
+        without generating anything. A cold load of a large model can take
+        far longer than the shared session's timeout, so these requests are
+        bounded by ``load_timeout`` instead.
+
+        Returns:
+            dict: Seconds each endpoint took to respond, by URL. Endpoints that
+            failed are left out.
+        """
+        session = await http_client.get_session()
+        if embedding:
+            path, payload = "/api/embeddings", {"model": model, "prompt": ""}
+        else:
+            path, payload = "/api/generate", {"model": model, "stream": False}
+        if keep_alive:
+            payload["keep_alive"] = keep_alive
+        timeout = aiohttp.ClientTimeout(total=self.load_timeout)
+
+        async def load(endpoint: OllamaEndpoint) -> Optional[float]:
+            start_time = time.monotonic()
+            try:
+                async with session.post(
+                    endpoint.url + path, json=payload, timeout=timeout
+                ) as response:
+                    response.raise_for_status()
+                    await response.read()
+            except Exception as e:
+                self.logger.warning(
+                    "Ollama model preload failed",
+                    pool=self.name,
+                    url=endpoint.url,
+                    model=model,
+                    error=str(e),
+                )
+                return None
+            return time.monotonic() - start_time
+
+        seconds = await asyncio.gather(*(load(endpoint) for endpoint in self.endpoints))
+        loaded = {
+            endpoint.url: elapsed
+            for endpoint, elapsed in zip(self.endpoints, seconds)
+            if elapsed is not None
+        }
+        self.logger.info(
+            "Ollama model preloaded", pool=self.name, model=model, seconds=loaded
+        )
+        return loaded
+
+    def start_health_checks(self, http_client: HTTPClient) -> None:
+        """Probe the endpoints every ``health_check_interval`` seconds until stopped."""
+        if self._health_task is not None or len(self.endpoints) < 2:
+            return
+
+        async def run() -> None:
+            while True:
+                await self.check_health(http_client)
+                await asyncio.sleep(self.health_check_interval)
+
+        self._health_task = asyncio.create_task(run())
+
+    async def stop_health_checks(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Return the load and health of each endpoint."""
+        return [endpoint.stats() for endpoint in self.endpoints]
+
+    def log_stats(self) -> None:
+        self.logger.info("Ollama pool stats", pool=self.name, endpoints=self.stats())
+
+    def _mark(
+        self,
+        endpoint: OllamaEndpoint,
+        healthy: bool,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        with self._lock:
+            was_healthy = endpoint.healthy
+            endpoint.healthy = healthy
+            if not healthy:
+                endpoint.failures += 1
+                endpoint.retry_at = time.monotonic() + self.health_check_interval
+        if was_healthy and not healthy:
+            self.logger.warning(
+                "Ollama endpoint unavailable",
+                pool=self.name,
+                url=endpoint.url,
+                error=str(error),
+                retry_in=self.health_check_interval,
+            )
+        elif healthy and not was_healthy:
+            self.logger.info(
+                "Ollama endpoint recovered", pool=self.name, url=endpoint.url
+            )
+
+
+class PooledOllama(Ollama):
+    """
+    Ollama LLM sending each generation to the least loaded endpoint of a pool.
+
+    A request that cannot reach its endpoint is retried on the next one as
+    long as nothing has been streamed back yet. Its identifying parameters
+    are those of ``Ollama``, so the endpoints do not affect cache keys.
+    """
+
+    pool: Any = None  # OllamaEndpointPool
+
+    def _create_stream(
+        self,
+        api_url: str,
+        payload: Any,
+        stop: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> Iterator[str]:
+        path = api_url[len(self.base_url) :]
+        tried: List[OllamaEndpoint] = []
+        while True:
+            endpoint = self.pool.acquire(exclude=tried)
+            streamed = False
+            try:
+                for line in super()._create_stream(
+                    endpoint.url + path, payload, stop, **kwargs
+                ):
+                    streamed = True
+                    yield line
+            except BaseException as e:
+                self.pool.release(endpoint, e)
+                tried.append(endpoint)
+                if streamed or not self.pool.should_fail_over(e, len(tried)):
+                    raise
+                continue
+            self.pool.release(endpoint)
+            return
+
+    async def _acreate_stream(  # type: ignore[override]
+        self,
+        api_url: str,
+        payload: Any,
+        stop: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> Any:
+        path = api_url[len(self.base_url) :]
+        tried: List[OllamaEndpoint] = []
+        while True:
+            endpoint = self.pool.acquire(exclude=tried)
+            streamed = False
+            try:
+                async for line in super()._acreate_stream(
+                    endpoint.url + path, payload, stop, **kwargs
+                ):
+                    streamed = True
+                    yield line
+            except BaseException as e:
+                self.pool.release(endpoint, e)
+                tried.append(endpoint)
+                if streamed or not self.pool.should_fail_over(e, len(tried)):
+                    raise
+                continue
+            self.pool.release(endpoint)
+            return
+
+
+class PooledEmbeddings(Embeddings):
+    """
+    Embeddings spread over a pool of Ollama endpoints: each call goes to the
+    least loaded one, through that endpoint's own embeddings client.
+    """
+
+    def __init__(
+        self, clients: Dict[str, Embeddings], pool: OllamaEndpointPool
+    ) -> None:
+        """
+        Args:
+            clients (Dict[str, Embeddings]): Embeddings client per endpoint URL.
+            pool (OllamaEndpointPool): Pool choosing the endpoint of each call.
+        """
+        self.clients: Dict[str, Embeddings] = clients
+        self.pool: OllamaEndpointPool = pool
+
+    @classmethod
+    def create(cls, model: str, pool: OllamaEndpointPool) -> "PooledEmbeddings":
+        """Create Ollama embeddings of ``model`` on every endpoint of ``pool``."""
+        from langchain_community.embeddings import OllamaEmbeddings
+
+        return cls(
+            {url: OllamaEmbeddings(model=model, base_url=url) for url in pool.urls},
+            pool,
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.pool.call(lambda url: self.clients[url].embed_documents(texts))
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        # OllamaEmbeddings has no native async API; keep the event loop free.
+        return await asyncio.to_thread(self.embed_documents, texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.pool.call(lambda url: self.clients[url].embed_query(text))
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await asyncio.to_thread(self.embed_query, text)
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from logging_config import LoggerMixin
+
+Fetch = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class SearchCache(LoggerMixin):
+    """
+    TTL + LRU cache of search results keyed by normalised query.
+
+    Concurrent lookups of the same query are coalesced so that only one
+    fetch is in flight per key. The cache can be persisted to a JSON file and
+    reloaded on the next run.
+    """
+
+    def __init__(
+        self, ttl: float = 3600, max_entries: int = 1000, path: Optional[str] = None
+    ) -> None:
+        """
+        Args:
+            ttl (float): Seconds a cached result stays valid (0 = never expires).
+            max_entries (int): Maximum number of cached results (0 = unbounded).
+            path (Optional[str]): JSON file the cache is persisted to, if any.
+        """
+        self.ttl: float = ttl
+        self.max_entries: int = max_entries
+        self.path: Optional[str] = path
+        self.hits: int = 0
+        self.misses: int = 0
+        self.coalesced: int = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+        if self.path:
+            self.load()
+
+    @classmethod
+    def from_config(
+        cls, config: Dict[str, Any], root_dir: str = ""
+    ) -> Optional["SearchCache"]:
+        """Create a cache from the application configuration, or None if disabled."""
+        if not config.get("search_cache_enabled", True):
+            return None
+        path: Optional[str] = config.get("search_cache_path") or None
+        if path and root_dir:
+            path = os.path.join(root_dir, path)
+        return cls(
+            ttl=config.get("search_cache_ttl", 3600),
+            max_entries=config.get("search_cache_max_entries", 1000),
+            path=path,
+        )
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Return the cache key of a query: case-folded with whitespace collapsed."""
+        return " ".join(query.split()).casefold()
+
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result of a query, or None if missing or expired."""
+        key = self.normalize_query(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at and expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, query: str, value: Dict[str, Any]) -> None:
+        """Cache the result of a query, evicting the least recently used entries."""
+        key = self.normalize_query(query)
+        expires_at = time.time() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while self.max_entries and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def get_or_fetch(self, query: str, fetch: Fetch) -> Dict[str, Any]:
+        """
+        Return the cached result of a query, calling ``fetch`` on a miss.
+
+        Callers asking for a query that is already being fetched wait for
+        that fetch instead of starting their own. Failed fetches are not
+        cached and their error is raised to every waiting caller.
+        """
+        key = self.normalize_query(query)
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            self.misses += 1
+            inflight = asyncio.ensure_future(fetch())
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda future: self._on_fetched(key, future))
+        else:
+            self.coalesced += 1
+            self.logger.debug("Search request coalesced", query=key)
+        # Shield the shared fetch so one cancelled caller does not cancel it
+        # for everyone else waiting on it.
+        return await asyncio.shield(inflight)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of entries, hits, misses and coalesced requests."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+    def load(self) -> None:
+        """Load unexpired entries from the cache file, if it exists."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as file:
+                data: Dict[str, Any] = json.load(file)
+        except (OSError, ValueError) as e:
+            self.logger.warning(
+                "Search cache file unreadable, starting empty",
+                path=self.path,
+                error=str(e),
+            )
+            return
+        now = time.time()
+        with self._lock:
+            for key, (expires_at, value) in data.get("entries", {}).items():
+                if not expires_at or expires_at >= now:
+                    self._entries[key] = (expires_at, value)
+        self.logger.info(
+            "Search cache loaded", path=self.path, entries=len(self._entries)
+        )
+
+    def save(self) -> None:
+        """Write the cache to its file, replacing the previous copy atomically."""
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                "entries": {key: list(entry) for key, entry in self._entries.items()}
+            }
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp-{uuid.uuid4().hex}"
+        with open(tmp_path, "w") as file:
+            json.dump(data, file)
+        os.replace(tmp_path, self.path)
+        self.logger.info("Search cache saved", path=self.path, **self.stats())
+
+    def _on_fetched(self, key: str, future: "asyncio.Future[Dict[str, Any]]") -> None:
+        self._inflight.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self.put(key, future.result())
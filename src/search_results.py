@@ -0,0 +1,140 @@
+import json
+from typing import Any, Dict, List, Set
+
+RESULT_FORMATS = ("compact", "full")
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the number of LLM tokens in ``text`` (about 4 chars each)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def project_search_results(
+    results: Dict[str, Any], max_results: int = 5
+) -> Dict[str, Any]:
+    """
+    Keep only the parts of a Serper payload an agent uses.
+
+    Returns:
+        Dict[str, Any]: The answer box (if any) and the top ``max_results``
+        organic hits with their title, snippet and link.
+    """
+    projected: Dict[str, Any] = {}
+    answer_box: Dict[str, Any] = results.get("answerBox") or {}
+    answer: str = answer_box.get("answer") or answer_box.get("snippet") or ""
+    if answer:
+        projected["answer"] = {"text": answer, "link": answer_box.get("link", "")}
+    projected["organic"] = [
+        {
+            "title": hit.get("title", ""),
+            "snippet": hit.get("snippet", ""),
+            "link": hit.get("link", ""),
+        }
+        for hit in (results.get("organic") or [])[:max_results]
+    ]
+    return projected
+
+
+def format_compact(projected: Dict[str, Any], max_tokens: int = 800) -> str:
+    """
+    Serialise projected results as short plain-text lines within a token budget.
+
+    Hits are added in rank order until the next one would exceed
+    ``max_tokens``. The output is cut at the budget if even the first block
+    does not fit.
+    """
+    blocks: List[str] = []
+    if "answer" in projected:
+        answer = projected["answer"]
+        blocks.append(f"Answer: {answer['text']} ({answer['link']})".strip())
+    for rank, hit in enumerate(projected["organic"], start=1):
+        blocks.append(f"{rank}. {hit['title']}\n{hit['snippet']}\n{hit['link']}")
+    if not blocks:
+        return "No results found."
+
+    text = ""
+    for block in blocks:
+        candidate = f"{text}\n\n{block}" if text else block
+        if estimate_tokens(candidate) > max_tokens:
+            break
+        text = candidate
+    return text or blocks[0][: max_tokens * CHARS_PER_TOKEN]
+
+
+def merge_search_results(
+    results_by_query: Dict[str, Dict[str, Any]], max_results: int = 5
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Project the results of several queries, dropping organic hits whose link
+    already appeared under an earlier query.
+    """
+    seen_links: Set[str] = set()
+    merged: Dict[str, Dict[str, Any]] = {}
+    for query, results in results_by_query.items():
+        projected = project_search_results(results, max_results)
+        unique_hits: List[Dict[str, str]] = []
+        for hit in projected["organic"]:
+            link = hit["link"].rstrip("/")
+            if link and link in seen_links:
+                continue
+            seen_links.add(link)
+            unique_hits.append(hit)
+        projected["organic"] = unique_hits
+        merged[query] = projected
+    return merged
+
+
+def format_search_results(
+    results: Dict[str, Any],
+    result_format: str = "compact",
+    max_results: int = 5,
+    max_tokens: int = 800,
+) -> str:
+    """
+    Turn a Serper payload into the text handed to the agent.
+
+    Args:
+        results (Dict[str, Any]): Raw Serper response.
+        result_format (str): "compact" for the projected, budgeted text or
+            "full" for the whole payload as indented JSON.
+        max_results (int): Number of organic hits kept in compact mode.
+        max_tokens (int): Approximate token budget of the compact output.
+    """
+    if result_format not in RESULT_FORMATS:
+        raise ValueError(f"result_format must be one of {RESULT_FORMATS}")
+    if result_format == "full":
+        return json.dumps(results, indent=2)
+    return format_compact(project_search_results(results, max_results), max_tokens)
+
+
+def format_multi_search_results(
+    results_by_query: Dict[str, Dict[str, Any]],
+    result_format: str = "compact",
+    max_results: int = 5,
+    max_tokens: int = 800,
+) -> str:
+    """
+    Turn the Serper payloads of several queries into one observation.
+
+    In compact mode each query gets its own section of merged, deduplicated
+    hits, the sections sharing ``max_tokens`` equally; in full mode the raw
+    payloads are dumped as JSON keyed by query.
+    """
+    if result_format not in RESULT_FORMATS:
+        raise ValueError(f"result_format must be one of {RESULT_FORMATS}")
+    if result_format == "full":
+        return json.dumps(results_by_query, indent=2)
+    merged = merge_search_results(results_by_query, max_results)
+    separator = "\n\n"
+    # Characters of each section, so that the sections and the separators
+    # between them add up to at most ``max_tokens``.
+    section_chars = (
+        max_tokens * CHARS_PER_TOKEN - len(separator) * (len(merged) - 1)
+    ) // max(len(merged), 1)
+    sections: List[str] = []
+    for query, projected in merged.items():
+        header = f"Query: {query}\n"
+        body_tokens = max(0, (section_chars - len(header)) // CHARS_PER_TOKEN)
+        sections.append(header + format_compact(projected, body_tokens))
+    return separator.join(sections)
@@ -1,25 +1,56 @@
-from typing import Dict, Any, Union
+from typing import Dict, Any, List, Optional, Union
 from langchain.tools import Tool
-from logging_config import setup_logging
+from logging_config import setup_logging, get_logger
 from exceptions import SearchToolError
-from error_handling import async_retry, RetryExhaustedError
+from error_handling import (
+    async_retry,
+    caused_by_open_circuit,
+    with_semaphore,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    RetryExhaustedError,
+)
+from http_client import HTTPClient
+from search_cache import SearchCache
+from limiter import LimiterRegistry
+from search_results import format_multi_search_results, format_search_results
 import aiohttp
 import asyncio
 import json
 
-logger = setup_logging()
+setup_logging()
+logger = get_logger(__name__)
+
+SEARCH_UNAVAILABLE = (
+    "Search is temporarily unavailable. "
+    "Continue with the information you already have."
+)
 
 
 class SearchTool:
-    def __init__(self, config: Dict[str, Any], serper_api_key: str):
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        serper_api_key: str,
+        http_client: Optional[HTTPClient] = None,
+        search_cache: Optional[SearchCache] = None,
+        limiters: Optional[LimiterRegistry] = None,
+        breakers: Optional[CircuitBreakerRegistry] = None,
+    ):
         self.config = config
         self.serper_api_key = serper_api_key
+        self.http_client = http_client or HTTPClient.from_config(config)
+        self.search_cache = search_cache
+        self.limiters = limiters or LimiterRegistry.from_config(config)
+        self.breakers = breakers or CircuitBreakerRegistry.from_config(config)
+        self.semaphore = asyncio.Semaphore(config.get("search_max_concurrency", 4))
 
     async def create_search_tool(self) -> Tool:
         @async_retry(
             max_retries=3,
             base_delay=1.0,
             exceptions=(aiohttp.ClientError, asyncio.TimeoutError, SearchToolError),
+            deadline=90.0,
         )
         async def search_function(*args: Any, **kwargs: Any) -> str:
             logger.debug(f"Search function called with args: {args}, kwargs: {kwargs}")
@@ -45,6 +76,9 @@ class SearchTool:
                     f"Search result: {result[:self.config['search_result_limit']]}..."
                 )
                 return result
+            except CircuitOpenError as e:
+                logger.warning(f"Search skipped, circuit open: {e}")
+                return SEARCH_UNAVAILABLE
             except RetryExhaustedError as e:
                 logger.error(f"Retry attempts exhausted for search query: {e}")
                 raise SearchToolError(
@@ -62,33 +96,184 @@ class SearchTool:
             description="Search the internet for current information. Input should be a string containing the search query.",
         )
 
+    async def create_multi_search_tool(self) -> Tool:
+        async def multi_search_function(*args: Any, **kwargs: Any) -> str:
+            logger.debug(
+                f"Multi search function called with args: {args}, kwargs: {kwargs}"
+            )
+            raw_queries: Any = args[0] if args else kwargs.get("queries", "")
+            try:
+                return await self.async_multi_search(self.parse_queries(raw_queries))
+            except SearchToolError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in multi search function: {e}")
+                raise SearchToolError(
+                    f"An error occurred while processing the search queries: {str(e)}"
+                )
+
+        return Tool(
+            name="Multi Search",
+            func=multi_search_function,
+            description="Run several internet searches at once and get their combined results. Input should be the search queries separated by newlines or semicolons.",
+        )
+
+    @staticmethod
+    def parse_queries(raw_queries: Any) -> List[str]:
+        """Split tool input (a list, a JSON list, or newline/semicolon-separated text) into queries."""
+        if isinstance(raw_queries, dict):
+            raw_queries = raw_queries.get("queries", raw_queries.get("query", ""))
+        if isinstance(raw_queries, str):
+            text = raw_queries.strip()
+            if text.startswith("["):
+                try:
+                    raw_queries = json.loads(text)
+                except ValueError:
+                    raw_queries = [text]
+            else:
+                raw_queries = text.replace(";", "\n").split("\n")
+        return [str(query).strip() for query in raw_queries if str(query).strip()]
+
+    async def async_search(self, query: str) -> str:
+        return self.process_search_results(await self._search_results(query))
+
+    async def async_multi_search(self, queries: List[str]) -> str:
+        """
+        Run several queries concurrently and return their merged results.
+
+        Queries that only differ in case or whitespace are sent once, at most
+        ``search_max_concurrency`` requests are in flight, and organic hits
+        already listed under an earlier query are dropped.
+        """
+        unique_queries: Dict[str, str] = {}
+        for query in queries:
+            unique_queries.setdefault(SearchCache.normalize_query(query), query)
+        if not unique_queries:
+            raise SearchToolError("No search queries given.")
+
+        outcomes = await asyncio.gather(
+            *(
+                with_semaphore(self.semaphore, self._search_results, query)
+                for query in unique_queries.values()
+            ),
+            return_exceptions=True,
+        )
+        results_by_query: Dict[str, Dict[str, Any]] = {}
+        failed: List[str] = []
+        unavailable: List[str] = []
+        for query, outcome in zip(unique_queries.values(), outcomes):
+            if isinstance(outcome, BaseException) and caused_by_open_circuit(outcome):
+                # As in single search: not an error, Serper is being left alone.
+                logger.warning(f"Search skipped for query '{query}', circuit open")
+                unavailable.append(query)
+            elif isinstance(outcome, BaseException):
+                logger.error(f"Search failed for query '{query}': {outcome}")
+                failed.append(query)
+            else:
+                results_by_query[query] = outcome
+        if not results_by_query and unavailable:
+            return SEARCH_UNAVAILABLE
+        if not results_by_query:
+            raise SearchToolError(
+                "Failed to complete any of the searches. Please try again later."
+            )
+        logger.info(
+            f"Multi search completed: {len(queries)} queries, "
+            f"{len(unique_queries)} unique, {len(failed)} failed, "
+            f"{len(unavailable)} skipped"
+        )
+
+        formatted_results = format_multi_search_results(
+            results_by_query,
+            self.config.get("search_result_format", "compact"),
+            self.config.get("search_result_max_results", 5),
+            self.config.get("search_result_max_tokens", 800),
+        )
+        if unavailable:
+            formatted_results += "\n\nSearch temporarily unavailable for: " + "; ".join(
+                unavailable
+            )
+        if failed:
+            formatted_results += "\n\nSearch failed for: " + "; ".join(failed)
+        return formatted_results
+
+    async def _search_results(self, query: str) -> Dict[str, Any]:
+        if self.search_cache is None:
+            return await self._guarded_fetch_results(query)
+        return await self.search_cache.get_or_fetch(
+            query, lambda: self._guarded_fetch_results(query)
+        )
+
+    async def _guarded_fetch_results(self, query: str) -> Dict[str, Any]:
+        # Cache hits skip the breaker; only calls that reach Serper count.
+        results: Dict[str, Any] = await self.breakers.get("serper").call(
+            self._fetch_results, query
+        )
+        return results
+
     @async_retry(
         max_retries=3,
         base_delay=1.0,
         exceptions=(aiohttp.ClientError, asyncio.TimeoutError),
+        deadline=60.0,
     )
-    async def async_search(self, query: str) -> str:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                "https://google.serper.dev/search",
-                headers={"X-API-KEY": self.serper_api_key},
-                params={"q": query},
-                timeout=30,
-            ) as response:
-                response.raise_for_status()
-                search_results = await response.json()
-                return self.process_search_results(search_results)
+    async def _fetch_results(self, query: str) -> Dict[str, Any]:
+        session = await self.http_client.get_session()
+        async with self.limiters.get("serper"), session.get(
+            "https://google.serper.dev/search",
+            headers={"X-API-KEY": self.serper_api_key},
+            params={"q": query},
+            timeout=30,
+        ) as response:
+            response.raise_for_status()
+            search_results: Dict[str, Any] = await response.json()
+            return search_results
 
     def process_search_results(self, results: Dict[str, Any]) -> str:
         try:
-            # Implement your logic to process and format search results
-            formatted_results = json.dumps(results, indent=2)
+            formatted_results = format_search_results(
+                results,
+                self.config.get("search_result_format", "compact"),
+                self.config.get("search_result_max_results", 5),
+                self.config.get("search_result_max_tokens", 800),
+            )
+            logger.debug(
+                f"Search results formatted: {len(json.dumps(results))} chars in, "
+                f"{len(formatted_results)} chars out"
+            )
             return formatted_results
         except Exception as e:
             logger.error(f"Error processing search results: {e}")
             raise SearchToolError(f"Error processing search results: {str(e)}")
 
 
-async def create_search_tool(config: Dict[str, Any], serper_api_key: str) -> Tool:
-    search_tool = SearchTool(config, serper_api_key)
+async def create_search_tool(
+    config: Dict[str, Any],
+    serper_api_key: str,
+    http_client: Optional[HTTPClient] = None,
+    search_cache: Optional[SearchCache] = None,
+    limiters: Optional[LimiterRegistry] = None,
+    breakers: Optional[CircuitBreakerRegistry] = None,
+) -> Tool:
+    search_tool = SearchTool(
+        config, serper_api_key, http_client, search_cache, limiters, breakers
+    )
     return await search_tool.create_search_tool()
+
+
+async def create_search_tools(
+    config: Dict[str, Any],
+    serper_api_key: str,
+    http_client: Optional[HTTPClient] = None,
+    search_cache: Optional[SearchCache] = None,
+    limiters: Optional[LimiterRegistry] = None,
+    breakers: Optional[CircuitBreakerRegistry] = None,
+) -> List[Tool]:
+    """Create the single-query and multi-query search tools sharing one SearchTool."""
+    search_tool = SearchTool(
+        config, serper_api_key, http_client, search_cache, limiters, breakers
+    )
+    return [
+        await search_tool.create_search_tool(),
+        await search_tool.create_multi_search_tool(),
+    ]
@@ -1,26 +1,62 @@
 import aiohttp
 import asyncio
-from typing import Dict, Any, List
+import hashlib
+import os
+import time
+import uuid
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
 from langchain.tools import tool
-from langchain.text_splitter import CharacterTextSplitter
-from langchain_community.embeddings import OllamaEmbeddings
-from langchain_community.vectorstores import FAISS
-from sec_api import QueryApi
-from unstructured.partition.html import partition_html
-from logging_config import setup_logging
+from langchain_core.embeddings import Embeddings
+from logging_config import setup_logging, get_logger
 from exceptions import SECToolsError, FilingNotFoundError, EmbeddingSearchError
-from error_handling import async_retry, with_semaphore, RetryExhaustedError
+from error_handling import (
+    async_retry,
+    with_semaphore,
+    caused_by_open_circuit,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    RetryExhaustedError,
+)
+from index_store import FilingIndexStore
+from http_client import HTTPClient
+from filing_processor import FilingProcessor
+from filing_store import FilingStore
+from limiter import LimiterRegistry
+from utils import get_project_root
 
-logger = setup_logging()
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import FAISS
+
+setup_logging()
+logger = get_logger(__name__)
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+EDGAR_SUBMISSIONS_URL = "https://data.sec.gov/submissions/CIK{cik:0>10}.json"
+EDGAR_ARCHIVES_URL = "https://www.sec.gov/Archives/edgar/data/{cik}/{folder}/{document}"
 
 
 class SECTools:
-    def __init__(self, config: Dict[str, Any], sec_api_key: str):
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        sec_api_key: str,
+        index_store: Optional[FilingIndexStore] = None,
+        http_client: Optional[HTTPClient] = None,
+        embeddings: Optional[Embeddings] = None,
+        filing_processor: Optional[FilingProcessor] = None,
+        filing_store: Optional[FilingStore] = None,
+        limiters: Optional[LimiterRegistry] = None,
+        breakers: Optional[CircuitBreakerRegistry] = None,
+    ):
         self.config = config
         self.sec_api_key = sec_api_key
-        self.semaphore = asyncio.Semaphore(
-            self.config.get("max_concurrent_requests", 5)
-        )
+        self.index_store = index_store
+        self.http_client = http_client or HTTPClient.from_config(config)
+        self.embeddings = embeddings
+        self.filing_processor = filing_processor or FilingProcessor.from_config(config)
+        self.filing_store = filing_store
+        self.limiters = limiters or LimiterRegistry.from_config(config)
+        self.breakers = breakers or CircuitBreakerRegistry.from_config(config)
 
     @tool("Search 10-Q form")
     async def search_10q(self, query: str) -> str:
@@ -38,6 +74,7 @@ class SECTools:
         max_retries=3,
         base_delay=1.0,
         exceptions=(aiohttp.ClientError, asyncio.TimeoutError, SECToolsError),
+        deadline=180.0,
     )
     async def _search_filing(self, query: str, form_type: str) -> str:
         try:
@@ -49,68 +86,277 @@ class SECTools:
             )
 
         try:
-            async with aiohttp.ClientSession() as session:
-                queryApi = QueryApi(api_key=self.sec_api_key)
-                query: Dict[str, Any] = {
-                    "query": {
-                        "query_string": {
-                            "query": f'ticker:{stock} AND formType:"{form_type}"'
-                        }
-                    },
-                    "from": "0",
-                    "size": "1",
-                    "sort": [{"filedAt": {"order": "desc"}}],
-                }
-
-                filings = await with_semaphore(
-                    self.semaphore, queryApi.get_filings_async, query, session=session
+            filing: Optional[Dict[str, Any]] = await self._latest_filing(
+                stock, form_type
+            )
+            if filing is None:
+                logger.warning(f"No {form_type} filings found for stock: {stock}")
+                raise FilingNotFoundError(
+                    f"No {form_type} filings found for stock: {stock}"
                 )
-                if not filings["filings"]:
-                    logger.warning(f"No {form_type} filings found for stock: {stock}")
-                    raise FilingNotFoundError(
-                        f"No {form_type} filings found for stock: {stock}"
-                    )
 
-                link: str = filings["filings"][0]["linkToFilingDetails"]
-                answer: str = await self.__embedding_search(link, ask)
-                logger.info(f"{form_type} search completed for stock: {stock}")
-                return answer
+            answer: str = await self.__embedding_search(
+                filing["url"], ask, filing["accession"]
+            )
+            logger.info(f"{form_type} search completed for stock: {stock}")
+            return answer
         except FilingNotFoundError:
             return f"Sorry, I couldn't find any {form_type} filing for this stock. Please check if the ticker is correct."
         except RetryExhaustedError as e:
+            if caused_by_open_circuit(e):
+                return self._unavailable_answer(form_type, e)
             logger.error(f"Retry attempts exhausted for {form_type} search: {e}")
             raise SECToolsError(
                 f"Failed to complete {form_type} search after multiple attempts. Please try again later."
             )
         except Exception as e:
+            if caused_by_open_circuit(e):
+                return self._unavailable_answer(form_type, e)
             logger.error(f"Error in {form_type} search: {e}")
             raise SECToolsError(f"Error in {form_type} search: {str(e)}")
 
+    def _unavailable_answer(self, form_type: str, error: Exception) -> str:
+        logger.warning(f"{form_type} search skipped, circuit open: {error}")
+        return f"The SEC filing search is temporarily unavailable, so no {form_type} data could be retrieved. Continue with the information you already have."
+
+    async def sync_filings(
+        self, tickers: List[str], form_types: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Bring the local filing mirror up to date for a watchlist of tickers.
+
+        Checks the latest filing of every ticker and form type regardless of
+        the freshness TTL and downloads any filing not mirrored yet.
+
+        Returns:
+            List[Dict[str, Any]]: One summary per ticker and form type.
+        """
+
+        async def sync_one(stock: str, form_type: str) -> Dict[str, Any]:
+            summary: Dict[str, Any] = {"ticker": stock, "form_type": form_type}
+            try:
+                filing = await self._latest_filing(stock, form_type, max_age=0)
+                if filing is None:
+                    summary["status"] = "not_found"
+                    return summary
+                summary["accession"] = filing["accession"]
+                summary["filed_at"] = filing["filed_at"]
+                summary["path"] = await self.__download_filing(
+                    filing["url"], filing["accession"]
+                )
+                summary["status"] = "synced"
+            except Exception as e:
+                logger.error(f"Failed to sync {form_type} for {stock}: {e}")
+                summary["status"] = "failed"
+                summary["error"] = str(e)
+            return summary
+
+        return list(
+            await asyncio.gather(
+                *(
+                    sync_one(stock.strip().upper(), form_type)
+                    for stock in tickers
+                    for form_type in form_types
+                )
+            )
+        )
+
+    async def _latest_filing(
+        self, stock: str, form_type: str, max_age: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the latest filing of a form type for a stock.
+
+        With a filing store, the mirrored metadata is used as long as it was
+        checked less than ``max_age`` seconds ago (``filing_freshness_ttl`` by
+        default). Older entries are revalidated with a conditional request to
+        the EDGAR submissions feed, falling back to a sec-api query when the
+        company's CIK is not known yet or EDGAR cannot be reached.
+        """
+        if self.filing_store is None:
+            return await self._query_latest_filing(stock, form_type)
+
+        store = self.filing_store
+        if max_age is None:
+            max_age = self.config.get("filing_freshness_ttl", 21_600)
+        cached: Optional[Dict[str, Any]] = await asyncio.to_thread(
+            store.latest, stock, form_type
+        )
+        checked_at: Optional[float] = await asyncio.to_thread(
+            store.last_checked, stock, form_type
+        )
+        if cached and checked_at and time.time() - checked_at < max_age:
+            logger.debug(f"Using mirrored {form_type} filing for stock: {stock}")
+            return cached
+
+        filing: Optional[Dict[str, Any]] = None
+        checked = False
+        if cached and cached.get("cik"):
+            try:
+                filing = await self._check_edgar_latest(cached["cik"], form_type)
+                checked = True
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                logger.warning(f"EDGAR freshness check failed for {stock}: {e}")
+        if not checked:
+            try:
+                filing = await self._query_latest_filing(stock, form_type)
+            except CircuitOpenError:
+                if cached is None:
+                    raise
+                logger.warning(
+                    f"sec-api unavailable, using mirrored {form_type} filing for {stock}"
+                )
+                return cached
+
+        if filing is not None:
+            await asyncio.to_thread(
+                store.upsert_filing,
+                stock,
+                form_type,
+                filing["accession"],
+                filing["filed_at"],
+                filing["url"],
+                filing.get("cik"),
+            )
+        await asyncio.to_thread(store.mark_checked, stock, form_type)
+        latest: Optional[Dict[str, Any]] = await asyncio.to_thread(
+            store.latest, stock, form_type
+        )
+        return latest
+
+    async def _query_latest_filing(
+        self, stock: str, form_type: str
+    ) -> Optional[Dict[str, Any]]:
+        query: Dict[str, Any] = {
+            "query": {
+                "query_string": {"query": f'ticker:{stock} AND formType:"{form_type}"'}
+            },
+            "from": "0",
+            "size": "1",
+            "sort": [{"filedAt": {"order": "desc"}}],
+        }
+        filings = await self.breakers.get("sec_api").call(
+            with_semaphore, self.limiters.get("sec_api"), self._query_filings, query
+        )
+        if not filings["filings"]:
+            return None
+        filing: Dict[str, Any] = filings["filings"][0]
+        return {
+            "accession": filing["accessionNo"],
+            "filed_at": filing["filedAt"],
+            "url": filing["linkToFilingDetails"],
+            "cik": str(filing["cik"]) if filing.get("cik") else None,
+        }
+
+    async def _query_filings(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        # sec_api's QueryApi is synchronous, so post to its endpoint over the
+        # shared session instead of blocking the event loop.
+        from sec_api import QueryApi
+
+        queryApi = QueryApi(api_key=self.sec_api_key)
+        session = await self.http_client.get_session()
+        async with session.post(queryApi.api_endpoint, json=query) as response:
+            response.raise_for_status()
+            result: Dict[str, Any] = await response.json()
+            return result
+
+    async def _check_edgar_latest(
+        self, cik: str, form_type: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find the latest filing of a form type in the EDGAR submissions feed.
+
+        The feed is requested conditionally with the validators stored from
+        the previous check of the same form type, so an unchanged feed costs
+        a bodyless 304.
+
+        Returns:
+            Optional[Dict[str, Any]]: The latest filing, or None if the feed is
+            unchanged or lists no filing of that form type.
+        """
+        assert self.filing_store is not None
+        url: str = EDGAR_SUBMISSIONS_URL.format(cik=cik)
+        headers: Dict[str, str] = await self._conditional_headers(url, form_type)
+        session = await self.http_client.get_session()
+        async with self.limiters.get("edgar"):
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304:
+                    logger.debug(f"EDGAR submissions unchanged for CIK {cik}")
+                    return None
+                response.raise_for_status()
+                submissions: Dict[str, Any] = await response.json()
+                await asyncio.to_thread(
+                    self.filing_store.set_validators,
+                    url,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    form_type,
+                )
+
+        recent: Dict[str, List[str]] = submissions["filings"]["recent"]
+        for index, form in enumerate(recent["form"]):
+            if form == form_type:
+                accession: str = recent["accessionNumber"][index]
+                return {
+                    "accession": accession,
+                    "filed_at": recent["filingDate"][index],
+                    "url": EDGAR_ARCHIVES_URL.format(
+                        cik=int(cik),
+                        folder=accession.replace("-", ""),
+                        document=recent["primaryDocument"][index],
+                    ),
+                    "cik": cik,
+                }
+        return None
+
+    async def _conditional_headers(self, url: str, scope: str = "") -> Dict[str, str]:
+        headers: Dict[str, str] = {
+            "User-Agent": self.config.get("sec_user_agent", DEFAULT_USER_AGENT)
+        }
+        if self.filing_store is not None:
+            etag, last_modified = await asyncio.to_thread(
+                self.filing_store.get_validators, url, scope
+            )
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        return headers
+
     @async_retry(
         max_retries=3,
         base_delay=1.0,
         exceptions=(aiohttp.ClientError, asyncio.TimeoutError, EmbeddingSearchError),
     )
-    async def __embedding_search(self, url: str, ask: str) -> str:
+    async def __embedding_search(
+        self, url: str, ask: str, filing_id: Optional[str] = None
+    ) -> str:
         logger.debug(f"Performing embedding search for URL: {url}")
         try:
-            text: str = await self.__download_form_html(url)
-            elements: List[Any] = partition_html(text=text)
-            content: str = "\n".join([str(el) for el in elements])
-            text_splitter: CharacterTextSplitter = CharacterTextSplitter(
-                separator="\n",
-                chunk_size=self.config["embedding_chunk_size"],
-                chunk_overlap=self.config["embedding_chunk_overlap"],
-                length_function=len,
-                is_separator_regex=False,
-            )
-            docs: List[Any] = text_splitter.create_documents([content])
+            embeddings: Embeddings = self.embeddings or self._default_embeddings()
 
-            embeddings: OllamaEmbeddings = OllamaEmbeddings(
-                model=self.config["embedding_model"]
-            )
+            index_key: Optional[str] = None
+            vectorstore: Optional["FAISS"] = None
+            if self.index_store is not None:
+                index_key = self.index_store.make_key(
+                    filing_id or url,
+                    self.config["embedding_model"],
+                    self.config["embedding_chunk_size"],
+                    self.config["embedding_chunk_overlap"],
+                    self.filing_processor.extractor,
+                )
+                vectorstore = await asyncio.to_thread(
+                    self.index_store.get, index_key, embeddings
+                )
+
+            if vectorstore is None:
+                vectorstore = await self.__build_index(url, embeddings, filing_id)
+                if self.index_store is not None and index_key is not None:
+                    await asyncio.to_thread(
+                        self.index_store.put, index_key, vectorstore, url
+                    )
 
-            retriever: Any = FAISS.from_documents(docs, embeddings).as_retriever()
+            retriever: Any = vectorstore.as_retriever()
 
             answers: List[Any] = await retriever.aget_relevant_documents(ask, top_k=4)
             answer: str = "\n\n".join([a.page_content for a in answers])
@@ -120,19 +366,97 @@ class SECTools:
             logger.error(f"Error in embedding search: {e}")
             raise EmbeddingSearchError(f"Error in embedding search: {str(e)}")
 
+    def _default_embeddings(self) -> Embeddings:
+        # Imported here because langchain_community is slow to import.
+        from langchain_community.embeddings import OllamaEmbeddings
+
+        return OllamaEmbeddings(model=self.config["embedding_model"])
+
+    async def __build_index(
+        self, url: str, embeddings: Embeddings, filing_id: Optional[str] = None
+    ) -> "FAISS":
+        # Imported here because langchain_community and faiss are slow to import.
+        from langchain_community.vectorstores import FAISS
+
+        path: str = await self.__download_filing(url, filing_id)
+        chunks: List[str] = await self.filing_processor.split_file(
+            path,
+            self.config["embedding_chunk_size"],
+            self.config["embedding_chunk_overlap"],
+        )
+        return await FAISS.afrom_texts(chunks, embeddings)
+
     @async_retry(
         max_retries=3,
         base_delay=1.0,
         exceptions=(aiohttp.ClientError, asyncio.TimeoutError),
+        deadline=120.0,
     )
-    async def __download_form_html(self, url: str) -> str:
-        logger.debug(f"Downloading HTML from URL: {url}")
-        headers: Dict[str, str] = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
+    async def __download_filing(self, url: str, filing_id: Optional[str] = None) -> str:
+        """
+        Stream a filing to the local filing cache and return the file path.
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, timeout=30) as response:
-                response.raise_for_status()
-                logger.debug(f"HTML download completed, status code: {response.status}")
-                return await response.text()
+        Filings already in the filing store's mirror are returned without
+        touching the network; a leftover local copy is revalidated with a
+        conditional request.
+        """
+        if self.filing_store is not None and filing_id:
+            mirrored: Optional[str] = await asyncio.to_thread(
+                self.filing_store.local_path, filing_id
+            )
+            if mirrored is not None:
+                logger.debug(f"Using mirrored filing: {mirrored}")
+                return mirrored
+            path: str = self.filing_store.path_for(filing_id)
+            headers: Dict[str, str] = await self._conditional_headers(url)
+            if not os.path.exists(path):
+                headers = {"User-Agent": headers["User-Agent"]}
+        else:
+            filing_dir: str = os.path.join(
+                get_project_root(),
+                self.config.get("filing_cache_dir", ".cache/filings"),
+            )
+            os.makedirs(filing_dir, exist_ok=True)
+            path = os.path.join(
+                filing_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".html"
+            )
+            headers = {
+                "User-Agent": self.config.get("sec_user_agent", DEFAULT_USER_AGENT)
+            }
+
+        logger.debug(f"Downloading HTML from URL: {url}")
+        tmp_path: str = f"{path}.part-{uuid.uuid4().hex}"
+        session = await self.http_client.get_session()
+        try:
+            async with self.limiters.get("edgar"), session.get(
+                url, headers=headers, timeout=30
+            ) as response:
+                if response.status == 304:
+                    logger.debug(f"Local filing copy still current: {path}")
+                else:
+                    response.raise_for_status()
+                    # Write the body to disk chunk by chunk so that memory stays
+                    # bounded by the chunk size rather than the filing size.
+                    with open(tmp_path, "wb") as file:
+                        async for chunk in response.content.iter_chunked(
+                            self.config.get("filing_download_chunk_size", 65_536)
+                        ):
+                            file.write(chunk)
+                    logger.debug(
+                        f"HTML download completed, status code: {response.status}"
+                    )
+                    os.replace(tmp_path, path)
+                if self.filing_store is not None and filing_id:
+                    await asyncio.to_thread(
+                        self.filing_store.set_validators,
+                        url,
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                    )
+                    await asyncio.to_thread(
+                        self.filing_store.set_local_path, filing_id, path
+                    )
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return path
@@ -0,0 +1,105 @@
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+from exceptions import BaseError
+
+# Packages that take seconds to import and must only be loaded when a crew
+# actually needs them.
+HEAVY_MODULES = (
+    "crewai",
+    "langchain",
+    "langchain_core",
+    "langchain_community",
+    "faiss",
+    "unstructured",
+    "sec_api",
+)
+DEFAULT_STARTUP_BUDGET_MS = 1000.0
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """
+    Parse the stderr of ``python -X importtime``.
+
+    Returns:
+        List[Dict[str, Any]]: One entry per imported module, in import order,
+        with its self and cumulative time in microseconds and nesting depth.
+    """
+    rows: List[Dict[str, Any]] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        rows.append(
+            {
+                "module": module,
+                "self_us": int(fields[0]),
+                "cumulative_us": int(fields[1]),
+                "depth": (len(name) - len(module) - 1) // 2,
+            }
+        )
+    return rows
+
+
+def profile_imports(
+    module: str = "main", python: Optional[str] = None, cwd: str = SRC_DIR
+) -> List[Dict[str, Any]]:
+    """Import ``module`` in a fresh interpreter under ``-X importtime`` and parse the timings."""
+    completed = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise BaseError(
+            f"Importing {module} failed: {completed.stderr.strip().splitlines()[-1:]}"
+        )
+    return parse_importtime(completed.stderr)
+
+
+def total_import_ms(rows: List[Dict[str, Any]], module: str = "main") -> float:
+    """Cumulative import time of the top-level ``module`` in milliseconds."""
+    for row in reversed(rows):
+        if row["module"] == module and row["depth"] == 0:
+            return float(row["cumulative_us"]) / 1000
+    return 0.0
+
+
+def heavy_imports(rows: List[Dict[str, Any]]) -> List[str]:
+    """Return the heavy packages from ``HEAVY_MODULES`` that were imported."""
+    imported = {row["module"].split(".")[0] for row in rows}
+    return [name for name in HEAVY_MODULES if name in imported]
+
+
+def format_import_profile(
+    rows: List[Dict[str, Any]],
+    module: str = "main",
+    top: int = 25,
+    budget_ms: float = DEFAULT_STARTUP_BUDGET_MS,
+) -> str:
+    """Render the ``top`` slowest imports by cumulative time, plus a budget summary."""
+    lines = [f"{'self ms':>9} {'cumul ms':>9}  module"]
+    for row in sorted(rows, key=lambda row: row["cumulative_us"], reverse=True)[:top]:
+        lines.append(
+            f"{row['self_us'] / 1000:9.1f} {row['cumulative_us'] / 1000:9.1f}  "
+            f"{'  ' * row['depth']}{row['module']}"
+        )
+    total_ms = total_import_ms(rows, module)
+    status = "within" if total_ms <= budget_ms else "OVER"
+    lines.append("")
+    lines.append(
+        f"import {module}: {total_ms:.1f} ms ({status} the {budget_ms:.0f} ms budget), "
+        f"{len(rows)} modules"
+    )
+    heavy = heavy_imports(rows)
+    lines.append(
+        "heavy modules loaded at startup: " + (", ".join(heavy) if heavy else "none")
+    )
+    return "\n".join(lines)
@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Mapping, Sequence, Tuple, TypeVar
+from exceptions import InvalidConfigError
+
+Node = TypeVar("Node", bound=Hashable)
+
+
+def task_id(task_config: Dict[str, Any]) -> str:
+    """Id a task is referred to by in ``depends_on``: its ``name``, else its agent."""
+    return str(task_config.get("name") or task_config.get("agent"))
+
+
+def build_task_graph(
+    task_configs: Sequence[Dict[str, Any]]
+) -> "OrderedDict[str, List[str]]":
+    """
+    Build the dependency graph of a crew's tasks from their ``depends_on`` lists.
+
+    Returns:
+        OrderedDict: Task id -> ids of the tasks it depends on, in YAML order.
+
+    Raises:
+        InvalidConfigError: On duplicate task ids, unknown dependencies or cycles.
+    """
+    graph: "OrderedDict[str, List[str]]" = OrderedDict()
+    for task_config in task_configs:
+        node = task_id(task_config)
+        if node in graph:
+            raise InvalidConfigError(
+                f"Duplicate task id '{node}'; give tasks sharing an agent a 'name'"
+            )
+        depends_on = task_config.get("depends_on") or []
+        if isinstance(depends_on, str):
+            depends_on = [depends_on]
+        graph[node] = [str(dependency) for dependency in depends_on]
+    for node, dependencies in graph.items():
+        for dependency in dependencies:
+            if dependency not in graph:
+                raise InvalidConfigError(
+                    f"Task '{node}' depends on unknown task '{dependency}'"
+                )
+    topological_order(graph)
+    return graph
+
+
+def topological_order(graph: Mapping[Node, Sequence[Node]]) -> List[Node]:
+    """
+    Order the nodes so that every node comes after its dependencies, keeping
+    the original order where the graph allows it.
+
+    Raises:
+        InvalidConfigError: If the graph has a cycle.
+    """
+    order: List[Node] = []
+    state: Dict[Node, str] = {}
+
+    def visit(node: Node, path: List[Node]) -> None:
+        if state.get(node) == "done":
+            return
+        if state.get(node) == "visiting":
+            cycle = path[path.index(node) :] + [node]
+            raise InvalidConfigError(
+                "Task dependencies form a cycle: " + " -> ".join(map(str, cycle))
+            )
+        state[node] = "visiting"
+        for dependency in graph[node]:
+            visit(dependency, path + [node])
+        state[node] = "done"
+        order.append(node)
+
+    for node in graph:
+        visit(node, [])
+    return order
+
+
+def sink_nodes(graph: Mapping[Node, Sequence[Node]]) -> List[Node]:
+    """Return the nodes no other node depends on, in graph order."""
+    upstream = {
+        dependency for dependencies in graph.values() for dependency in dependencies
+    }
+    return [node for node in graph if node not in upstream]
+
+
+def critical_path(
+    graph: Mapping[Node, Sequence[Node]], durations: Mapping[Node, float]
+) -> Tuple[float, List[Node]]:
+    """
+    Find the longest chain of dependent nodes by total duration.
+
+    Returns:
+        tuple: The chain's total duration and its nodes, upstream first.
+    """
+    finish: Dict[Node, float] = {}
+    previous: Dict[Node, Any] = {}
+    for node in topological_order(graph):
+        start = 0.0
+        previous[node] = None
+        for dependency in graph[node]:
+            if finish[dependency] > start:
+                start = finish[dependency]
+                previous[node] = dependency
+        finish[node] = start + durations.get(node, 0.0)
+    if not finish:
+        return 0.0, []
+    node = max(finish, key=lambda key: finish[key])
+    total = finish[node]
+    path: List[Node] = []
+    while node is not None:
+        path.append(node)
+        node = previous[node]
+    return total, path[::-1]
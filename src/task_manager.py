@@ -1,7 +1,9 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from crewai import Task, Agent
 from logging_config import LoggerMixin, log_execution_time
-from exceptions import TaskCreationError
+from exceptions import InvalidConfigError, TaskCreationError
+from llm_cache import set_cache_inputs
+from task_graph import build_task_graph
 
 
 class TaskManager(LoggerMixin):
@@ -10,14 +12,29 @@ class TaskManager(LoggerMixin):
 
     @log_execution_time(logger=None)
     async def create_tasks(
-        self, crew_config: Dict[str, Any], agents: Dict[str, Agent]
+        self,
+        crew_config: Dict[str, Any],
+        agents: Dict[str, Agent],
+        variables: Optional[Dict[str, str]] = None,
     ) -> List[Task]:
-        """Create tasks based on the crew configuration."""
+        """Create tasks based on the crew configuration.
+
+        When ``variables`` is not given, the task variables are prompted for
+        interactively.
+        """
         tasks: List[Task] = []
 
-        variable: Dict[str, str] = await self.get_task_variables(
-            crew_config["tasks"][0]["description"]
-        )
+        if variables is not None:
+            variable: Dict[str, str] = variables
+        elif crew_config["tasks"]:
+            variable = await self.get_task_variables(
+                crew_config["tasks"][0]["description"]
+            )
+        else:
+            variable = {}
+        # The crew's LLM calls run in this context; keep semantic cache hits
+        # to completions made for the same variables.
+        set_cache_inputs(variable)
 
         for task_config in crew_config["tasks"]:
             try:
@@ -39,9 +56,26 @@ class TaskManager(LoggerMixin):
                 self.logger.error("Failed to create task", error=str(e))
                 raise TaskCreationError(f"Failed to create task: {e}")
 
+        if any("depends_on" in task_config for task_config in crew_config["tasks"]):
+            self._link_dependencies(crew_config["tasks"], tasks)
+
         self.logger.info("All tasks created", task_count=len(tasks))
         return tasks
 
+    def _link_dependencies(
+        self, task_configs: List[Dict[str, Any]], tasks: List[Task]
+    ) -> None:
+        """Give each task the tasks it ``depends_on`` as context."""
+        try:
+            graph = build_task_graph(task_configs)
+        except InvalidConfigError as e:
+            self.logger.error("Invalid task dependencies", error=str(e))
+            raise TaskCreationError(f"Invalid task dependencies: {e}")
+        tasks_by_id: Dict[str, Task] = dict(zip(graph, tasks))
+        for task, dependencies in zip(tasks, graph.values()):
+            task.context = [tasks_by_id[dependency] for dependency in dependencies]
+        self.logger.info("Task dependencies linked", graph=dict(graph))
+
     async def get_task_variables(self, first_task_description: str) -> Dict[str, str]:
         """Get variables needed for task descriptions."""
         if "company_name" in first_task_description:
@@ -2,11 +2,12 @@ import os
 import yaml
 from typing import Dict, Any, Tuple, List
 from dotenv import load_dotenv
-from logging_config import setup_logging
+from logging_config import setup_logging, get_logger
 from exceptions import ConfigError, FileNotFoundError, APIKeyError
 
 # Set up logging
-logger = setup_logging()
+setup_logging()
+logger = get_logger(__name__)
 
 
 def load_yaml_config(file_path: str) -> Dict[str, Any]:
@@ -1,7 +1,7 @@
 # tests/unit/test_agent_manager.py
 
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, call, patch
 from src.agent_manager import AgentManager
 from src.exceptions import AgentCreationError
 
@@ -9,10 +9,10 @@ from src.exceptions import AgentCreationError
 @pytest.fixture
 def agent_manager():
     mock_config = {"default_llm_model": "test_model"}
-    mock_ollama_llm = Mock()
+    mock_llm_pool = Mock()
     mock_search_tool = Mock()
     mock_sec_tools = Mock()
-    return AgentManager(mock_config, mock_ollama_llm, mock_search_tool, mock_sec_tools)
+    return AgentManager(mock_config, mock_llm_pool, mock_search_tool, mock_sec_tools)
 
 
 @pytest.mark.asyncio
@@ -151,3 +151,30 @@ async def test_create_agents_agent_creation_failure(agent_manager):
             await agent_manager.create_agents(mock_crew_config)
 
         assert "Failed to create agent problematic_agent" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_create_agents_resolves_llm_per_agent(agent_manager):
+    mock_crew_config = {
+        "llm_model": "llama3:latest",
+        "llm_params": {"temperature": 0.7},
+        "llm_cache": False,
+        "agents": {
+            "detector": {
+                "role": "Detector",
+                "goal": "Detect",
+                "backstory": "Linguist",
+                "llm_model": "qwen2:0.5b",
+                "llm_params": {"temperature": 0},
+            },
+            "writer": {"role": "Writer", "goal": "Write", "backstory": "Writer"},
+        },
+    }
+
+    with patch("src.agent_manager.Agent"):
+        await agent_manager.create_agents(mock_crew_config)
+
+    assert agent_manager.llm_pool.get.call_args_list == [
+        call("qwen2:0.5b", {"temperature": 0}, cache=False),
+        call("llama3:latest", {"temperature": 0.7}, cache=False),
+    ]
@@ -0,0 +1,115 @@
+# tests/unit/test_batch_runner.py
+
+import asyncio
+import json
+import pytest
+from src.batch_runner import (
+    BatchRunner,
+    load_batch_inputs,
+    load_completed_rows,
+    truncate_partial_line,
+)
+
+
+def read_records(path):
+    with open(path) as file:
+        return [json.loads(line) for line in file]
+
+
+def test_load_batch_inputs_csv(tmp_path):
+    input_path = tmp_path / "tickers.csv"
+    input_path.write_text("company_name\nApple\n Microsoft \n")
+
+    assert load_batch_inputs(str(input_path)) == [
+        {"company_name": "Apple"},
+        {"company_name": "Microsoft"},
+    ]
+
+
+def test_load_batch_inputs_jsonl(tmp_path):
+    input_path = tmp_path / "prompts.jsonl"
+    input_path.write_text('{"ai_prompt": "a"}\n\n{"ai_prompt": "b"}\n')
+
+    assert load_batch_inputs(str(input_path)) == [
+        {"ai_prompt": "a"},
+        {"ai_prompt": "b"},
+    ]
+
+
+def test_load_batch_inputs_unsupported_format(tmp_path):
+    input_path = tmp_path / "tickers.txt"
+    input_path.write_text("Apple\n")
+
+    # batch_runner raises the top-level ``exceptions.InvalidConfigError``, which
+    # is a different class object from ``src.exceptions.InvalidConfigError``.
+    with pytest.raises(Exception, match="Unsupported batch input format"):
+        load_batch_inputs(str(input_path))
+
+
+@pytest.mark.asyncio
+async def test_run_writes_results_and_respects_worker_limit(tmp_path):
+    input_path = tmp_path / "tickers.csv"
+    input_path.write_text("company_name\n" + "\n".join(f"C{i}" for i in range(6)))
+    output_path = tmp_path / "results.jsonl"
+    running = 0
+    peak = 0
+
+    async def run_job(variables):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if variables["company_name"] == "C3":
+            raise RuntimeError("boom")
+        return f"report for {variables['company_name']}"
+
+    summary = await BatchRunner(run_job, max_workers=2).run(
+        str(input_path), str(output_path)
+    )
+
+    assert summary == {"succeeded": 5, "failed": 1, "skipped": 0}
+    assert peak == 2
+    records = {r["row"]: r for r in read_records(output_path)}
+    assert records[0]["result"] == "report for C0"
+    assert records[3]["status"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_run_resumes_from_completed_rows(tmp_path):
+    input_path = tmp_path / "tickers.csv"
+    input_path.write_text("company_name\nA\nB\nC\n")
+    output_path = tmp_path / "results.jsonl"
+    output_path.write_text(
+        json.dumps({"row": 0, "status": "success", "result": "done"})
+        + "\n"
+        + json.dumps({"row": 1, "status": "error", "error": "boom"})
+        + "\n"
+        + '{"row": 2, "sta'
+    )
+    calls = []
+
+    async def run_job(variables):
+        calls.append(variables["company_name"])
+        return "ok"
+
+    assert load_completed_rows(str(output_path)) == {0}
+    summary = await BatchRunner(run_job).run(str(input_path), str(output_path))
+
+    assert sorted(calls) == ["B", "C"]
+    assert summary["skipped"] == 1
+    # Every line parses and each row succeeded exactly once.
+    records = read_records(output_path)
+    successes = [record["row"] for record in records if record["status"] == "success"]
+    assert sorted(successes) == [0, 1, 2]
+
+
+def test_truncate_partial_line(tmp_path):
+    output_path = tmp_path / "results.jsonl"
+    output_path.write_text('{"row": 0}\n{"row": 1')
+    truncate_partial_line(str(output_path))
+    assert output_path.read_text() == '{"row": 0}\n'
+
+    output_path.write_text('{"row": 0')
+    truncate_partial_line(str(output_path))
+    assert output_path.read_text() == ""
@@ -0,0 +1,52 @@
+# tests/unit/test_crew_events.py
+
+import asyncio
+from types import SimpleNamespace
+from src.crew_events import (
+    EventStream,
+    emit,
+    emit_agent_step,
+    event_scope,
+    render_event,
+    streaming,
+)
+
+
+async def test_events_reach_the_stream_from_worker_threads():
+    stream = EventStream()
+
+    def work():
+        emit("token", text="hi")
+        action = SimpleNamespace(tool="search", tool_input="AAPL 10-K")
+        emit_agent_step([SimpleNamespace(action=action, observation="x" * 1000)])
+
+    with stream.bind():
+        with event_scope(task=1, agent="analyst"):
+            await asyncio.to_thread(work)
+    stream.close()
+    events = [event async for event in stream]
+
+    assert [event["type"] for event in events] == ["token", "tool_call"]
+    assert all(event["task"] == 1 and event["agent"] == "analyst" for event in events)
+    assert events[1]["tool"] == "search"
+    assert len(events[1]["observation"]) == 500
+
+
+def test_emit_without_stream_is_a_no_op():
+    assert not streaming()
+    emit("token", text="nobody listens")
+    emit_agent_step([(SimpleNamespace(tool="search", tool_input=""), "")])
+
+
+def test_render_event():
+    assert render_event({"type": "token", "text": "Hel"}) == "Hel"
+    assert "=== Task 2: writer ===" in render_event(
+        {"type": "task_started", "task": 1, "agent": "writer"}
+    )
+    assert "[search] AAPL" in render_event(
+        {"type": "tool_call", "tool": "search", "tool_input": "AAPL"}
+    )
+    assert "Crew's work result:\nreport" in render_event(
+        {"type": "crew_finished", "result": "report"}
+    )
+    assert render_event({"type": "error", "error": "boom"}) == ""
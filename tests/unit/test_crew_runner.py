@@ -1,8 +1,11 @@
 # tests/unit/test_crew_runner.py
 
+import time
 import pytest
 from unittest.mock import Mock, patch
-from src.crew_runner import CrewRunner
+
+# ``emit`` as crew_runner sees it: the top-level ``crew_events`` module.
+from src.crew_runner import CrewRunner, emit
 from src.exceptions import CrewExecutionError
 
 
@@ -96,3 +99,118 @@ async def test_run_crew_empty_tasks(crew_runner):
         MockCrew.assert_called_once_with(
             agents=list(mock_agents.values()), tasks=[], verbose=2, process=mock_process
         )
+
+
+def make_dag_task(role, context=None):
+    task = Mock()
+    task.agent = Mock(role=role)
+    task.context = context or []
+    return task
+
+
+@pytest.mark.asyncio
+async def test_run_crew_dag_runs_independent_tasks_concurrently(crew_runner):
+    detect = make_dag_task("detector")
+    analyze = make_dag_task("analyzer")
+    fill = make_dag_task("writer", [detect, analyze])
+    review = make_dag_task("reviewer", [fill])
+    started = []
+    running = 0
+    peak = 0
+
+    def one_task_crew(agents, tasks, verbose, process, **kwargs):
+        def kickoff():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            started.append(tasks[0].agent.role)
+            time.sleep(0.05)
+            running -= 1
+            return f"{tasks[0].agent.role} output"
+
+        return Mock(kickoff=kickoff)
+
+    with patch("src.crew_runner.Crew", side_effect=one_task_crew):
+        result = await crew_runner.run_crew({}, [review, fill, detect, analyze], "dag")
+
+    assert result == "reviewer output"
+    assert peak == 2
+    assert set(started[:2]) == {"detector", "analyzer"}
+    assert started[2:] == ["writer", "reviewer"]
+
+
+@pytest.mark.asyncio
+async def test_run_crew_dag_failure_raises(crew_runner):
+    first = make_dag_task("first")
+    second = make_dag_task("second", [first])
+
+    with patch("src.crew_runner.Crew") as MockCrew:
+        MockCrew.return_value.kickoff.side_effect = Exception("boom")
+
+        # crew_runner raises the top-level ``exceptions.CrewExecutionError``.
+        with pytest.raises(Exception, match="Error during crew execution: boom"):
+            await crew_runner.run_crew({}, [first, second], "dag")
+
+        assert MockCrew.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_crew_yields_task_tool_and_token_events(crew_runner):
+    first = make_dag_task("researcher")
+    second = make_dag_task("writer")
+    processes = []
+
+    def sequential_crew(agents, tasks, verbose, process, step_callback, task_callback):
+        processes.append(process)
+
+        def kickoff():
+            for task in tasks:
+                role = task.agent.role
+                action = Mock(tool="search", tool_input=f"{role} query")
+                step_callback([(action, "found it")])
+                emit("token", text=f"{role} says hi")
+                task_callback(Mock(raw_output=f"{role} output"))
+            return f"{tasks[-1].agent.role} output"
+
+        return Mock(kickoff=kickoff)
+
+    with patch("src.crew_runner.Crew", side_effect=sequential_crew):
+        events = [
+            event
+            async for event in crew_runner.stream_crew(
+                {}, [first, second], "sequential"
+            )
+        ]
+
+    assert [(event["type"], event.get("task")) for event in events] == [
+        ("crew_started", None),
+        ("task_started", 0),
+        ("tool_call", 0),
+        ("token", 0),
+        ("task_finished", 0),
+        ("task_started", 1),
+        ("tool_call", 1),
+        ("token", 1),
+        ("task_finished", 1),
+        ("crew_finished", None),
+    ]
+    assert events[2]["tool_input"] == "researcher query"
+    assert events[4]["output"] == "researcher output"
+    assert events[-1]["result"] == "writer output"
+    # Sequential crews keep running as one crew, with their tasks untouched.
+    assert processes == ["sequential"]
+    assert second.context == []
+
+
+@pytest.mark.asyncio
+async def test_stream_crew_reports_errors(crew_runner):
+    with patch("src.crew_runner.Crew") as MockCrew:
+        MockCrew.return_value.kickoff.side_effect = Exception("boom")
+        events = []
+
+        with pytest.raises(Exception, match="Error during crew execution: boom"):
+            async for event in crew_runner.stream_crew({}, [make_dag_task("a")], "dag"):
+                events.append(event)
+
+    assert events[-1]["type"] == "error"
+    assert "boom" in events[-1]["error"]
@@ -0,0 +1,153 @@
+# tests/unit/test_crew_server.py
+
+import asyncio
+import json
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from src.crew_server import CrewJobManager, CrewServer
+
+
+async def wait_for(manager, job_id, status):
+    for _ in range(200):
+        if manager.get(job_id)["status"] == status:
+            return manager.get(job_id)
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {status}")
+
+
+async def test_jobs_run_concurrently_up_to_limit():
+    running = 0
+    peak = 0
+
+    async def run_crew(crew, variables):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        return f"{crew}:{variables['company_name']}"
+
+    manager = CrewJobManager(run_crew, max_concurrency=2)
+    await manager.start()
+    jobs = [manager.submit("crew.yaml", {"company_name": f"c{i}"}) for i in range(5)]
+
+    assert manager.stats()["queue_depth"] == 5
+    results = [await wait_for(manager, job["id"], "success") for job in jobs]
+    await manager.stop()
+
+    assert peak == 2
+    assert [job["result"] for job in results] == [f"crew.yaml:c{i}" for i in range(5)]
+
+
+async def test_failed_job_records_error_and_old_jobs_are_forgotten():
+    async def run_crew(crew, variables):
+        raise ValueError("boom")
+
+    manager = CrewJobManager(run_crew, max_concurrency=1, max_finished_jobs=1)
+    await manager.start()
+    first = manager.submit("crew.yaml")
+    second = manager.submit("crew.yaml")
+    failed = await wait_for(manager, second["id"], "error")
+    await manager.stop()
+
+    assert failed["error"] == "ValueError: boom"
+    assert first["id"] not in manager.jobs
+
+
+async def test_submit_rejects_when_queue_is_full():
+    manager = CrewJobManager(lambda crew, variables: asyncio.sleep(0), max_queue_size=1)
+    manager.submit("crew.yaml")
+
+    with pytest.raises(Exception, match="Job queue is full"):
+        manager.submit("crew.yaml")
+
+
+async def test_http_api():
+    async def run_crew(crew, variables):
+        return "report"
+
+    manager = CrewJobManager(run_crew)
+    server = CrewServer(manager, lambda: ["crew.yaml"])
+    async with TestClient(TestServer(server.create_app())) as client:
+        response = await client.post(
+            "/jobs", json={"crew": "crew.yaml", "variables": {"company_name": "Apple"}}
+        )
+        assert response.status == 202
+        job = await response.json()
+        await wait_for(manager, job["id"], "success")
+
+        response = await client.get(f"/jobs/{job['id']}")
+        assert (await response.json())["result"] == "report"
+
+        response = await client.get("/jobs")
+        body = await response.json()
+        assert body["queue_depth"] == 0
+        assert body["jobs"][0]["variables"] == {"company_name": "Apple"}
+
+        assert (await client.post("/jobs", json={"crew": "nope.yaml"})).status == 404
+        assert (await client.post("/jobs", json={"variables": {}})).status == 400
+        assert (await client.get("/jobs/missing")).status == 404
+
+
+async def test_job_events_are_streamed_as_ndjson():
+    release = asyncio.Event()
+
+    async def stream_crew(crew, variables):
+        yield {"type": "task_started", "task": 0}
+        yield {"type": "token", "text": "Hel"}
+        await release.wait()
+        yield {"type": "token", "text": "lo"}
+        yield {"type": "crew_finished", "result": "Hello"}
+
+    manager = CrewJobManager(None, stream_crew=stream_crew)
+    server = CrewServer(manager, lambda: ["crew.yaml"])
+    async with TestClient(TestServer(server.create_app())) as client:
+        job = await (await client.post("/jobs", json={"crew": "crew.yaml"})).json()
+        await wait_for(manager, job["id"], "running")
+
+        response = await client.get(f"/jobs/{job['id']}/events")
+        assert response.headers["Content-Type"] == "application/x-ndjson"
+        first = json.loads(await response.content.readline())
+        assert first == {"type": "task_started", "task": 0}
+        release.set()
+        rest = [json.loads(line) async for line in response.content]
+        assert [event["type"] for event in rest] == ["token", "token", "crew_finished"]
+
+        assert (await wait_for(manager, job["id"], "success"))["result"] == "Hello"
+        # Once the job is done, only the non-token events are replayed.
+        response = await client.get(f"/jobs/{job['id']}/events")
+        replayed = [json.loads(line) for line in (await response.text()).splitlines()]
+        assert [event["type"] for event in replayed] == [
+            "task_started",
+            "crew_finished",
+        ]
+        assert (await client.get("/jobs/missing/events")).status == 404
+
+
+async def test_token_events_buffered_for_late_subscribers_are_capped():
+    release = asyncio.Event()
+
+    async def stream_crew(crew, variables):
+        yield {"type": "task_started", "task": 0}
+        for index in range(5):
+            yield {"type": "token", "text": str(index)}
+        yield {"type": "tool_call", "tool": "search"}
+        await release.wait()
+        yield {"type": "crew_finished", "result": "done"}
+
+    manager = CrewJobManager(None, stream_crew=stream_crew, max_buffered_tokens=2)
+    await manager.start()
+    job = manager.submit("crew.yaml")
+    while len(manager._events[job["id"]]) < 4:
+        await asyncio.sleep(0.01)
+
+    events = manager.subscribe(job["id"])
+    release.set()
+    received = [event async for event in events]
+    await manager.stop()
+
+    assert [event.get("text") for event in received if event["type"] == "token"] == [
+        "0",
+        "1",
+    ]
+    assert [event["type"] for event in received][-2:] == ["tool_call", "crew_finished"]
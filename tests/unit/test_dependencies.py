@@ -0,0 +1,56 @@
+# tests/unit/test_dependencies.py
+
+import asyncio
+import threading
+import pytest
+from src.dependencies import Dependencies
+
+
+@pytest.mark.asyncio
+async def test_startup_hooks_run_once_at_startup():
+    dependencies = Dependencies()
+    calls = []
+    dependencies.on_startup(lambda: calls.append("sync"))
+
+    async def async_hook():
+        calls.append("async")
+
+    dependencies.on_startup(async_hook)
+    await dependencies.startup()
+    await dependencies.startup()
+
+    assert calls == ["sync", "async"]
+
+
+@pytest.mark.asyncio
+async def test_hooks_registered_after_startup_run_right_away():
+    dependencies = Dependencies()
+    await dependencies.startup()
+    calls = []
+
+    dependencies.on_startup(lambda: calls.append("late"))
+    # Components may also be built in worker threads, e.g. by asyncio.to_thread.
+    thread = threading.Thread(
+        target=dependencies.on_startup, args=(lambda: calls.append("thread"),)
+    )
+    thread.start()
+    thread.join()
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+    assert calls == ["late", "thread"]
+    await dependencies.aclose()
+
+
+@pytest.mark.asyncio
+async def test_aclose_drops_startup_hooks():
+    dependencies = Dependencies()
+    calls = []
+    dependencies.on_startup(lambda: calls.append("first"))
+    await dependencies.startup()
+    await dependencies.aclose()
+
+    dependencies.on_startup(lambda: calls.append("second"))
+    await dependencies.startup()
+
+    assert calls == ["first", "second"]
@@ -0,0 +1,60 @@
+# tests/unit/test_embedding_batcher.py
+
+import threading
+import time
+import pytest
+from langchain_core.embeddings import Embeddings
+from src.embedding_batcher import BatchedEmbeddings
+
+
+class RecordingEmbeddings(Embeddings):
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batches = []
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        with self.lock:
+            self.batches.append(list(texts))
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        return [[float(text)] for text in texts]
+
+    def embed_query(self, text):
+        return [float(text)]
+
+
+def test_embed_documents_batches_and_preserves_order():
+    inner = RecordingEmbeddings(delay=0.01)
+    batched = BatchedEmbeddings(inner, batch_size=3, max_concurrency=2)
+    texts = [str(i) for i in range(10)]
+
+    vectors = batched.embed_documents(texts)
+
+    assert vectors == [[float(i)] for i in range(10)]
+    assert sorted(len(batch) for batch in inner.batches) == [1, 3, 3, 3]
+    assert inner.peak <= 2
+    assert batched.throughput()["chunks"] == 10
+
+
+@pytest.mark.asyncio
+async def test_aembed_documents_bounds_concurrency():
+    inner = RecordingEmbeddings(delay=0.01)
+    batched = BatchedEmbeddings(inner, batch_size=2, max_concurrency=3)
+    texts = [str(i) for i in range(12)]
+
+    vectors = await batched.aembed_documents(texts)
+
+    assert vectors == [[float(i)] for i in range(12)]
+    assert len(inner.batches) == 6
+    assert inner.peak <= 3
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        BatchedEmbeddings(RecordingEmbeddings(), batch_size=0)
@@ -0,0 +1,66 @@
+# tests/unit/test_embedding_cache.py
+
+from typing import List
+from langchain_core.embeddings import Embeddings
+from src.embedding_cache import CachedEmbeddings, EmbeddingCache, hash_text
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.embedded: List[str] = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0]
+
+
+def test_only_unseen_chunks_are_embedded(tmp_path):
+    inner = CountingEmbeddings()
+    cached = CachedEmbeddings(
+        inner, EmbeddingCache(str(tmp_path / "cache.sqlite3")), "llama3"
+    )
+
+    first = cached.embed_documents(["boilerplate", "revenue"])
+    second = cached.embed_documents(["boilerplate", "net income", "boilerplate"])
+
+    assert inner.embedded == ["boilerplate", "revenue", "net income"]
+    assert first[0] == second[0] == second[2] == [11.0, 1.0]
+    assert cached.stats()["hits"] == 2
+    assert cached.stats()["misses"] == 3
+
+
+def test_cache_is_keyed_by_model(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"))
+    cache.put_many("llama3", [hash_text("a")], [[1.0, 2.0]])
+
+    assert cache.get_many("llama3", [hash_text("a")]) == {hash_text("a"): [1.0, 2.0]}
+    assert cache.get_many("llama2", [hash_text("a")]) == {}
+
+
+def test_cache_persists_and_warms_from_previous_run(tmp_path):
+    previous = EmbeddingCache(str(tmp_path / "previous.sqlite3"))
+    previous.put_many("llama3", [hash_text("a"), hash_text("b")], [[1.0], [2.0]])
+    previous.close()
+
+    cache = EmbeddingCache(str(tmp_path / "current.sqlite3"))
+    cache.put_many("llama3", [hash_text("a")], [[1.0]])
+
+    assert cache.warm_from(str(tmp_path / "previous.sqlite3")) == 1
+    assert len(cache) == 2
+    assert cache.warm_from(str(tmp_path / "missing.sqlite3")) == 0
+
+
+async def test_aembed_documents_uses_cache(tmp_path):
+    inner = CountingEmbeddings()
+    cached = CachedEmbeddings(
+        inner, EmbeddingCache(str(tmp_path / "cache.sqlite3")), "llama3"
+    )
+
+    await cached.aembed_documents(["a", "b"])
+    vectors = await cached.aembed_documents(["b", "c"])
+
+    assert inner.embedded == ["a", "b", "c"]
+    assert vectors == [[1.0, 1.0], [1.0, 1.0]]
@@ -0,0 +1,224 @@
+# tests/unit/test_error_handling.py
+
+import asyncio
+import aiohttp
+import pytest
+from multidict import CIMultiDict
+from yarl import URL
+from src.error_handling import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    RetryBudget,
+    RetryExhaustedError,
+    RetryPolicy,
+    async_retry,
+    retry_after_from_exception,
+)
+
+
+def http_error(status, headers=None):
+    url = URL("https://example.com")
+    request_info = aiohttp.RequestInfo(url, "GET", CIMultiDict(), url)
+    return aiohttp.ClientResponseError(
+        request_info, (), status=status, headers=CIMultiDict(headers or {})
+    )
+
+
+def test_full_jitter_stays_within_exponential_bound():
+    policy = RetryPolicy(base_delay=1.0, backoff_factor=2.0, jitter="full")
+
+    delays = [policy.next_delay(3, 0.0, ValueError()) for _ in range(200)]
+
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_decorrelated_jitter_grows_from_previous_delay():
+    policy = RetryPolicy(base_delay=1.0, max_delay=10.0, jitter="decorrelated")
+
+    delays = [policy.next_delay(2, 2.0, ValueError()) for _ in range(200)]
+
+    assert all(1.0 <= delay <= 6.0 for delay in delays)
+
+
+def test_retry_after_header_is_honoured():
+    policy = RetryPolicy(base_delay=0.01, jitter="none")
+    error = http_error(429, {"Retry-After": "7"})
+
+    assert retry_after_from_exception(error) == 7.0
+    assert policy.next_delay(1, 0.0, error) == 7.0
+    assert retry_after_from_exception(http_error(500)) is None
+
+
+def test_retries_then_succeeds():
+    calls = []
+
+    @async_retry(max_retries=3, base_delay=0.001, exceptions=(ValueError,))
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ValueError("boom")
+        return "ok"
+
+    assert asyncio.run(flaky()) == "ok"
+    assert len(calls) == 3
+
+
+def test_deadline_stops_retries():
+    calls = []
+
+    @async_retry(
+        max_retries=10,
+        base_delay=1.0,
+        jitter="none",
+        deadline=0.5,
+        exceptions=(ValueError,),
+    )
+    async def failing():
+        calls.append(1)
+        raise ValueError("boom")
+
+    with pytest.raises(RetryExhaustedError, match="deadline"):
+        asyncio.run(failing())
+    assert len(calls) == 1
+
+
+def test_nested_calls_share_the_outer_retries():
+    inner_calls = []
+
+    @async_retry(max_retries=3, base_delay=0.001, exceptions=(ValueError,))
+    async def inner():
+        inner_calls.append(1)
+        raise ValueError("boom")
+
+    @async_retry(max_retries=3, base_delay=0.001, exceptions=(RetryExhaustedError,))
+    async def outer():
+        return await inner()
+
+    with pytest.raises(RetryExhaustedError):
+        asyncio.run(outer())
+    # Independent retries would make 3 x 3 = 9 inner attempts.
+    assert len(inner_calls) == 3
+
+
+def test_retry_budget_caps_retry_ratio():
+    budget = RetryBudget(ratio=0.5, min_retries=0)
+    for _ in range(4):
+        budget.record_call()
+
+    assert [budget.try_acquire() for _ in range(3)] == [True, True, False]
+
+
+def test_exhausted_budget_stops_retries():
+    calls = []
+    policy = RetryPolicy(
+        max_attempts=5, base_delay=0.001, budget=RetryBudget(ratio=0, min_retries=0)
+    )
+
+    @async_retry(exceptions=(ValueError,), policy=policy)
+    async def failing():
+        calls.append(1)
+        raise ValueError("boom")
+
+    with pytest.raises(RetryExhaustedError, match="budget"):
+        asyncio.run(failing())
+    assert len(calls) == 1
+
+
+def make_breaker(**kwargs):
+    options = {"window": 60.0, "min_calls": 4, "cooldown": 0.05}
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+
+async def succeed():
+    return "ok"
+
+
+async def fail():
+    raise ValueError("down")
+
+
+def test_breaker_opens_at_failure_rate_and_fails_fast():
+    breaker = make_breaker()
+
+    async def run():
+        await breaker.call(succeed)
+        await breaker.call(succeed)
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await breaker.call(fail)
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(succeed)
+
+    asyncio.run(run())
+
+    assert breaker.metrics() == {
+        "state": "open",
+        "calls": 4,
+        "failures": 2,
+        "rejected": 1,
+    }
+
+
+def test_breaker_half_open_trial_closes_or_reopens():
+    breaker = make_breaker(min_calls=1)
+
+    async def run():
+        with pytest.raises(ValueError):
+            await breaker.call(fail)
+        assert breaker.state == CircuitBreaker.OPEN
+        await asyncio.sleep(0.06)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        with pytest.raises(ValueError):
+            await breaker.call(fail)
+        assert breaker.state == CircuitBreaker.OPEN
+        await asyncio.sleep(0.06)
+        assert await breaker.call(succeed) == "ok"
+
+    asyncio.run(run())
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_admits_limited_trial_calls():
+    breaker = make_breaker(min_calls=1)
+    breaker.before_call()
+    breaker.record_failure()
+    asyncio.run(asyncio.sleep(0.06))
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_open_circuit_is_not_retried_even_when_wrapped():
+    breaker = make_breaker(min_calls=1)
+    breaker.before_call()
+    breaker.record_failure()
+    calls = []
+
+    @async_retry(max_retries=3, base_delay=0.001, exceptions=(RuntimeError,))
+    async def guarded():
+        calls.append(1)
+        try:
+            await breaker.call(succeed)
+        except Exception as e:
+            raise RuntimeError(f"wrapped: {e}")
+
+    with pytest.raises(RetryExhaustedError, match="circuit_open"):
+        asyncio.run(guarded())
+    assert len(calls) == 1
+
+
+def test_registry_applies_default_and_named_settings():
+    registry = CircuitBreakerRegistry(
+        {"default": {"cooldown": 10.0}, "serper": {"min_calls": 2}}
+    )
+
+    serper = registry.get("serper")
+
+    assert serper is registry.get("serper")
+    assert (serper.cooldown, serper.min_calls) == (10.0, 2)
+    assert registry.get("ollama").min_calls == 5
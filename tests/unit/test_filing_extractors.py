@@ -0,0 +1,63 @@
+# tests/unit/test_filing_extractors.py
+
+import pytest
+from src.filing_extractors import (
+    EdgarHTMLExtractor,
+    UnstructuredExtractor,
+    get_extractor,
+)
+
+FILING_HTML = """
+<html>
+<head><title>aapl-20240629</title><style>p { margin: 0 }</style></head>
+<body>
+<div style="display:none"><ix:header><ix:hidden>
+  <ix:nonNumeric name="dei:AmendmentFlag">false</ix:nonNumeric>
+</ix:hidden></ix:header></div>
+<p>Apple Inc. &amp; subsidiaries</p>
+<div><span>Total net sales were </span><ix:nonFraction name="us-gaap:Revenues">85,777</ix:nonFraction> million.</div>
+<table>
+  <tr><td>Products</td><td></td><td>$</td><td>61,564</td></tr>
+  <tr><td>Services</td><td><p>24,213</p></td></tr>
+</table>
+<script>var x = 1;</script>
+<p>Risk   factors<br>follow.</p>
+</body>
+</html>
+"""
+
+
+def test_edgar_extractor_keeps_text_and_tables():
+    text = EdgarHTMLExtractor().extract(FILING_HTML)
+
+    assert text.split("\n") == [
+        "Apple Inc. & subsidiaries",
+        "Total net sales were 85,777 million.",
+        "Products | $ | 61,564",
+        "Services | 24,213",
+        "Risk factors",
+        "follow.",
+    ]
+
+
+def test_edgar_extractor_drops_xbrl_header_and_scripts():
+    text = EdgarHTMLExtractor().extract(FILING_HTML)
+
+    assert "AmendmentFlag" not in text
+    assert "false" not in text
+    assert "var x" not in text
+    assert "aapl-20240629" not in text
+
+
+def test_edgar_extractor_streams_chunks():
+    extractor = EdgarHTMLExtractor()
+    chunks = [FILING_HTML[i : i + 7] for i in range(0, len(FILING_HTML), 7)]
+
+    assert "\n".join(extractor.iter_lines(chunks)) == extractor.extract(FILING_HTML)
+
+
+def test_get_extractor():
+    assert isinstance(get_extractor("edgar"), EdgarHTMLExtractor)
+    assert isinstance(get_extractor("unstructured"), UnstructuredExtractor)
+    with pytest.raises(ValueError):
+        get_extractor("pdf")
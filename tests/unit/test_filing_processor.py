@@ -0,0 +1,87 @@
+# tests/unit/test_filing_processor.py
+
+import pytest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+from langchain.text_splitter import CharacterTextSplitter
+from src.filing_processor import FilingProcessor, iter_text_chunks, split_filing_file
+
+
+@pytest.mark.parametrize("chunk_size,chunk_overlap", [(30, 0), (40, 15), (100, 50)])
+def test_iter_text_chunks_matches_character_text_splitter(chunk_size, chunk_overlap):
+    lines = [f"line {i} {'x' * (i % 7)}".strip() for i in range(50)] + ["", "  "]
+    splitter = CharacterTextSplitter(
+        separator="\n", chunk_size=chunk_size, chunk_overlap=chunk_overlap
+    )
+
+    chunks = list(iter_text_chunks(iter(lines), chunk_size, chunk_overlap))
+
+    assert chunks == splitter.split_text("\n".join(lines))
+
+
+def test_split_filing_file_reads_incrementally(tmp_path):
+    path = tmp_path / "filing.html"
+    path.write_text("".join(f"<p>line {i}</p>" for i in range(200)))
+
+    chunks = split_filing_file(str(path), 100, 20, extractor="edgar", read_size=16)
+
+    assert chunks[0].startswith("line 0\nline 1")
+    assert chunks[-1].endswith("line 199")
+    assert all(len(chunk) <= 100 for chunk in chunks)
+
+
+@pytest.mark.asyncio
+async def test_split_in_thread_pool(tmp_path):
+    processor = FilingProcessor(
+        executor_type="thread", max_workers=2, extractor="edgar"
+    )
+    path = tmp_path / "filing.html"
+    path.write_text("".join(f"<p>line {i}</p>" for i in range(20)))
+
+    chunks = await processor.split_file(str(path), chunk_size=30, chunk_overlap=0)
+
+    assert isinstance(processor._executor, ThreadPoolExecutor)
+    assert all(len(chunk) <= 30 for chunk in chunks)
+    assert "line 0" in chunks[0]
+    assert "line 19" in chunks[-1]
+    processor.shutdown()
+
+
+def test_process_executor_is_default():
+    processor = FilingProcessor.from_config({})
+
+    assert isinstance(processor._get_executor(), ProcessPoolExecutor)
+    processor.shutdown()
+
+
+class BreakingLoop:
+    def __init__(self):
+        self.executors = []
+
+    async def run_in_executor(self, executor, func, *args):
+        self.executors.append(executor)
+        if isinstance(executor, ProcessPoolExecutor):
+            raise BrokenProcessPool("worker died")
+        return ["chunk"]
+
+
+@pytest.mark.asyncio
+async def test_broken_process_pool_falls_back_to_threads():
+    processor = FilingProcessor(executor_type="process")
+    loop = BreakingLoop()
+
+    with patch("src.filing_processor.asyncio.get_running_loop", return_value=loop):
+        chunks = await processor.split_file("filing.html", 100, 0)
+
+    assert chunks == ["chunk"]
+    assert processor.executor_type == "thread"
+    assert isinstance(loop.executors[-1], ThreadPoolExecutor)
+    processor.shutdown()
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        FilingProcessor(executor_type="gpu")
+    with pytest.raises(ValueError):
+        FilingProcessor(extractor="pdf")
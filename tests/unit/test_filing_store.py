@@ -0,0 +1,79 @@
+# tests/unit/test_filing_store.py
+
+import time
+from src.filing_store import FilingStore
+
+
+def test_latest_returns_most_recent_filing(tmp_path):
+    store = FilingStore(str(tmp_path))
+    store.upsert_filing(
+        "aapl", "10-K", "0000320193-23-000106", "2023-11-03", "https://a/1", "320193"
+    )
+    store.upsert_filing(
+        "AAPL", "10-K", "0000320193-24-000123", "2024-11-01", "https://a/2"
+    )
+    store.upsert_filing(
+        "AAPL", "10-Q", "0000320193-24-000081", "2024-08-02", "https://a/3"
+    )
+
+    latest = store.latest("AAPL", "10-K")
+
+    assert latest["accession"] == "0000320193-24-000123"
+    assert latest["url"] == "https://a/2"
+    assert store.latest("MSFT", "10-K") is None
+    assert len(store.list_filings("aapl")) == 3
+
+
+def test_upsert_keeps_known_cik_and_local_copy(tmp_path):
+    store = FilingStore(str(tmp_path))
+    accession = "0000320193-24-000123"
+    store.upsert_filing(
+        "AAPL", "10-K", accession, "2024-11-01", "https://a/2", "320193"
+    )
+    path = store.path_for(accession)
+    with open(path, "w") as file:
+        file.write("<html></html>")
+    store.set_local_path(accession, path)
+
+    store.upsert_filing("AAPL", "10-K", accession, "2024-11-01", "https://a/2")
+
+    assert store.latest("AAPL", "10-K")["cik"] == "320193"
+    assert store.local_path(accession) == path
+
+
+def test_local_path_requires_file_on_disk(tmp_path):
+    store = FilingStore(str(tmp_path))
+    accession = "0000320193-24-000123"
+    store.upsert_filing("AAPL", "10-K", accession, "2024-11-01", "https://a/2")
+    store.set_local_path(accession, store.path_for(accession))
+
+    assert store.local_path(accession) is None
+
+
+def test_freshness_checks_and_validators_survive_restart(tmp_path):
+    store = FilingStore(str(tmp_path))
+    assert store.last_checked("AAPL", "10-K") is None
+    assert store.get_validators("https://data.sec.gov/x.json") == (None, None)
+
+    store.mark_checked("aapl", "10-K")
+    store.set_validators(
+        "https://data.sec.gov/x.json", '"abc"', "Fri, 01 Nov 2024 00:00:00 GMT"
+    )
+    store.close()
+    reopened = FilingStore(str(tmp_path))
+
+    assert time.time() - reopened.last_checked("AAPL", "10-K") < 60
+    assert reopened.get_validators("https://data.sec.gov/x.json") == (
+        '"abc"',
+        "Fri, 01 Nov 2024 00:00:00 GMT",
+    )
+
+
+def test_validators_are_kept_per_scope(tmp_path):
+    store = FilingStore(str(tmp_path))
+    url = "https://data.sec.gov/submissions/CIK0000320193.json"
+    store.set_validators(url, '"v1"', None, scope="10-K")
+
+    assert store.get_validators(url, scope="10-K") == ('"v1"', None)
+    assert store.get_validators(url, scope="10-Q") == (None, None)
+    assert store.get_validators(url) == (None, None)
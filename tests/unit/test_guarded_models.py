@@ -0,0 +1,70 @@
+# tests/unit/test_guarded_models.py
+
+import asyncio
+import pytest
+from langchain_core.embeddings import Embeddings
+from src.error_handling import CircuitBreaker, CircuitOpenError
+from src.guarded_models import CircuitBreakerCallbackHandler, CircuitBreakerEmbeddings
+
+
+class FlakyEmbeddings(Embeddings):
+    def __init__(self):
+        self.fail = True
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("ollama down")
+        return [[1.0] for _ in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def test_embeddings_fail_fast_once_breaker_opens():
+    breaker = CircuitBreaker("embeddings", min_calls=2, cooldown=60)
+    inner = FlakyEmbeddings()
+    embeddings = CircuitBreakerEmbeddings(inner, breaker)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            embeddings.embed_documents(["a"])
+    with pytest.raises(CircuitOpenError):
+        embeddings.embed_documents(["a"])
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(embeddings.aembed_documents(["a"]))
+
+    assert inner.calls == 2
+
+
+def test_embed_query_calls_the_inner_embed_query():
+    class PrefixedEmbeddings(Embeddings):
+        def __init__(self):
+            self.texts = []
+
+        def embed_documents(self, texts):
+            self.texts += [f"passage: {text}" for text in texts]
+            return [[0.0] for _ in texts]
+
+        def embed_query(self, text):
+            self.texts.append(f"query: {text}")
+            return [1.0]
+
+    breaker = CircuitBreaker("embeddings", min_calls=1, cooldown=60)
+    inner = PrefixedEmbeddings()
+
+    assert CircuitBreakerEmbeddings(inner, breaker).embed_query("revenue") == [1.0]
+    assert inner.texts == ["query: revenue"]
+
+
+def test_llm_callback_handler_records_outcomes_and_rejects_when_open():
+    breaker = CircuitBreaker("ollama", min_calls=1, cooldown=60)
+    handler = CircuitBreakerCallbackHandler(breaker)
+
+    handler.on_llm_start({}, ["prompt"])
+    handler.on_llm_error(ConnectionError("ollama down"))
+
+    assert handler.raise_error
+    with pytest.raises(CircuitOpenError):
+        handler.on_llm_start({}, ["prompt"])
@@ -0,0 +1,36 @@
+# tests/unit/test_http_client.py
+
+import pytest
+from src.http_client import HTTPClient
+
+
+@pytest.mark.asyncio
+async def test_session_is_shared():
+    client = HTTPClient(limit=20, limit_per_host=5)
+
+    first = await client.get_session()
+    second = await client.get_session()
+
+    assert first is second
+    assert first.connector.limit == 20
+    assert first.connector.limit_per_host == 5
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_close_releases_session():
+    client = HTTPClient()
+    session = await client.get_session()
+
+    await client.close()
+
+    assert session.closed
+    assert (await client.get_session()) is not session
+    await client.close()
+
+
+def test_from_config_uses_defaults_for_missing_keys():
+    client = HTTPClient.from_config({"http_connection_limit": 7})
+
+    assert client.limit == 7
+    assert client.limit_per_host == 10
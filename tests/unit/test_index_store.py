@@ -0,0 +1,103 @@
+# tests/unit/test_index_store.py
+
+import os
+import pytest
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+from src.index_store import FilingIndexStore
+
+
+@pytest.fixture
+def embeddings():
+    return FakeEmbeddings(size=8)
+
+
+def build_index(embeddings, text):
+    return FAISS.from_texts([text, f"{text} again"], embeddings)
+
+
+def test_make_key_depends_on_extractor_and_embedding_settings():
+    key = FilingIndexStore.make_key(
+        "0000320193-24-000001", "llama3", 1000, 150, "edgar"
+    )
+
+    assert key == FilingIndexStore.make_key(
+        "0000320193-24-000001", "llama3", 1000, 150, "edgar"
+    )
+    assert key != FilingIndexStore.make_key(
+        "0000320193-24-000001", "llama3", 500, 150, "edgar"
+    )
+    assert key != FilingIndexStore.make_key(
+        "0000320193-24-000001", "llama2", 1000, 150, "edgar"
+    )
+    assert key != FilingIndexStore.make_key(
+        "0000320193-24-000001", "llama3", 1000, 150, "unstructured"
+    )
+
+
+def test_get_miss_then_hit(tmp_path, embeddings):
+    store = FilingIndexStore(str(tmp_path))
+    key = store.make_key("filing-1", "llama3", 1000, 150, "edgar")
+
+    assert store.get(key, embeddings) is None
+    store.put(key, build_index(embeddings, "revenue"), source="https://example.com/1")
+    loaded = store.get(key, embeddings)
+
+    assert loaded is not None
+    assert store.stats()["hits"] == 1
+    assert store.stats()["misses"] == 1
+
+
+def test_entries_survive_restart(tmp_path, embeddings):
+    store = FilingIndexStore(str(tmp_path))
+    key = store.make_key("filing-1", "llama3", 1000, 150, "edgar")
+    store.put(key, build_index(embeddings, "revenue"))
+
+    reopened = FilingIndexStore(str(tmp_path))
+
+    assert reopened.get(key, embeddings) is not None
+
+
+def test_lru_eviction_by_entry_count(tmp_path, embeddings):
+    store = FilingIndexStore(str(tmp_path), max_entries=2)
+    keys = [
+        store.make_key(f"filing-{i}", "llama3", 1000, 150, "edgar") for i in range(3)
+    ]
+
+    store.put(keys[0], build_index(embeddings, "a"))
+    store.put(keys[1], build_index(embeddings, "b"))
+    store.get(keys[0], embeddings)  # keys[0] becomes most recently used
+    store.put(keys[2], build_index(embeddings, "c"))
+
+    assert store.get(keys[1], embeddings) is None
+    assert store.get(keys[0], embeddings) is not None
+    assert store.get(keys[2], embeddings) is not None
+    assert not os.path.exists(os.path.join(str(tmp_path), keys[1]))
+
+
+def test_lru_eviction_by_size(tmp_path, embeddings):
+    store = FilingIndexStore(str(tmp_path), max_entries=0, max_bytes=1)
+    first = store.make_key("filing-1", "llama3", 1000, 150, "edgar")
+    second = store.make_key("filing-2", "llama3", 1000, 150, "edgar")
+
+    store.put(first, build_index(embeddings, "a"))
+    store.put(second, build_index(embeddings, "b"))
+
+    assert store.stats()["entries"] == 1
+    assert store.get(second, embeddings) is not None
+
+
+def test_loaded_indexes_kept_in_memory(tmp_path, embeddings):
+    store = FilingIndexStore(str(tmp_path), memory_entries=1)
+    first = store.make_key("filing-1", "llama3", 1000, 150, "edgar")
+    second = store.make_key("filing-2", "llama3", 1000, 150, "edgar")
+    index = build_index(embeddings, "revenue")
+    store.put(first, index)
+
+    assert store.get(first, embeddings) is index
+
+    store.put(second, build_index(embeddings, "margin"))
+    reloaded = store.get(first, embeddings)
+
+    assert reloaded is not None and reloaded is not index
+    assert store.stats()["loaded"] == 1
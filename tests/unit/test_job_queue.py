@@ -0,0 +1,143 @@
+# tests/unit/test_job_queue.py
+
+import asyncio
+import time
+from src.job_queue import JobQueue, JobWorkerPool, job_id_for
+
+
+def make_queue(tmp_path, **kwargs):
+    kwargs.setdefault("retry_base_delay", 0.0)
+    return JobQueue(str(tmp_path / "jobs.sqlite3"), **kwargs)
+
+
+def test_enqueue_is_idempotent_and_lease_completes(tmp_path):
+    queue = make_queue(tmp_path)
+    job_id = queue.enqueue("crew.yaml", {"company_name": "Apple"}, job_id="row-0")
+    queue.enqueue("crew.yaml", {"company_name": "Other"}, job_id="row-0")
+
+    job = queue.lease("worker-1")
+
+    assert job["id"] == job_id
+    assert job["variables"] == {"company_name": "Apple"}
+    assert job["attempts"] == 1
+    assert queue.lease("worker-2") is None
+    assert queue.complete(job_id, "worker-1", "report")
+    assert queue.get(job_id)["result"] == "report"
+    assert queue.stats()["succeeded"] == 1
+
+
+def test_failed_job_is_retried_then_dead_lettered(tmp_path):
+    queue = make_queue(tmp_path, max_attempts=2)
+    job_id = queue.enqueue("crew.yaml")
+
+    assert queue.fail(queue.lease("w")["id"], "w", "boom") == "pending"
+    assert queue.fail(queue.lease("w")["id"], "w", "boom again") == "dead"
+
+    job = queue.get(job_id)
+    assert job["state"] == "dead"
+    assert job["last_error"] == "boom again"
+    assert queue.lease("w") is None
+
+    assert queue.requeue() == 1
+    assert queue.lease("w")["attempts"] == 1
+
+
+def test_retry_backoff_delays_redelivery(tmp_path):
+    queue = make_queue(tmp_path, retry_base_delay=60.0)
+    queue.enqueue("crew.yaml")
+    queue.fail(queue.lease("w")["id"], "w", "boom")
+
+    assert queue.lease("w") is None
+    assert queue.stats() == {
+        "pending": 1,
+        "leased": 0,
+        "succeeded": 0,
+        "dead": 0,
+        "ready": 0,
+        "expired_leases": 0,
+    }
+
+
+def test_expired_lease_is_redelivered(tmp_path):
+    queue = make_queue(tmp_path, lease_timeout=0.05)
+    job_id = queue.enqueue("crew.yaml")
+    queue.lease("killed-worker")
+
+    assert queue.lease("worker-2") is None
+    time.sleep(0.1)
+    job = queue.lease("worker-2")
+
+    assert job["id"] == job_id
+    assert job["attempts"] == 2
+    assert not queue.heartbeat(job_id, "killed-worker")
+    assert not queue.complete(job_id, "killed-worker", "stale")
+    assert queue.complete(job_id, "worker-2", "report")
+
+
+def test_queue_is_shared_between_connections(tmp_path):
+    producer = make_queue(tmp_path)
+    consumer = make_queue(tmp_path)
+    producer.enqueue("crew.yaml", job_id="shared")
+
+    assert consumer.lease("w")["id"] == "shared"
+    assert producer.get("shared")["state"] == "leased"
+
+
+async def test_worker_pool_runs_jobs_concurrently(tmp_path):
+    queue = make_queue(tmp_path)
+    for index in range(6):
+        queue.enqueue("crew.yaml", {"row": index})
+    running = 0
+    peak = 0
+
+    async def run_crew(crew, variables):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        if variables["row"] == "5":
+            raise ValueError("bad row")
+        return f"done {variables['row']}"
+
+    pool = JobWorkerPool(queue, run_crew, workers=3, poll_interval=0.01)
+    summary = await pool.run(until_idle=True)
+
+    assert peak == 3
+    # The bad row is retried right away (no backoff here) until dead-lettered.
+    assert summary == {"succeeded": 5, "failed": 3, "lost": 0}
+    assert queue.stats()["succeeded"] == 5
+    assert queue.stats()["dead"] == 1
+
+
+async def test_worker_gives_up_job_when_lease_is_lost(tmp_path):
+    queue = make_queue(tmp_path, lease_timeout=0.05)
+    job_id = queue.enqueue("crew.yaml")
+
+    async def run_crew(crew, variables):
+        await asyncio.sleep(1)
+        return "too late"
+
+    pool = JobWorkerPool(queue, run_crew, workers=1, heartbeat_interval=0.2)
+    run = asyncio.ensure_future(pool.run(until_idle=True))
+    await asyncio.sleep(0.1)
+    # Another worker picks up the expired lease before the next heartbeat.
+    assert make_queue(tmp_path).lease("worker-2", lease_timeout=60)["id"] == job_id
+    summary = await run
+
+    assert summary["lost"] == 1
+    assert queue.get(job_id)["lease_owner"] == "worker-2"
+
+
+def test_job_id_for_depends_on_crew_and_variables():
+    job_id = job_id_for("crew.yaml", {"company_name": "Apple", "ticker": "AAPL"})
+
+    assert job_id == job_id_for(
+        "crew.yaml", {"ticker": "AAPL", "company_name": "Apple"}
+    )
+    assert job_id != job_id_for(
+        "crew.yaml", {"company_name": "Apple", "ticker": "MSFT"}
+    )
+    assert job_id != job_id_for(
+        "other.yaml", {"company_name": "Apple", "ticker": "AAPL"}
+    )
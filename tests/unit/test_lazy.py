@@ -0,0 +1,35 @@
+# tests/unit/test_lazy.py
+
+import asyncio
+from src.lazy import Lazy
+
+
+def test_factory_runs_once_on_first_access():
+    calls = []
+    lazy = Lazy(lambda: calls.append(1) or "component")
+
+    assert not lazy.created
+    assert calls == []
+    assert lazy.get() == "component"
+    assert lazy.get() == "component"
+    assert lazy.created
+    assert calls == [1]
+
+
+def test_async_factory_is_awaited_once_for_concurrent_callers():
+    calls = []
+
+    async def build():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["search", "multi search"]
+
+    lazy = Lazy(build)
+
+    async def run():
+        return await asyncio.gather(*(lazy.aget() for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert results == [["search", "multi search"]] * 5
+    assert calls == [1]
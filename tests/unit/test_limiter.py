@@ -0,0 +1,110 @@
+# tests/unit/test_limiter.py
+
+import asyncio
+import time
+import aiohttp
+import pytest
+from yarl import URL
+from src.error_handling import with_semaphore
+from src.limiter import (
+    AdaptiveConcurrencyLimiter,
+    EndpointLimiter,
+    LimiterRegistry,
+    TokenBucket,
+)
+
+
+def http_error(status):
+    url = URL("https://example.com")
+    request_info = aiohttp.RequestInfo(url, "GET", {}, url)
+    return aiohttp.ClientResponseError(request_info, (), status=status)
+
+
+def test_token_bucket_allows_burst_then_rate():
+    async def run():
+        bucket = TokenBucket(rate=50, burst=3)
+        start = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    # 3 immediate tokens, then 3 more at 50/sec.
+    assert 0.05 <= asyncio.run(run()) < 0.5
+
+
+def test_aimd_decreases_on_overload_and_ramps_up_on_success():
+    async def run():
+        limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=8, min_limit=1, max_limit=8, cooldown=0
+        )
+        await limiter.acquire()
+        await limiter.release(overloaded=True)
+        after_overload = limiter.limit
+        for _ in range(20):
+            await limiter.acquire()
+            await limiter.release(overloaded=False)
+        return after_overload, limiter.limit
+
+    after_overload, after_successes = asyncio.run(run())
+
+    assert after_overload == 4
+    assert 4 < after_successes <= 8
+
+
+def test_aimd_cooldown_ignores_overloads_from_same_burst():
+    async def run():
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=8, cooldown=60)
+        for _ in range(3):
+            await limiter.acquire()
+        for _ in range(3):
+            await limiter.release(overloaded=True)
+        return limiter.limit
+
+    assert asyncio.run(run()) == 4
+
+
+def test_endpoint_limiter_bounds_concurrency():
+    limiter = EndpointLimiter("test", max_concurrency=2)
+    running = {"now": 0, "peak": 0}
+
+    async def work():
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+
+    async def run():
+        await asyncio.gather(*(with_semaphore(limiter, work) for _ in range(6)))
+
+    asyncio.run(run())
+
+    assert running["peak"] == 2
+    assert limiter.metrics()["successes"] == 6
+
+
+def test_endpoint_limiter_classifies_failures():
+    limiter = EndpointLimiter("test", max_concurrency=4)
+
+    async def run():
+        for exc in (http_error(429), http_error(404), ValueError("bad")):
+            with pytest.raises(type(exc)):
+                async with limiter:
+                    raise exc
+
+    asyncio.run(run())
+
+    metrics = limiter.metrics()
+    assert metrics["overloads"] == 1
+    assert metrics["errors"] == 2
+    assert metrics["concurrency_limit"] == 2
+    assert metrics["in_flight"] == 0
+
+
+def test_registry_shares_limiters_per_endpoint():
+    registry = LimiterRegistry(
+        {"serper": {"rate": 5.0, "burst": 2, "max_concurrency": 3}}
+    )
+
+    assert registry.get("serper") is registry.get("serper")
+    assert registry.get("serper").metrics()["concurrency_limit"] == 3
+    assert set(registry.metrics()) == {"serper"}
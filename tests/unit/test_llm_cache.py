@@ -0,0 +1,123 @@
+# tests/unit/test_llm_cache.py
+
+import contextvars
+import time
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import FakeListLLM
+from langchain_core.outputs import Generation
+from src.llm_cache import LLMResponseCache, set_cache_inputs
+
+
+class KeywordEmbeddings(Embeddings):
+    """Embeds a text by which of a few keywords it mentions."""
+
+    KEYWORDS = ["apple", "revenue", "french", "german"]
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return [float(keyword in text.lower()) + 0.01 for keyword in self.KEYWORDS]
+
+
+def test_llm_calls_are_answered_from_the_cache(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+    llm = FakeListLLM(responses=["first", "second"], cache=cache)
+
+    assert llm.invoke("Summarize Apple") == "first"
+    assert llm.invoke("Summarize Apple") == "first"
+    assert llm.invoke("Summarize Microsoft") == "second"
+    # Different parameters are a different LLM configuration.
+    assert cache.lookup("Summarize Apple", "other model") is None
+
+    assert cache.stats() == {
+        "entries": 2,
+        "hits": 1,
+        "semantic_hits": 0,
+        "misses": 3,
+        "hit_rate": 0.25,
+    }
+    cache.close()
+
+    reopened = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+    llm = FakeListLLM(responses=["first", "second"], cache=reopened)
+    assert llm.invoke("Summarize Microsoft") == "second"
+
+
+def test_expired_and_least_recently_used_entries_are_evicted(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"), ttl=60, max_entries=2)
+    for prompt in ["a", "b"]:
+        cache.update(prompt, "llm", [Generation(text=prompt.upper())])
+    cache.lookup("a", "llm")
+    cache.update("c", "llm", [Generation(text="C")])
+
+    assert cache.lookup("b", "llm") is None
+    assert cache.lookup("a", "llm")[0].text == "A"
+
+    cache.ttl = 0.01
+    time.sleep(0.02)
+    assert cache.lookup("c", "llm") is None
+
+
+def test_semantic_tier_matches_similar_prompts(tmp_path):
+    cache = LLMResponseCache(
+        str(tmp_path / "llm.sqlite3"),
+        embeddings=KeywordEmbeddings(),
+        similarity_threshold=0.95,
+    )
+    cache.update("Apple revenue in 2023?", "llm", [Generation(text="$383B")])
+
+    assert cache.lookup("What was Apple's revenue in 2023?", "llm")[0].text == "$383B"
+    assert cache.lookup("Translate to French", "llm") is None
+    assert cache.lookup("What was Apple's revenue in 2023?", "other llm") is None
+    assert cache.stats()["semantic_hits"] == 1
+
+    # The semantic index is rebuilt from the stored vectors.
+    cache.close()
+    reopened = LLMResponseCache(
+        str(tmp_path / "llm.sqlite3"), embeddings=KeywordEmbeddings()
+    )
+    assert reopened.lookup("apple REVENUE", "llm")[0].text == "$383B"
+
+
+def test_semantic_hits_need_the_same_task_variables(tmp_path):
+    cache = LLMResponseCache(
+        str(tmp_path / "llm.sqlite3"),
+        embeddings=KeywordEmbeddings(),
+        similarity_threshold=0.95,
+    )
+
+    def run(variables, action):
+        # Each crew run has its own context, as in the server and batch modes.
+        def in_context():
+            set_cache_inputs(variables)
+            return action()
+
+        return contextvars.copy_context().run(in_context)
+
+    run(
+        {"company_name": "Apple"},
+        lambda: cache.update(
+            "Analyze the revenue of Apple", "llm", [Generation(text="Apple report")]
+        ),
+    )
+
+    # Embeds like the Apple prompt, but was made for another company.
+    assert (
+        run(
+            {"company_name": "Apple Hospitality"},
+            lambda: cache.lookup("Analyze the revenue of Apple Hospitality", "llm"),
+        )
+        is None
+    )
+    hit = run(
+        {"company_name": "Apple"},
+        lambda: cache.lookup("Analyze Apple's revenue", "llm"),
+    )
+    assert hit[0].text == "Apple report"
+    # Prompts made outside a crew run do not match crew completions.
+    assert cache.lookup("Analyze Apple's revenue", "llm") is None
+
+
+def test_from_config_disabled():
+    assert LLMResponseCache.from_config({"llm_cache_enabled": False}) is None
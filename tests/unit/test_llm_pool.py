@@ -0,0 +1,38 @@
+# tests/unit/test_llm_pool.py
+
+from unittest.mock import Mock
+from src.llm_pool import LLMPool, crew_models, resolve_llm_config
+
+CREW_CONFIG = {
+    "llm_model": "llama3:latest",
+    "llm_params": {"temperature": 0.7, "num_ctx": 4096},
+    "agents": {
+        "detector": {"llm_model": "qwen2:0.5b", "llm_params": {"temperature": 0}},
+        "writer": {},
+    },
+}
+
+
+def test_agent_overrides_crew_overrides_default():
+    assert resolve_llm_config(CREW_CONFIG, CREW_CONFIG["agents"]["detector"], "x") == (
+        "qwen2:0.5b",
+        {"temperature": 0, "num_ctx": 4096},
+    )
+    assert resolve_llm_config({}, {}, "default") == ("default", {})
+    assert crew_models(CREW_CONFIG, "default") == ["llama3:latest", "qwen2:0.5b"]
+
+
+def test_one_llm_per_distinct_config():
+    factory = Mock(side_effect=lambda model, params, cache: Mock(model=model))
+    pool = LLMPool(factory, "llama3:latest")
+
+    default = pool.get()
+    assert pool.get("llama3:latest", {}) is default
+    tiny = pool.get("qwen2:0.5b", {"temperature": 0, "top_k": 10})
+    assert pool.get("qwen2:0.5b", {"top_k": 10, "temperature": 0}) is tiny
+    assert (
+        pool.get("qwen2:0.5b", {"temperature": 0, "top_k": 10}, cache=False) is not tiny
+    )
+
+    assert factory.call_count == 3
+    assert pool.models == ["llama3:latest", "qwen2:0.5b"]
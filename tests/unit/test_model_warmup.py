@@ -0,0 +1,54 @@
+# tests/unit/test_model_warmup.py
+
+import asyncio
+from src.model_warmup import ModelWarmer
+
+
+class FakePool:
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.calls = []
+
+    async def preload(self, http_client, model, keep_alive=None, embedding=False):
+        self.calls.append((model, keep_alive, embedding))
+        return {"http://gpu1:11434": self.seconds.get(model, 0.01)}
+
+
+async def test_warm_up_preloads_crew_and_embedding_models():
+    generation = FakePool({"llama3:latest": 8.0, "qwen2:0.5b": 1.5})
+    embedding = FakePool({"llama3:latest": 6.0})
+    warmer = ModelWarmer(generation, embedding, None, keep_alive="30m")
+
+    seconds = await warmer.warm_up(
+        ["llama3:latest", "qwen2:0.5b", "llama3:latest"], ["llama3:latest"]
+    )
+
+    assert seconds == {
+        "llama3:latest": 8.0,
+        "qwen2:0.5b": 1.5,
+        "llama3:latest (embedding)": 6.0,
+    }
+    assert warmer.hidden_load_seconds == 15.5
+    assert generation.calls == [
+        ("llama3:latest", "30m", False),
+        ("qwen2:0.5b", "30m", False),
+    ]
+    assert embedding.calls == [("llama3:latest", "30m", True)]
+
+
+async def test_models_are_kept_alive_only_while_busy():
+    generation = FakePool({})
+    warmer = ModelWarmer(generation, FakePool({}), None, interval=0.01)
+    busy = True
+
+    warmer.start(["llama3:latest"], is_busy=lambda: busy)
+    await asyncio.sleep(0.05)
+    busy = False
+    calls = len(generation.calls)
+    await asyncio.sleep(0.05)
+    await warmer.stop()
+
+    assert calls > 2
+    assert len(generation.calls) == calls
+    # Fast responses mean the model was still loaded: no hidden reload.
+    assert warmer.hidden_load_seconds == 0.01
@@ -0,0 +1,115 @@
+# tests/unit/test_multi_search_tool.py
+
+import asyncio
+import pytest
+from src.search_cache import SearchCache
+from src.search_results import estimate_tokens
+
+# ``CircuitOpenError`` as search_tool sees it: the top-level ``error_handling``.
+from src.search_tool import SEARCH_UNAVAILABLE, CircuitOpenError, SearchTool
+
+
+class FakeSearchTool(SearchTool):
+    def __init__(self, config, search_cache=None, fail=(), circuit_open=()):
+        super().__init__(config, "key", http_client=object(), search_cache=search_cache)
+        self.fail = set(fail)
+        self.circuit_open = set(circuit_open)
+        self.queries = []
+        self.running = 0
+        self.peak = 0
+
+    async def _fetch_results(self, query):
+        self.queries.append(query)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        if query in self.fail:
+            raise RuntimeError("serper down")
+        if query in self.circuit_open:
+            raise CircuitOpenError("serper circuit is open")
+        return {
+            "organic": [
+                {
+                    "title": "Shared",
+                    "link": "https://example.com/shared",
+                    "snippet": "s",
+                },
+                {
+                    "title": query,
+                    "link": f"https://example.com/{query}",
+                    "snippet": "s",
+                },
+            ]
+        }
+
+
+def test_parse_queries_accepts_text_json_and_lists():
+    assert SearchTool.parse_queries("AAPL price; AAPL news\nAAPL earnings") == [
+        "AAPL price",
+        "AAPL news",
+        "AAPL earnings",
+    ]
+    assert SearchTool.parse_queries('["a", "b"]') == ["a", "b"]
+    assert SearchTool.parse_queries({"queries": ["a", " "]}) == ["a"]
+
+
+def test_multi_search_dedupes_queries_and_results():
+    tool = FakeSearchTool({"search_max_concurrency": 2})
+
+    result = asyncio.run(
+        tool.async_multi_search(["price", "Price ", "news", "earnings", "eps"])
+    )
+
+    assert tool.queries == ["price", "news", "earnings", "eps"]
+    assert tool.peak == 2
+    assert result.count("https://example.com/shared") == 1
+    assert "Query: price" in result and "Query: eps" in result
+
+
+def test_multi_search_reports_partial_failures():
+    tool = FakeSearchTool({}, fail={"news"})
+
+    result = asyncio.run(tool.async_multi_search(["price", "news"]))
+
+    assert "Query: price" in result
+    assert result.endswith("Search failed for: news")
+
+
+def test_multi_search_fails_when_every_query_fails():
+    tool = FakeSearchTool({}, fail={"news"})
+
+    # The exception class is imported under two module names, so match on text.
+    with pytest.raises(Exception, match="any of the searches"):
+        asyncio.run(tool.async_multi_search(["news"]))
+
+
+def test_multi_search_uses_search_cache():
+    cache = SearchCache()
+    tool = FakeSearchTool({}, search_cache=cache)
+
+    asyncio.run(tool.async_multi_search(["price"]))
+    asyncio.run(tool.async_multi_search(["price", "news"]))
+
+    assert tool.queries == ["price", "news"]
+
+
+def test_multi_search_reports_open_circuit_as_unavailable():
+    tool = FakeSearchTool({}, circuit_open={"news", "eps"})
+
+    result = asyncio.run(tool.async_multi_search(["price", "news"]))
+    assert "Query: price" in result
+    assert result.endswith("Search temporarily unavailable for: news")
+    assert "Search failed" not in result
+
+    assert asyncio.run(tool.async_multi_search(["eps"])) == SEARCH_UNAVAILABLE
+
+
+def test_multi_search_output_stays_within_token_budget():
+    tool = FakeSearchTool({"search_result_max_tokens": 60})
+    queries = [f"query {index}" for index in range(4)]
+
+    result = asyncio.run(tool.async_multi_search(queries))
+
+    assert estimate_tokens(result) <= 60
+    assert all(f"Query: {query}" in result for query in queries)
@@ -0,0 +1,161 @@
+# tests/unit/test_ollama_pool.py
+
+import asyncio
+import json
+import threading
+import time
+import pytest
+import requests
+from unittest.mock import patch
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from src.http_client import HTTPClient
+from src.ollama_pool import OllamaEndpointPool, PooledEmbeddings, PooledOllama
+
+URLS = ["http://gpu1:11434", "http://gpu2:11434"]
+
+
+def test_acquire_picks_least_outstanding_endpoint():
+    pool = OllamaEndpointPool("generation", URLS)
+
+    first = pool.acquire()
+    second = pool.acquire()
+    assert {first.url, second.url} == set(URLS)
+
+    pool.release(first)
+    assert pool.acquire() is first
+    assert [endpoint["outstanding"] for endpoint in pool.stats()] == [1, 1]
+
+
+def test_unreachable_endpoint_fails_over_and_is_retried_later():
+    pool = OllamaEndpointPool("embedding", URLS, health_check_interval=0.05)
+    calls = []
+
+    def request(url):
+        calls.append(url)
+        if url == URLS[0]:
+            raise ValueError(
+                "Error raised by inference endpoint"
+            ) from ConnectionError()
+        return url
+
+    assert pool.call(request) == URLS[1]
+    assert pool.call(request) == URLS[1]
+    assert calls == [URLS[0], URLS[1], URLS[1]]
+    assert pool.stats()[0]["healthy"] is False
+
+    time.sleep(0.06)
+    pool.call(request)
+    assert calls[-2:] == [URLS[0], URLS[1]]
+
+
+def test_model_errors_are_not_failed_over():
+    pool = OllamaEndpointPool("generation", URLS)
+
+    def request(url):
+        raise ValueError("model not found")
+
+    with pytest.raises(ValueError):
+        pool.call(request)
+    assert all(endpoint["healthy"] for endpoint in pool.stats())
+
+
+def test_pooled_ollama_streams_from_a_reachable_endpoint():
+    pool = OllamaEndpointPool("generation", URLS)
+    llm = PooledOllama(model="llama3", base_url=URLS[0], pool=pool)
+    urls = []
+
+    def create_stream(self, api_url, payload, stop=None, **kwargs):
+        urls.append(api_url)
+        if api_url.startswith(URLS[0]):
+            raise requests.ConnectionError("connection refused")
+        return iter(
+            json.dumps({"response": text, "done": done})
+            for text, done in [("Hello", False), (" world", True)]
+        )
+
+    with patch("langchain_community.llms.ollama.Ollama._create_stream", create_stream):
+        assert llm.invoke("Say hello") == "Hello world"
+
+    assert urls == [f"{URLS[0]}/api/generate", f"{URLS[1]}/api/generate"]
+    assert [endpoint["outstanding"] for endpoint in pool.stats()] == [0, 0]
+
+
+def test_pooled_embeddings_spread_concurrent_calls():
+    pool = OllamaEndpointPool("embedding", URLS)
+    used = {url: 0 for url in URLS}
+
+    class SlowEmbeddings:
+        def __init__(self, url):
+            self.url = url
+
+        def embed_documents(self, texts):
+            used[self.url] += 1
+            time.sleep(0.05)
+            return [[1.0] for _ in texts]
+
+    embeddings = PooledEmbeddings({url: SlowEmbeddings(url) for url in URLS}, pool)
+    threads = [
+        threading.Thread(target=embeddings.embed_documents, args=(["chunk"],))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert used == {URLS[0]: 2, URLS[1]: 2}
+
+
+async def test_check_health_marks_endpoints():
+    async def tags(request):
+        return web.json_response({"models": []})
+
+    app = web.Application()
+    app.router.add_get("/api/tags", tags)
+    http_client = HTTPClient()
+    async with TestServer(app) as server:
+        up = str(server.make_url("")).rstrip("/")
+        pool = OllamaEndpointPool("generation", [up, "http://127.0.0.1:1"])
+        await pool.check_health(http_client)
+    await http_client.close()
+
+    assert [endpoint["healthy"] for endpoint in pool.stats()] == [True, False]
+    assert pool.acquire().url == up
+
+
+async def test_preload_loads_model_on_every_endpoint():
+    payloads = []
+
+    async def generate(request):
+        payloads.append(await request.json())
+        return web.json_response({"model": "llama3", "response": "", "done": True})
+
+    app = web.Application()
+    app.router.add_post("/api/generate", generate)
+    http_client = HTTPClient()
+    async with TestServer(app) as server:
+        up = str(server.make_url("")).rstrip("/")
+        pool = OllamaEndpointPool("generation", [up, "http://127.0.0.1:1"])
+        loaded = await pool.preload(http_client, "llama3", keep_alive="30m")
+    await http_client.close()
+
+    assert list(loaded) == [up]
+    assert payloads == [{"model": "llama3", "stream": False, "keep_alive": "30m"}]
+
+
+async def test_preload_outlasts_the_shared_session_timeout():
+    async def generate(request):
+        await asyncio.sleep(0.3)  # A cold model load
+        return web.json_response({"model": "llama3", "response": "", "done": True})
+
+    app = web.Application()
+    app.router.add_post("/api/generate", generate)
+    http_client = HTTPClient(timeout=0.1)
+    async with TestServer(app) as server:
+        up = str(server.make_url("")).rstrip("/")
+        pool = OllamaEndpointPool("generation", [up], load_timeout=5)
+        loaded = await pool.preload(http_client, "llama3")
+    await http_client.close()
+
+    assert list(loaded) == [up]
@@ -0,0 +1,70 @@
+# tests/unit/test_search_cache.py
+
+import asyncio
+import pytest
+from src.search_cache import SearchCache
+
+
+def test_normalize_query_ignores_case_and_whitespace():
+    assert SearchCache.normalize_query("  Apple   Q3 revenue ") == "apple q3 revenue"
+
+
+def test_lru_eviction_and_ttl_expiry():
+    cache = SearchCache(ttl=3600, max_entries=2)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    cache.get("a")
+    cache.put("c", {"n": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+
+    expired = SearchCache(ttl=0.01)
+    expired.put("a", {"n": 1})
+    asyncio.run(asyncio.sleep(0.02))
+    assert expired.get("a") is None
+
+
+def test_concurrent_identical_queries_are_coalesced():
+    cache = SearchCache()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"organic": []}
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.get_or_fetch(f"Apple  revenue{' ' * i}", fetch) for i in range(5))
+        )
+
+    results = asyncio.run(run())
+    asyncio.run(cache.get_or_fetch("apple revenue", fetch))
+
+    assert results == [{"organic": []}] * 5
+    assert len(calls) == 1
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1, "coalesced": 4}
+
+
+def test_failed_fetch_is_not_cached():
+    cache = SearchCache()
+
+    async def fail():
+        raise RuntimeError("serper down")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(cache.get_or_fetch("q", fail))
+
+    assert cache.get("q") is None
+
+
+def test_persisted_entries_survive_restart(tmp_path):
+    path = str(tmp_path / "search_cache.json")
+    cache = SearchCache(path=path)
+    cache.put("Apple revenue", {"organic": [{"title": "AAPL"}]})
+    cache.save()
+
+    reopened = SearchCache(path=path)
+
+    assert reopened.get("apple revenue") == {"organic": [{"title": "AAPL"}]}
@@ -0,0 +1,74 @@
+# tests/unit/test_search_results.py
+
+import json
+import pytest
+from src.search_results import (
+    estimate_tokens,
+    format_search_results,
+    project_search_results,
+)
+
+SERPER_RESULTS = {
+    "searchParameters": {"q": "apple revenue", "type": "search", "engine": "google"},
+    "answerBox": {
+        "title": "Apple revenue",
+        "answer": "$383.3 billion (2023)",
+        "link": "https://example.com/answer",
+    },
+    "knowledgeGraph": {
+        "title": "Apple Inc.",
+        "description": "Technology company " * 20,
+    },
+    "organic": [
+        {
+            "title": f"Result {i}",
+            "link": f"https://example.com/{i}",
+            "snippet": f"Snippet number {i} about Apple revenue.",
+            "position": i,
+            "sitelinks": [{"title": "More", "link": "https://example.com/more"}],
+        }
+        for i in range(1, 11)
+    ],
+    "relatedSearches": [{"query": f"related {i}"} for i in range(8)],
+}
+
+
+def test_projection_keeps_answer_and_top_organic_hits():
+    projected = project_search_results(SERPER_RESULTS, max_results=3)
+
+    assert projected["answer"] == {
+        "text": "$383.3 billion (2023)",
+        "link": "https://example.com/answer",
+    }
+    assert [hit["title"] for hit in projected["organic"]] == [
+        "Result 1",
+        "Result 2",
+        "Result 3",
+    ]
+    assert set(projected["organic"][0]) == {"title", "snippet", "link"}
+
+
+def test_compact_format_is_much_smaller_than_full_dump():
+    compact = format_search_results(SERPER_RESULTS, "compact", max_results=5)
+    full = format_search_results(SERPER_RESULTS, "full")
+
+    assert full == json.dumps(SERPER_RESULTS, indent=2)
+    assert "Answer: $383.3 billion (2023)" in compact
+    assert "5. Result 5" in compact and "Result 6" not in compact
+    assert len(compact) * 4 < len(full)
+
+
+def test_compact_format_respects_token_budget():
+    compact = format_search_results(SERPER_RESULTS, "compact", 10, max_tokens=40)
+
+    assert estimate_tokens(compact) <= 40
+    assert compact.startswith("Answer:")
+
+
+def test_compact_format_handles_empty_results():
+    assert format_search_results({}, "compact") == "No results found."
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        format_search_results(SERPER_RESULTS, "yaml")
@@ -0,0 +1,49 @@
+# tests/unit/test_startup_profile.py
+
+from src.startup_profile import (
+    DEFAULT_STARTUP_BUDGET_MS,
+    format_import_profile,
+    heavy_imports,
+    parse_importtime,
+    profile_imports,
+    total_import_ms,
+)
+
+IMPORTTIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        300 |     langchain_core.embeddings
+import time:       500 |        800 |   config
+import time:      1000 |       1920 | main
+"""
+
+
+def test_parse_importtime():
+    rows = parse_importtime(IMPORTTIME_OUTPUT)
+
+    assert [row["module"] for row in rows] == [
+        "_io",
+        "langchain_core.embeddings",
+        "config",
+        "main",
+    ]
+    assert [row["depth"] for row in rows] == [1, 2, 1, 0]
+    assert rows[3]["self_us"] == 1000
+    assert total_import_ms(rows) == 1.92
+    assert heavy_imports(rows) == ["langchain_core"]
+
+
+def test_format_import_profile():
+    report = format_import_profile(parse_importtime(IMPORTTIME_OUTPUT), top=2)
+
+    assert "main" in report.splitlines()[1]
+    assert "within the 1000 ms budget" in report
+    assert "heavy modules loaded at startup: langchain_core" in report
+
+
+def test_cold_start_stays_within_budget():
+    # Best of two cold imports, to keep a busy machine from failing the test.
+    runs = [profile_imports("main") for _ in range(2)]
+
+    for rows in runs:
+        assert heavy_imports(rows) == []
+    assert min(total_import_ms(rows) for rows in runs) <= DEFAULT_STARTUP_BUDGET_MS
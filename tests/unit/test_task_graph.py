@@ -0,0 +1,63 @@
+# tests/unit/test_task_graph.py
+
+import pytest
+from src.task_graph import (
+    build_task_graph,
+    critical_path,
+    sink_nodes,
+    topological_order,
+)
+
+
+def test_build_task_graph_uses_names_or_agents():
+    graph = build_task_graph(
+        [
+            {"agent": "detector"},
+            {"agent": "analyzer"},
+            {"name": "fill", "agent": "writer", "depends_on": ["detector", "analyzer"]},
+            {"agent": "reviewer", "depends_on": "fill"},
+        ]
+    )
+
+    assert graph == {
+        "detector": [],
+        "analyzer": [],
+        "fill": ["detector", "analyzer"],
+        "reviewer": ["fill"],
+    }
+    assert sink_nodes(graph) == ["reviewer"]
+
+
+@pytest.mark.parametrize(
+    "task_configs, message",
+    [
+        ([{"agent": "a"}, {"agent": "a"}], "Duplicate task id 'a'"),
+        ([{"agent": "a", "depends_on": ["b"]}], "unknown task 'b'"),
+        (
+            [{"agent": "a", "depends_on": ["b"]}, {"agent": "b", "depends_on": ["a"]}],
+            "cycle: a -> b -> a",
+        ),
+    ],
+)
+def test_build_task_graph_rejects_invalid_graphs(task_configs, message):
+    with pytest.raises(Exception, match=message):
+        build_task_graph(task_configs)
+
+
+def test_topological_order_keeps_original_order_where_possible():
+    graph = {"review": ["fill"], "detect": [], "fill": ["detect"], "other": []}
+
+    assert topological_order(graph) == ["detect", "fill", "review", "other"]
+
+
+def test_critical_path_follows_longest_chain():
+    graph = {
+        "detect": [],
+        "analyze": [],
+        "fill": ["detect", "analyze"],
+        "review": ["fill"],
+    }
+    durations = {"detect": 1.0, "analyze": 4.0, "fill": 2.0, "review": 1.0}
+
+    assert critical_path(graph, durations) == (7.0, ["analyze", "fill", "review"])
+    assert critical_path({}, {}) == (0.0, [])
@@ -133,3 +133,37 @@ async def test_create_tasks_with_multiple_variables(task_manager):
 
     assert len(tasks) == 1
     assert tasks[0].description == "Analyze Test Company in Tech"
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_links_depends_on_as_context(task_manager):
+    mock_crew_config = {
+        "tasks": [
+            {
+                "description": "Detect {ai_prompt}",
+                "agent": "detector",
+                "expected_output": "a",
+            },
+            {
+                "description": "Analyze {ai_prompt}",
+                "agent": "analyzer",
+                "expected_output": "b",
+            },
+            {
+                "description": "Fill",
+                "agent": "writer",
+                "expected_output": "c",
+                "depends_on": ["detector", "analyzer"],
+            },
+        ]
+    }
+    mock_agents = {"detector": Mock(), "analyzer": Mock(), "writer": Mock()}
+
+    with patch("src.task_manager.Task", side_effect=lambda **kwargs: Mock(**kwargs)):
+        tasks = await task_manager.create_tasks(
+            mock_crew_config, mock_agents, {"ai_prompt": "hi"}
+        )
+
+    assert tasks[0].context == []
+    assert tasks[1].context == []
+    assert tasks[2].context == [tasks[0], tasks[1]]